@@ -0,0 +1,240 @@
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+import urllib.request
+from pathlib import Path
+from typing import List, Tuple
+from dataclasses import dataclass
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+
+from main2 import (LogReaderConfig, MissionLogReader, LogProcessor, LLMReportGenerator,
+                   ResponseCache)
+
+# --- 여러 로그 파일을 한 번에 분석하는 배치 실행기 ---
+# 파싱은 프로세스 풀에서, LLM 호출은 asyncio TaskGroup에서 토큰 버킷 속도 제한을 거쳐 실행합니다.
+
+
+@dataclass
+class BatchResult:
+    """로그 파일 하나에 대한 배치 처리 결과"""
+    log_file: Path
+    report_file: Path = None
+    status: str = 'pending'
+    attempts: int = 0
+    seconds: float = 0.0
+    error: str = ''
+
+
+class TokenBucket:
+    """초당 rate개의 요청을 허용하고, 최대 capacity개까지 몰아서 허용하는 속도 제한기"""
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass
+class _TextResponse:
+    text: str
+
+
+class HttpLLMModel:
+    """`{"prompt": ...}`를 POST하고 `{"text": ...}`를 받는 HTTP LLM 백엔드
+
+    LLMReportGenerator(model=..., model_name=model.model_name)에 넘겨 로컬 모의 서버나
+    사내 게이트웨이와 함께 씁니다. model_name은 응답 캐시 키에 들어가므로
+    같은 프롬프트라도 Gemini나 다른 URL의 응답과 섞이지 않습니다.
+    """
+    def __init__(self, url: str, timeout: float = 60.0):
+        self.url = url
+        self.timeout = timeout
+        self.model_name = f"http:{url}"
+
+    def generate_content(self, prompt: str, stream: bool = False):
+        """응답을 반환합니다. stream=True면 전체 응답을 조각 하나로 내보내는 이터레이터를 반환합니다."""
+        if stream:
+            return iter([self.generate_content(prompt)])
+        body = json.dumps({'prompt': prompt}).encode('utf-8')
+        request = urllib.request.Request(self.url, data=body,
+                                         headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            payload = json.loads(response.read().decode('utf-8'))
+        return _TextResponse(payload['text'])
+
+
+def parse_log_file(log_file: Path, prune: bool = False, context_lines: int = 2,
+                   token_budget: int = None) -> Tuple[Path, List[List[str]], str]:
+    """프로세스 풀 작업 함수: 로그 파일 하나를 읽어 파싱합니다. (파일, 파싱 결과, 에러)를 반환."""
+    try:
+        reader = MissionLogReader(LogReaderConfig(file_path=log_file))
+        reader._validate_file()
+        with open(log_file, 'r', encoding=reader._detect_encoding()) as f:
+            lines = f.readlines()
+
+        processor = LogProcessor()
+        if prune:
+            lines = processor.prune_log_lines(lines, context_lines=context_lines,
+                                              token_budget=token_budget)
+        return log_file, processor.parse_logs(lines), ''
+    except Exception as e:
+        return log_file, None, str(e)
+
+
+async def _report_one(reporter: LLMReportGenerator, logs: List[List[str]], result: BatchResult,
+                      bucket: TokenBucket, semaphore: asyncio.Semaphore,
+                      timeout: float, retries: int, backoff: float) -> None:
+    """로그 하나의 보고서를 생성합니다. 실패하면 지수 백오프로 재시도합니다.
+
+    timeout은 파일 하나의 마감 시간으로, 재시도와 백오프 대기까지 모두 포함합니다.
+    """
+    prompt = reporter._create_prompt(logs)
+    start = time.perf_counter()
+    logger = logging.getLogger('batch_report')
+
+    async with semaphore:
+        try:
+            # 타임아웃 시 대기만 취소되고, 이미 보낸 요청 스레드는 끝까지 실행됩니다.
+            async with asyncio.timeout(timeout):
+                for attempt in range(retries + 1):
+                    result.attempts = attempt + 1
+                    await bucket.acquire()
+                    try:
+                        text = await asyncio.to_thread(reporter._generate, prompt)
+                        result.report_file.write_text(text, encoding='utf-8')
+                        result.status = 'ok'
+                        result.error = ''
+                        break
+                    except Exception as e:
+                        result.status = 'failed'
+                        result.error = 'timeout' if isinstance(e, TimeoutError) else str(e)
+                        logger.warning(f"{result.log_file.name} {attempt + 1}번째 시도 실패: {result.error}")
+                        if attempt < retries:
+                            await asyncio.sleep(backoff * 2 ** attempt * (1 + random.random()))
+        except TimeoutError:
+            result.status = 'failed'
+            result.error = 'timeout'
+            logger.warning(f"{result.log_file.name} {timeout}s 안에 끝나지 않아 중단 ({result.attempts}번 시도)")
+
+    result.seconds = time.perf_counter() - start
+
+
+async def _report_all(reporter: LLMReportGenerator, parsed: List[Tuple[List[List[str]], BatchResult]],
+                      rate: float, burst: int, concurrency: int,
+                      timeout: float, retries: int, backoff: float) -> None:
+    bucket = TokenBucket(rate, burst)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    async with asyncio.TaskGroup() as tg:
+        for logs, result in parsed:
+            tg.create_task(_report_one(reporter, logs, result, bucket, semaphore,
+                                       timeout, retries, backoff))
+
+
+def write_index(results: List[BatchResult], output_dir: Path, elapsed: float) -> Path:
+    """배치 결과를 요약한 index.md를 작성합니다."""
+    ok = sum(1 for r in results if r.status == 'ok')
+    lines = [
+        '# 🚀 사고 원인 분석 보고서 목록',
+        '',
+        f'- 로그 파일: {len(results)}개 (성공 {ok}, 실패 {len(results) - ok})',
+        f'- 전체 소요 시간: {elapsed:.2f}s ({len(results) / elapsed if elapsed else 0:.2f} files/s)',
+        '',
+        '| 로그 파일 | 상태 | 시도 | 소요 시간(s) | 보고서 / 에러 |',
+        '|---|---|---|---|---|',
+    ]
+    for r in results:
+        detail = f'[{r.report_file.name}]({r.report_file.name})' if r.status == 'ok' else r.error
+        lines.append(f'| {r.log_file.name} | {r.status} | {r.attempts} | {r.seconds:.2f} | {detail} |')
+
+    index_file = output_dir / 'index.md'
+    index_file.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return index_file
+
+
+def run_batch(log_dir: Path, output_dir: Path, reporter: LLMReportGenerator,
+              pattern: str = '*.log', parse_workers: int = None, concurrency: int = 4,
+              rate: float = 2.0, burst: int = 1, timeout: float = 120.0,
+              retries: int = 3, backoff: float = 1.0, prune: bool = False,
+              context_lines: int = 2, token_budget: int = None) -> dict:
+    """log_dir의 로그마다 보고서를 만들고 index.md를 작성합니다. 처리량 요약을 반환합니다."""
+    log_files = sorted(Path(log_dir).glob(pattern))
+    if not log_files:
+        raise FileNotFoundError(f"분석할 로그 파일이 없습니다: {log_dir}/{pattern}")
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    worker = partial(parse_log_file, prune=prune, context_lines=context_lines,
+                     token_budget=token_budget)
+    with ProcessPoolExecutor(max_workers=parse_workers) as executor:
+        parsed_files = list(executor.map(worker, log_files))
+    parse_seconds = time.perf_counter() - start
+    print(f"✅ 로그 {len(log_files)}개 파싱 완료 ({parse_seconds:.2f}s)")
+
+    results = []
+    parsed = []
+    for log_file, logs, error in parsed_files:
+        result = BatchResult(log_file=log_file,
+                             report_file=output_dir / f"{log_file.stem}_analysis.md")
+        if logs:
+            parsed.append((logs, result))
+        else:
+            result.status = 'failed'
+            result.error = error or '파싱된 로그가 없습니다.'
+        results.append(result)
+
+    if parsed and not reporter.model:
+        raise RuntimeError("모델이 초기화되지 않아 보고서를 생성할 수 없습니다.")
+
+    print(f"🤖 보고서 {len(parsed)}개 생성 중... (동시 {concurrency}, 초당 {rate}건)")
+    asyncio.run(_report_all(reporter, parsed, rate, burst, concurrency,
+                            timeout, retries, backoff))
+
+    elapsed = time.perf_counter() - start
+    index_file = write_index(results, output_dir, elapsed)
+    summary = {
+        'files': len(results),
+        'ok': sum(1 for r in results if r.status == 'ok'),
+        'parse_seconds': parse_seconds,
+        'total_seconds': elapsed,
+        'files_per_second': len(results) / elapsed if elapsed else 0.0,
+        'index': str(index_file),
+    }
+    print(f"✅ 배치 완료: {summary['ok']}/{summary['files']}개 성공, "
+          f"{summary['files_per_second']:.2f} files/s → {index_file}")
+    return summary
+
+
+def run_batch_cli(args) -> int:
+    """main2.py --batch 옵션에서 호출되는 진입점"""
+    # 소켓 타임아웃도 --timeout에 맞춰, 타임아웃된 요청 스레드가 기본 실행기에 남아 있지 않게 합니다.
+    backend = {}
+    if args.llm_url:
+        model = HttpLLMModel(args.llm_url, timeout=args.timeout)
+        backend = {'model': model, 'model_name': model.model_name}
+    cache = None if args.no_cache else ResponseCache(args.cache_dir)
+    reporter = LLMReportGenerator(cache=cache, **backend)
+    try:
+        summary = run_batch(args.batch, args.output_dir, reporter,
+                            concurrency=args.workers, rate=args.rate, timeout=args.timeout,
+                            retries=args.retries, prune=args.prune,
+                            context_lines=args.context, token_budget=args.token_budget)
+    except (FileNotFoundError, RuntimeError) as e:
+        print(f"❌ 배치 실행 실패: {e}", file=sys.stderr)
+        return 1
+    return 0 if summary['ok'] == summary['files'] else 1
@@ -0,0 +1,50 @@
+import sys
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+
+from main2 import LogProcessor
+
+# --- LogProcessor 정렬/사전 변환 벤치마크 ---
+# 기존 문자열 정렬(list-of-lists) 경로와 NumPy epoch argsort 경로를 같은 데이터로 비교합니다.
+
+
+def make_parsed_rows(rows: int, seed: int = 0):
+    """parse_logs 결과와 같은 [시간, 메시지] 행을 무작위 순서로 생성합니다 (시간 중복 포함)."""
+    rng = random.Random(seed)
+    base = datetime(2023, 8, 27)
+    span = max(1, rows // 2) # 평균 두 줄씩 같은 시각을 갖도록
+    return [[(base + timedelta(seconds=rng.randrange(span))).strftime('%Y-%m-%d %H:%M:%S'),
+             f"event {i}"] for i in range(rows)]
+
+
+def _timed(label: str, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed:8.3f}s")
+    return result, elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark LogProcessor sort paths')
+    parser.add_argument('--rows', type=int, default=5_000_000)
+    args = parser.parse_args()
+
+    print(f"{args.rows:,}행 생성 중...")
+    logs = make_parsed_rows(args.rows)
+    processor = LogProcessor()
+
+    sorted_py, t_py = _timed('sort_logs_desc (str)', processor.sort_logs_desc, logs)
+    sorted_np, t_np = _timed('sort_logs_desc_numpy (epoch)', processor.sort_logs_desc_numpy, logs)
+    dict_py, _ = _timed('convert_to_dict', processor.convert_to_dict, sorted_py)
+    dict_np, _ = _timed('convert_to_dict(keep_duplicates)', processor.convert_to_dict, sorted_np, True)
+
+    print(f"정렬 속도 비율: {t_py / t_np:.2f}x")
+    print(f"사전 항목 수: 기존 {len(dict_py):,} / 중복 보존 {len(dict_np):,} (입력 {len(logs):,})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
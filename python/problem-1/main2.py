@@ -1,17 +1,34 @@
 import sys
 import os
+import re
 import json
+import time
+import hashlib
 import logging
+import threading
 from pathlib import Path
 from typing import List, Dict, Tuple
 from datetime import datetime  
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 import argparse
 
-# LLM 라이브러리 import
+# LLM 라이브러리(google.generativeai)는 보고서 생성(-r) 시에만 import 합니다.
 # pip install google-generativeai
 # export GOOGLE_API_KEY="여기에_복사한_API_키를_붙여넣으세요"
-import google.generativeai as genai
+
+LOG_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# 보고서 대상 심각도. 현재 로그처럼 모든 줄이 INFO로 기록되는 경우를 위해
+# 메시지 안의 이상 징후 키워드도 함께 확인합니다.
+ANOMALY_LEVELS = {'WARNING', 'WARN', 'ERROR', 'CRITICAL', 'FATAL'}
+ANOMALY_KEYWORDS = re.compile(
+    r'warn|error|fail|critical|fatal|unstable|explosion|leak|abort|malfunction|overheat',
+    re.IGNORECASE
+)
+
+# 프롬프트 문구를 바꾸면 이 값을 올려서 기존 캐시를 무효화합니다.
+PROMPT_TEMPLATE_VERSION = 1
 
 # --- 데이터 클래스 및 파일 리더 ---
 
@@ -96,6 +113,11 @@ class MissionLogReader:
 
 # --- 로그 데이터 처리 클래스 ---
 
+def estimate_tokens(text: str) -> int:
+    """문자 수 기반의 빠른 토큰 수 추정 (약 4글자 = 1토큰)"""
+    return len(text) // 4 + 1
+
+
 class LogProcessor:
     """로그 데이터를 파싱, 정렬, 변환 및 저장하는 클래스"""
     def __init__(self):
@@ -117,14 +139,134 @@ class LogProcessor:
         print("✅ 로그 내용 파싱 완료.")
         return parsed_data
 
+    @staticmethod
+    def _is_anomaly(level: str, message: str) -> bool:
+        return level.upper() in ANOMALY_LEVELS or bool(ANOMALY_KEYWORDS.search(message))
+
+    def prune_log_lines(self, log_lines: List[str], context_lines: int = 2,
+                        token_budget: int = None) -> List[str]:
+        """보고서 프롬프트용 사전 필터
+
+        이상 이벤트(WARNING/ERROR/CRITICAL 등)와 그 앞뒤 context_lines 줄만 남기고,
+        나머지 연속된 INFO 줄은 한 줄짜리 요약으로 접습니다.
+        token_budget이 주어지면 요약 줄 → 문맥 줄 → 오래된 이상 이벤트 순으로
+        잘라내어 추정 토큰 수를 예산 안으로 맞춥니다.
+        """
+        rows = []
+        for line in log_lines:
+            line = line.strip()
+            if not line:
+                continue
+            parts = line.split(',', 2)
+            if len(parts) == 3:
+                rows.append((line, parts[0].strip(), parts[1].strip(), parts[2].strip()))
+
+        anomalies = [i for i, (_, _, level, msg) in enumerate(rows) if self._is_anomaly(level, msg)]
+        keep = set()
+        for i in anomalies:
+            keep.update(range(max(0, i - context_lines), min(len(rows), i + context_lines + 1)))
+
+        # (우선순위, 줄) 목록: 0 = 이상 이벤트, 1 = 문맥, 2 = 접힌 INFO 요약
+        anomaly_set = set(anomalies)
+        pruned = []
+        run = []
+        for i, row in enumerate(rows):
+            if i in keep:
+                pruned.extend(self._collapse_run(run))
+                run = []
+                pruned.append((0 if i in anomaly_set else 1, row[0]))
+            else:
+                run.append(row)
+        pruned.extend(self._collapse_run(run))
+
+        if token_budget is not None:
+            pruned = self._trim_to_budget(pruned, token_budget)
+
+        print(f"✅ 프롬프트용 로그 필터링 완료: {len(rows)}줄 → {len(pruned)}줄")
+        return [line for _, line in pruned]
+
+    @staticmethod
+    def _collapse_run(run: List[Tuple[str, str, str, str]]) -> List[Tuple[int, str]]:
+        """연속된 정상 줄을 run-length 요약 한 줄로 접습니다 (1줄이면 그대로)."""
+        if not run:
+            return []
+        if len(run) == 1:
+            return [(2, run[0][0])]
+        first_ts, last_ts = run[0][1], run[-1][1]
+        return [(2, f"{first_ts},INFO,[정상 INFO 로그 {len(run)}줄 생략: {first_ts} ~ {last_ts}]")]
+
+    @staticmethod
+    def _trim_to_budget(pruned: List[Tuple[int, str]], token_budget: int) -> List[Tuple[int, str]]:
+        total = sum(estimate_tokens(line) for _, line in pruned)
+        if total <= token_budget:
+            return pruned
+
+        # 우선순위가 낮은(숫자가 큰) 줄부터, 같은 우선순위에서는 오래된 줄부터 제거
+        removal_order = sorted(range(len(pruned)), key=lambda i: (-pruned[i][0], i))
+        removed = set()
+        for i in removal_order:
+            if total <= token_budget:
+                break
+            removed.add(i)
+            total -= estimate_tokens(pruned[i][1])
+        return [item for i, item in enumerate(pruned) if i not in removed]
+
     def sort_logs_desc(self, logs: List[List[str]]) -> List[List[str]]:
         sorted_logs = sorted(logs, key=lambda item: item[0], reverse=True)
         print("✅ 시간 역순으로 정렬 완료.")
         return sorted_logs
 
-    def convert_to_dict(self, logs: List[List[str]]) -> Dict[str, str]:
-        """정렬된 로그 리스트를 {시간: 메시지} 형태의 사전으로 변환합니다."""
-        log_dict = {timestamp: message for timestamp, message in logs}
+    @staticmethod
+    def timestamps_to_epoch(timestamps: List[str]):
+        """시간 문자열 목록을 int64 epoch(초) 배열로 한 번에 변환합니다.
+
+        ISO 8601 계열 형식('2023-08-27 10:00:00', '2023-08-27T10:00:00', 날짜만 등)을
+        모두 받으며, 해석할 수 없는 값은 NaT(int64 최솟값)가 됩니다.
+        """
+        import numpy as np # 정렬 가속이 필요할 때만 불러옵니다 (시작 시간 예산 유지).
+
+        try:
+            parsed = np.array(timestamps, dtype='datetime64[s]')
+        except ValueError:
+            # 잘못된 값이 섞여 있으면 한 개씩 변환하고 실패한 값은 NaT로 둡니다.
+            parsed = np.empty(len(timestamps), dtype='datetime64[s]')
+            for i, ts in enumerate(timestamps):
+                try:
+                    parsed[i] = np.datetime64(ts, 's')
+                except ValueError:
+                    parsed[i] = np.datetime64('NaT')
+        return parsed.view(np.int64)
+
+    def sort_logs_desc_numpy(self, logs: List[List[str]]) -> List[List[str]]:
+        """epoch 배열의 안정 argsort로 시간 역순 정렬합니다.
+
+        같은 시각의 로그는 원래 순서를 유지하고, 시간을 해석할 수 없는 줄은 맨 뒤로 보냅니다.
+        """
+        import numpy as np
+
+        epoch = self.timestamps_to_epoch([item[0] for item in logs])
+        invalid = epoch == np.iinfo(np.int64).min
+        epoch[invalid] = np.iinfo(np.int64).min + 1 # 부호 반전 시 overflow 방지
+        order = np.argsort(-epoch, kind='stable')
+        sorted_logs = [logs[i] for i in order.tolist()]
+        print("✅ 시간 역순으로 정렬 완료. (NumPy)")
+        return sorted_logs
+
+    def convert_to_dict(self, logs: List[List[str]], keep_duplicates: bool = False) -> Dict[str, str]:
+        """정렬된 로그 리스트를 {시간: 메시지} 형태의 사전으로 변환합니다.
+
+        keep_duplicates=True이면 같은 시간의 두 번째 이후 로그를 '시간#2', '시간#3' 키로
+        보존합니다. (기본값은 기존처럼 마지막 메시지만 남깁니다.)
+        """
+        if not keep_duplicates:
+            log_dict = {timestamp: message for timestamp, message in logs}
+        else:
+            log_dict = {}
+            seen = {}
+            for timestamp, message in logs:
+                count = seen.get(timestamp, 0) + 1
+                seen[timestamp] = count
+                log_dict[timestamp if count == 1 else f"{timestamp}#{count}"] = message
         print("✅ 사전(Dict) 객체로 변환 완료.")
         return log_dict
 
@@ -139,12 +281,110 @@ class LogProcessor:
             self.logger.error(f"JSON 파일 저장 실패: {e}")
             print(f"❌ JSON 파일 저장 중 에러 발생: {e}", file=sys.stderr)
 
+class ResponseCache:
+    """LLM 응답을 디스크에 저장하는 내용 주소 기반(content-addressed) 캐시
+
+    키는 (모델명, 프롬프트 템플릿 버전, 프롬프트 내용)의 SHA-256 해시입니다.
+    ttl_seconds가 지난 항목은 버리고, 전체 크기가 max_bytes를 넘으면
+    가장 오래 사용하지 않은 항목부터 지웁니다.
+    """
+    def __init__(self, cache_dir: Path, ttl_seconds: float = 7 * 24 * 3600,
+                 max_bytes: int = 50 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model_name: str, prompt: str) -> str:
+        raw = f"{model_name}\0{PROMPT_TEMPLATE_VERSION}\0{prompt}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str):
+        """캐시된 응답 텍스트를 반환합니다. 없거나 만료됐으면 None."""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        if time.time() - entry['created'] > self.ttl_seconds:
+            path.unlink(missing_ok=True)
+            return None
+
+        try:
+            os.utime(path) # 최근 사용 시각 갱신 (LRU 퇴출 기준)
+        except FileNotFoundError:
+            pass # 다른 스레드가 방금 퇴출한 경우
+        return entry['text']
+
+    def put(self, key: str, text: str) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_suffix(f'.{threading.get_ident()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'created': time.time(), 'text': text}, f, ensure_ascii=False)
+        os.replace(tmp_path, path) # 쓰다 만 파일이 캐시에 보이지 않도록 교체
+        self._evict()
+
+    def _evict(self) -> None:
+        """전체 크기가 max_bytes 이하가 될 때까지 오래된 항목부터 삭제합니다."""
+        with self._lock:
+            entries = []
+            for path in self.cache_dir.glob('*.json'):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                self.logger.info(f"캐시 항목 퇴출: {path.name}")
+
+
 class LLMReportGenerator:
-    
-    def __init__(self):
+    """LLM을 사용해 사고 원인 분석 보고서를 작성하는 클래스
+
+    SDK import와 모델 생성은 처음 `model`에 접근할 때까지 미뤄집니다.
+    `model`에 `generate_content(prompt)`를 가진 객체를 넘기면
+    Gemini 대신 그 백엔드를 사용합니다 (오프라인 테스트용 스텁 등).
+    """
+    def __init__(self, model_name: str = 'gemini-1.5-flash', model=None,
+                 max_workers: int = 4, chunk_token_budget: int = 2000,
+                 chunk_window_minutes: int = 30, cache: ResponseCache = None):
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.model = None
+        self.model_name = model_name
+        self._model = model
+        self._model_loaded = model is not None
+        self.max_workers = max_workers
+        self.chunk_token_budget = chunk_token_budget
+        self.chunk_window_minutes = chunk_window_minutes
+        self.cache = cache
+        self.last_stream_stats = None
+
+    @property
+    def model(self):
+        """처음 접근할 때 한 번만 Gemini 모델을 초기화합니다. 실패하면 None."""
+        if not self._model_loaded:
+            self._model_loaded = True
+            self._model = self._load_model()
+        return self._model
+
+    def _load_model(self):
         try:
+            # 무거운 SDK는 실제로 보고서를 만들 때만 불러옵니다.
+            import google.generativeai as genai
+
             # 환경 변수에서 API 키를 안전하게 불러옵니다.
             key = os.getenv("GOOGLE_API_KEY")
             if not key:
@@ -152,12 +392,14 @@ class LLMReportGenerator:
             
             genai.configure(api_key=key)
 
-            self.model = genai.GenerativeModel('gemini-1.5-flash')
+            model = genai.GenerativeModel(self.model_name)
             self.logger.info("Gemini 모델이 성공적으로 초기화되었습니다.")
+            return model
 
         except Exception as e:
             self.logger.error(f"Gemini 모델 초기화 실패: {e}")
             print(f"❌ LLM 리포트 생성기 초기화 실패: {e}", file=sys.stderr)
+            return None
 
     def _create_prompt(self, logs: List[List[str]]) -> str:
 
@@ -186,7 +428,172 @@ class LLMReportGenerator:
         """
         return prompt
 
-    def generate_analysis_report(self, logs: List[List[str]], output_path: Path) -> bool:
+    def _create_chunk_prompt(self, chunk: List[List[str]]) -> str:
+        """map 단계: 로그 조각 하나를 요약하도록 지시하는 프롬프트
+
+        조각 내용만으로 프롬프트가 결정되므로, 다른 조각이 바뀌어도
+        이 조각의 캐시 키는 그대로 유지됩니다.
+        """
+        log_str = "\n".join([f"{ts}, {msg}" for ts, msg in chunk])
+        prompt = f"""
+        ### 역할: 당신은 우주선 시스템 사고 분석 전문가입니다. 아래는 전체 임무 로그 중 {chunk[0][0]} ~ {chunk[-1][0]} 구간입니다.
+
+        ### 구간 로그 데이터:
+        ```
+        {log_str}
+        ```
+
+        ### 작업:
+        - 이 구간의 주요 이벤트, 특히 경고(WARNING), 오류(ERROR), 치명적(CRITICAL/FATAL) 이벤트를 시간과 함께 요약합니다.
+        - 이상 징후가 없다면 정상 진행 상황을 한두 줄로 요약합니다.
+        - 한국어 Markdown 글머리표로만 작성해 주세요.
+        """
+        return prompt
+
+    def _create_reduce_prompt(self, summaries: List[str]) -> str:
+        """reduce 단계: 구간별 요약을 합쳐 최종 보고서를 쓰도록 지시하는 프롬프트"""
+        summary_str = "\n\n".join(
+            [f"#### 구간 {i}\n{summary}" for i, summary in enumerate(summaries, 1)]
+        )
+        prompt = f"""
+        ### 역할: 당신은 최고의 우주선 시스템 사고 분석 전문가입니다. 아래는 임무 컴퓨터 로그를 시간 구간별로 요약한 내용입니다. 이를 종합하여 전문적이고 체계적인 '사고 원인 분석 보고서'를 작성해 주십시오.
+
+        ### 구간별 요약 (시간순):
+        {summary_str}
+
+        ### 보고서에 반드시 포함되어야 할 항목:
+        1.  **개요**: 보고서의 목적을 간략히 서술합니다.
+        2.  **사고 타임라인 분석**: 주요 경고(WARNING), 오류(ERROR), 그리고 치명적(CRITICAL/FATAL) 이벤트를 시간순으로 요약하여 재구성합니다.
+        3.  **사고 원인 추론**: 타임라인을 바탕으로 이벤트 간의 인과 관계를 분석하여, 사고의 가장 핵심적인 원인(Root Cause)을 논리적으로 추론합니다.
+        4.  **권고 사항**: 추론된 원인을 바탕으로, 향후 동일한 사고의 재발을 방지하기 위한 구체적이고 실질적인 대책을 3가지 제시합니다.
+
+        ### 출력 형식:
+        - 반드시 Markdown을 사용해야 합니다.
+        - 제목은 `🚀 사고 원인 분석 보고서` 로 시작해 주세요.
+        - 한국어로 작성해 주세요.
+        """
+        return prompt
+
+    def _chunk_logs(self, logs: List[List[str]]) -> List[List[List[str]]]:
+        """로그를 시간 구간(chunk_window_minutes) 단위로 나누고, 각 조각이
+        chunk_token_budget을 넘지 않도록 다시 자릅니다.
+
+        구간은 첫 줄 기준이 아니라 고정된 시계 경계(시각 // 구간 길이)에 맞춥니다. 그래서 줄을 추가·수정해도
+        토큰 예산에 따른 분할은 그 줄이 속한 구간 안에서만 달라지고, 다른 구간의 조각(과 캐시 키)은 그대로입니다.
+        """
+        window_seconds = self.chunk_window_minutes * 60
+        chunks = []
+        current = []
+        current_tokens = 0
+        current_window = None
+
+        for ts, msg in sorted(logs, key=lambda item: item[0]):
+            try:
+                window = int(datetime.strptime(ts, LOG_TIME_FORMAT).timestamp() // window_seconds)
+            except ValueError:
+                window = current_window # 시간 형식이 아니면 현재 구간에 그대로 붙입니다.
+
+            line_tokens = estimate_tokens(f"{ts}, {msg}\n")
+            new_window = current and window != current_window
+            over_budget = current and current_tokens + line_tokens > self.chunk_token_budget
+
+            if new_window or over_budget:
+                chunks.append(current)
+                current, current_tokens = [], 0
+
+            current_window = window
+            current.append([ts, msg])
+            current_tokens += line_tokens
+
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _generate(self, prompt: str) -> str:
+        """모델에 프롬프트를 보내고 응답 텍스트를 반환합니다. 캐시가 있으면 먼저 확인합니다."""
+        key = None
+        if self.cache is not None:
+            key = ResponseCache.make_key(self.model_name, prompt)
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.logger.info(f"캐시 적중: {key[:12]}")
+                return cached
+
+        response = self.model.generate_content(prompt)
+        text = response.text
+
+        if key is not None:
+            self.cache.put(key, text)
+        return text
+
+    def _summarize_chunks(self, chunks: List[List[List[str]]]) -> List[str]:
+        """map 단계: 각 조각을 스레드 풀에서 동시에 요약합니다 (결과는 입력 순서 유지)."""
+        prompts = [self._create_chunk_prompt(chunk) for chunk in chunks]
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            return list(executor.map(self._generate, prompts))
+
+    def _create_map_reduce_prompt(self, logs: List[List[str]]) -> str:
+        """map 단계를 실행하고, 최종 보고서를 만들 reduce 프롬프트를 반환합니다."""
+        chunks = self._chunk_logs(logs)
+        print(f"🧩 로그를 {len(chunks)}개 구간으로 나누어 요약합니다. (동시 요청 수: {self.max_workers})")
+        summaries = self._summarize_chunks(chunks)
+        return self._create_reduce_prompt(summaries)
+
+    def _stream_to_file(self, prompt: str, output_path: Path) -> bool:
+        """응답 조각이 도착하는 대로 파일과 터미널에 씁니다.
+
+        첫 토큰까지 걸린 시간과 전체 시간은 `last_stream_stats`에 기록됩니다.
+        스트림이 중간에 끊기면 그때까지 받은 내용을 파일에 남기고 False를 반환합니다.
+        """
+        key = None
+        if self.cache is not None:
+            key = ResponseCache.make_key(self.model_name, prompt)
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.logger.info(f"캐시 적중: {key[:12]}")
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    f.write(cached)
+                print(cached)
+                self.last_stream_stats = {'ttft': 0.0, 'total': 0.0, 'chars': len(cached),
+                                          'completed': True, 'cached': True}
+                return True
+
+        start = time.perf_counter()
+        ttft = None
+        received = []
+        completed = False
+
+        with open(output_path, 'w', encoding='utf-8') as f:
+            try:
+                for chunk in self.model.generate_content(prompt, stream=True):
+                    text = chunk.text
+                    if not text:
+                        continue
+                    if ttft is None:
+                        ttft = time.perf_counter() - start
+                    received.append(text)
+                    f.write(text)
+                    f.flush()
+                    print(text, end='', flush=True)
+                completed = True
+            except (Exception, KeyboardInterrupt) as e:
+                self.logger.error(f"LLM 스트림 중단: {e!r}")
+                f.write("\n\n> ⚠️ 응답 스트림이 중단되어 보고서가 완성되지 않았습니다.\n")
+                print(f"\n⚠️ 스트림 중단, 받은 내용까지 저장합니다: {e!r}", file=sys.stderr)
+
+        total = time.perf_counter() - start
+        text = "".join(received)
+        self.last_stream_stats = {'ttft': ttft, 'total': total, 'chars': len(text),
+                                  'completed': completed, 'cached': False}
+        ttft_str = f"{ttft:.2f}s" if ttft is not None else "-"
+        print(f"\n⏱️ 첫 토큰까지: {ttft_str}, 전체: {total:.2f}s ({len(text)}자)")
+
+        if completed and key is not None:
+            self.cache.put(key, text)
+        return completed
+
+    def generate_analysis_report(self, logs: List[List[str]], output_path: Path,
+                                 map_reduce: bool = False, stream: bool = False) -> bool:
 
         if not self.model:
             print("❌ 모델이 초기화되지 않아 보고서를 생성할 수 없습니다.", file=sys.stderr)
@@ -195,12 +602,23 @@ class LLMReportGenerator:
         print("\n🤖 LLM을 사용하여 사고 원인 분석 보고서를 생성합니다. 잠시 기다려 주세요...")
         
         try:
-            prompt = self._create_prompt(logs)
-            response = self.model.generate_content(prompt)
+            if map_reduce:
+                prompt = self._create_map_reduce_prompt(logs)
+            else:
+                prompt = self._create_prompt(logs)
+
+            if stream:
+                if not self._stream_to_file(prompt, output_path):
+                    print(f"❌ 보고서가 중간에 끊겼습니다. 부분 결과: {output_path}", file=sys.stderr)
+                    return False
+                print(f"✅ LLM 기반 분석 보고서 저장 완료: {output_path}")
+                return True
+
+            report_text = self._generate(prompt)
             
             # LLM이 생성한 텍스트를 파일에 저장합니다.
             with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(response.text)
+                f.write(report_text)
             
             print(f"✅ LLM 기반 분석 보고서 저장 완료: {output_path}")
             return True
@@ -219,6 +637,97 @@ def create_parser() -> argparse.ArgumentParser:
         action='store_true',
         help='Make report'
     )
+    parser.add_argument(
+        '-n', '--numpy',
+        action='store_true',
+        help='Sort by parsed epoch time with NumPy and keep logs sharing a timestamp'
+    )
+    parser.add_argument(
+        '-m', '--map-reduce',
+        action='store_true',
+        help='Summarize log chunks concurrently, then combine them into the report'
+    )
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=4,
+        help='Max concurrent LLM requests in map-reduce mode (default: 4)'
+    )
+    parser.add_argument(
+        '--chunk-tokens',
+        type=int,
+        default=2000,
+        help='Estimated token budget per log chunk in map-reduce mode (default: 2000)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always call the LLM instead of reusing cached responses'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        type=Path,
+        default=Path('.llm_cache'),
+        help='Directory for cached LLM responses (default: .llm_cache)'
+    )
+    parser.add_argument(
+        '-s', '--stream',
+        action='store_true',
+        help='Write the report to the file and terminal as it is generated'
+    )
+    parser.add_argument(
+        '-p', '--prune',
+        action='store_true',
+        help='Send only anomalous events plus context lines to the LLM'
+    )
+    parser.add_argument(
+        '--context',
+        type=int,
+        default=2,
+        help='Context lines kept around each anomalous event with --prune (default: 2)'
+    )
+    parser.add_argument(
+        '--token-budget',
+        type=int,
+        default=None,
+        help='Estimated token budget for the pruned log lines with --prune'
+    )
+    parser.add_argument(
+        '-b', '--batch',
+        type=Path,
+        default=None,
+        help='Write one report per *.log file in this directory, plus index.md'
+    )
+    parser.add_argument(
+        '-o', '--output-dir',
+        type=Path,
+        default=Path('reports'),
+        help='Output directory for --batch reports (default: reports)'
+    )
+    parser.add_argument(
+        '--rate',
+        type=float,
+        default=2.0,
+        help='Max LLM requests per second in --batch mode (default: 2.0)'
+    )
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=120.0,
+        help='Per-log deadline in seconds in --batch mode, including retries and backoff; '
+             'also the --llm-url socket timeout (default: 120)'
+    )
+    parser.add_argument(
+        '--retries',
+        type=int,
+        default=3,
+        help='Retries with exponential backoff per log in --batch mode (default: 3)'
+    )
+    parser.add_argument(
+        '--llm-url',
+        default=None,
+        help='Use an HTTP LLM endpoint (e.g. mock_llm_server.py) instead of Gemini'
+    )
     return parser
 
 # --- 메인 실행 함수 ---
@@ -229,6 +738,12 @@ def main() -> int:
     parser = create_parser()        # 명령줄 파서 생성
     args = parser.parse_args()
 
+    if args.batch and (args.map_reduce or args.stream):
+        parser.error('-m/--map-reduce and -s/--stream are not supported with -b/--batch')
+    if args.batch:
+        # 배치 모드는 별도 모듈에서 처리합니다 (단일 실행 시작 속도에 영향 없음).
+        from batch_report import run_batch_cli
+        return run_batch_cli(args)
 
     # 1. 설정 및 객체 생성
     log_file = Path("mission_computer_main.log")
@@ -238,7 +753,6 @@ def main() -> int:
     config = LogReaderConfig(file_path=log_file)
     reader = MissionLogReader(config)
     processor = LogProcessor()
-    reporter = LLMReportGenerator()
 
     # 2. 로그 파일 읽기
     log_lines = reader.read_entire_file()
@@ -259,7 +773,10 @@ def main() -> int:
     print(f"{'='*60}\n✅ End of parsed logs\n{'='*60}")
 
     # 4. 시간 역순 정렬
-    sorted_logs = processor.sort_logs_desc(parsed_logs)
+    if args.numpy:
+        sorted_logs = processor.sort_logs_desc_numpy(parsed_logs)
+    else:
+        sorted_logs = processor.sort_logs_desc(parsed_logs)
     if not sorted_logs:
         return 1
     print("\n--- [ 시간 역순으로 정렬된 리스트 ] ---")
@@ -268,7 +785,7 @@ def main() -> int:
     print(f"{'='*60}\n✅ End of sorted logs\n{'='*60}")
 
     # 5. 사전 객체로 변환
-    log_dict = processor.convert_to_dict(sorted_logs)
+    log_dict = processor.convert_to_dict(sorted_logs, keep_duplicates=args.numpy)
     if not log_dict:
         return 1
 
@@ -279,7 +796,27 @@ def main() -> int:
 
     # 7. 사고 원인 분석 보고서 작성
     if args.report:
-        report_result = reporter.generate_analysis_report(parsed_logs, report_file)
+        cache = None if args.no_cache else ResponseCache(args.cache_dir)
+        backend = {}
+        if args.llm_url:
+            # HTTP 백엔드는 자기 이름으로 캐시 키를 만들어 Gemini 응답과 섞이지 않게 합니다.
+            from batch_report import HttpLLMModel
+            model = HttpLLMModel(args.llm_url, timeout=args.timeout)
+            backend = {'model': model, 'model_name': model.model_name}
+        reporter = LLMReportGenerator(max_workers=args.workers, chunk_token_budget=args.chunk_tokens,
+                                      cache=cache, **backend)
+        report_logs = parsed_logs
+        if args.prune:
+            pruned_lines = processor.prune_log_lines(log_lines, context_lines=args.context,
+                                                     token_budget=args.token_budget)
+            report_logs = processor.parse_logs(pruned_lines)
+            before = estimate_tokens(reporter._create_prompt(parsed_logs))
+            after = estimate_tokens(reporter._create_prompt(report_logs))
+            print(f"✂️ 프롬프트 크기(추정 토큰): {before} → {after} ({100 * (before - after) / before:.1f}% 감소)")
+
+        report_result = reporter.generate_analysis_report(report_logs, report_file,
+                                                          map_reduce=args.map_reduce,
+                                                          stream=args.stream)
         if report_result is False:
             return 1
 
@@ -0,0 +1,84 @@
+import sys
+import json
+import time
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# --- 배치 처리량 측정용 로컬 모의 LLM 서버 ---
+# POST {"prompt": ...} → {"text": ...} 형식으로 batch_report.HttpLLMModel과 짝을 이룹니다.
+
+
+class MockLLMServer:
+    """고정 지연 후 응답하고, 처음 fail_first개 요청은 503으로 실패시키는 모의 서버"""
+    def __init__(self, host: str = '127.0.0.1', port: int = 0,
+                 delay: float = 0.1, fail_first: int = 0):
+        self.delay = delay
+        self.fail_first = fail_first
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/generate"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                prompt = json.loads(self.rfile.read(length).decode('utf-8'))['prompt']
+                with server._lock:
+                    server.requests += 1
+                    should_fail = server.requests <= server.fail_first
+
+                time.sleep(server.delay)
+                if should_fail:
+                    self.send_error(503, 'mock overload')
+                    return
+
+                body = json.dumps({'text': f"# 🚀 사고 원인 분석 보고서\n\n(mock, 프롬프트 {len(prompt)}자)\n"},
+                                  ensure_ascii=False).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass # 요청마다 찍히는 접근 로그는 생략
+
+        return Handler
+
+    def start(self) -> 'MockLLMServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Local mock LLM server for batch throughput tests')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay', type=float, default=0.1, help='Seconds per response')
+    parser.add_argument('--fail-first', type=int, default=0, help='Fail the first N requests with 503')
+    args = parser.parse_args()
+
+    server = MockLLMServer(port=args.port, delay=args.delay, fail_first=args.fail_first)
+    print(f"🛰️ 모의 LLM 서버 실행 중: {server.url} (종료: Ctrl+C)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
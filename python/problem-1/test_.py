@@ -1,3 +1,14 @@
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import main2
+
+
 def test_hello_output(capsys):
     """'Hello Mars'가 표준 출력으로 나오는지 검증하는 테스트"""
     print("Hello Mars")
@@ -5,4 +16,476 @@ def test_hello_output(capsys):
     with capsys.disabled():
         print(capsys)
 
-    assert captured.out.strip() == "Hello Mars"
\ No newline at end of file
+    assert captured.out.strip() == "Hello Mars"
+
+HERE = Path(__file__).parent
+
+# -r 없이 실행되는 파싱/정렬/JSON 경로의 import 시간 예산 (마이크로초)
+STARTUP_BUDGET_US = 300_000
+
+
+def _import_times(stderr: str) -> dict:
+    """`python -X importtime` 출력을 {모듈명: 누적 시간(us)} 사전으로 변환"""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        times[parts[2].strip()] = int(parts[1].strip())
+    return times
+
+
+def test_main2_import_time_budget():
+    """main2 import가 LLM SDK 없이 예산 안에 끝나는지 검증하는 테스트"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import main2'],
+        cwd=HERE, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    times = _import_times(result.stderr)
+
+    assert 'main2' in times
+    assert not any(name.startswith('google') for name in times)
+    assert times['main2'] < STARTUP_BUDGET_US
+
+
+def test_main2_plain_run_skips_llm(tmp_path):
+    """-r 없이 실행하면 LLM SDK를 import하지 않고 JSON을 만드는지 검증하는 테스트"""
+    shutil.copy(HERE / 'mission_computer_main.log', tmp_path)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', str(HERE / 'main2.py')],
+        cwd=tmp_path, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    assert (tmp_path / 'mission_computer_main.json').exists()
+    assert not any(name.startswith('google') for name in _import_times(result.stderr))
+
+
+class StubModel:
+    """네트워크 없이 프롬프트를 기록하고 고정된 응답을 돌려주는 로컬 스텁 모델"""
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.prompts = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt):
+        with self._lock:
+            self.prompts.append(prompt)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return SimpleNamespace(text=f"summary-{len(prompt)}")
+
+
+def _read_logs():
+    lines = (HERE / 'mission_computer_main.log').read_text(encoding='utf-8').splitlines()
+    return main2.LogProcessor().parse_logs(lines[1:])
+
+
+def test_chunk_logs_respects_window_and_budget():
+    """시간 구간과 토큰 예산을 모두 지키며 모든 줄을 보존하는지 검증하는 테스트"""
+    logs = _read_logs()
+    reporter = main2.LLMReportGenerator(model=StubModel(), chunk_token_budget=60,
+                                        chunk_window_minutes=20)
+    chunks = reporter._chunk_logs(logs)
+
+    assert len(chunks) > 1
+    assert sum(len(chunk) for chunk in chunks) == len(logs)
+    for chunk in chunks:
+        tokens = sum(main2.estimate_tokens(f"{ts}, {msg}\n") for ts, msg in chunk)
+        assert len(chunk) == 1 or tokens <= 60
+        first = main2.datetime.strptime(chunk[0][0], main2.LOG_TIME_FORMAT)
+        last = main2.datetime.strptime(chunk[-1][0], main2.LOG_TIME_FORMAT)
+        assert (last - first).total_seconds() < 20 * 60
+
+
+def test_map_reduce_report_with_stub_model(tmp_path):
+    """스텁 모델로 map-reduce 보고서가 동시 요청 제한 안에서 생성되는지 검증하는 테스트"""
+    model = StubModel(delay=0.05)
+    reporter = main2.LLMReportGenerator(model=model, max_workers=2, chunk_token_budget=60)
+    chunks = reporter._chunk_logs(_read_logs())
+    output = tmp_path / 'log_analysis.md'
+
+    assert reporter.generate_analysis_report(_read_logs(), output, map_reduce=True)
+    assert len(model.prompts) == len(chunks) + 1
+    assert model.max_active == 2
+    assert '구간별 요약' in model.prompts[-1]
+    assert output.read_text(encoding='utf-8').startswith('summary-')
+
+
+def test_response_cache_requeries_only_changed_chunks(tmp_path):
+    """재실행 시 바뀐 구간만 다시 LLM에 요청하는지 검증하는 테스트"""
+    logs = _read_logs()
+    cache = main2.ResponseCache(tmp_path / 'cache')
+
+    first = StubModel()
+    reporter = main2.LLMReportGenerator(model=first, chunk_token_budget=60, cache=cache)
+    chunk_count = len(reporter._chunk_logs(logs))
+    assert reporter.generate_analysis_report(logs, tmp_path / 'a.md', map_reduce=True)
+    assert len(first.prompts) == chunk_count + 1
+
+    # 같은 로그로 다시 실행하면 모델을 전혀 호출하지 않습니다.
+    again = StubModel()
+    reporter = main2.LLMReportGenerator(model=again, chunk_token_budget=60, cache=cache)
+    assert reporter.generate_analysis_report(logs, tmp_path / 'b.md', map_reduce=True)
+    assert again.prompts == []
+
+    # 마지막 줄만 바꾸면 마지막 구간과 reduce 단계만 다시 요청합니다.
+    changed_logs = logs[:-1] + [[logs[-1][0], 'Systems powered down after review.']]
+    changed = StubModel()
+    reporter = main2.LLMReportGenerator(model=changed, chunk_token_budget=60, cache=cache)
+    assert reporter.generate_analysis_report(changed_logs, tmp_path / 'c.md', map_reduce=True)
+    assert len(changed.prompts) == 2
+
+
+def test_response_cache_early_change_requeries_one_chunk(tmp_path):
+    """앞쪽 줄을 추가·수정해도 그 줄이 속한 구간과 reduce 단계만 다시 요청하는지 검증하는 테스트"""
+    logs = _read_logs()
+    cache = main2.ResponseCache(tmp_path / 'cache')
+    reporter = main2.LLMReportGenerator(model=StubModel(), chunk_token_budget=60, cache=cache)
+    assert reporter.generate_analysis_report(logs, tmp_path / 'a.md', map_reduce=True)
+
+    # 맨 앞에 줄 하나를 끼워 넣으면 그 줄의 구간만 새로 생기고 이후 구간은 캐시에서 나옵니다.
+    inserted_logs = [['2023-08-27 09:58:00', 'Pre-launch checklist opened.']] + logs
+    inserted = StubModel()
+    reporter = main2.LLMReportGenerator(model=inserted, chunk_token_budget=60, cache=cache)
+    assert reporter.generate_analysis_report(inserted_logs, tmp_path / 'b.md', map_reduce=True)
+    assert len(inserted.prompts) == 2
+
+    # 앞쪽 줄의 내용만 바꾸면 그 줄이 든 구간과 reduce 단계만 다시 요청합니다.
+    edited_logs = [logs[0], [logs[1][0], logs[1][1] + ' OK']] + logs[2:]
+    edited = StubModel()
+    reporter = main2.LLMReportGenerator(model=edited, chunk_token_budget=60, cache=cache)
+    assert reporter.generate_analysis_report(edited_logs, tmp_path / 'c.md', map_reduce=True)
+    assert len(edited.prompts) == 2
+    assert logs[1][1] + ' OK' in edited.prompts[0]
+
+
+def test_response_cache_ttl_and_size_eviction(tmp_path):
+    """TTL이 지난 항목은 무시하고, 크기 한도를 넘으면 오래된 항목부터 지우는지 검증하는 테스트"""
+    cache = main2.ResponseCache(tmp_path, ttl_seconds=0)
+    cache.put('expired', 'text')
+    time.sleep(0.01)
+    assert cache.get('expired') is None
+
+    cache = main2.ResponseCache(tmp_path, max_bytes=250)
+    for i in range(5):
+        cache.put(f'key{i}', 'x' * 50)
+        time.sleep(0.01)
+    assert cache.get('key4') == 'x' * 50
+    assert cache.get('key0') is None
+    assert sum(p.stat().st_size for p in tmp_path.glob('*.json')) <= 250
+
+
+class SizeProportionalStubModel(StubModel):
+    """프롬프트 길이에 비례해 지연되는 스텁 모델 (입력 토큰 처리 시간 흉내)"""
+    def __init__(self, seconds_per_token: float = 0.0002):
+        super().__init__()
+        self.seconds_per_token = seconds_per_token
+
+    def generate_content(self, prompt):
+        self.delay = main2.estimate_tokens(prompt) * self.seconds_per_token
+        return super().generate_content(prompt)
+
+
+def test_prune_log_lines_keeps_anomalies_with_context():
+    """이상 이벤트와 문맥 줄은 남기고 나머지 INFO 줄은 요약으로 접는지 검증하는 테스트"""
+    lines = (HERE / 'mission_computer_main.log').read_text(encoding='utf-8').splitlines()
+    pruned = main2.LogProcessor().prune_log_lines(lines, context_lines=1)
+
+    assert len(pruned) < len(lines)
+    assert any('Oxygen tank unstable.' in line for line in pruned)
+    assert any('Oxygen tank explosion.' in line for line in pruned)
+    assert any('Mission completed successfully' in line for line in pruned) # 문맥 줄
+    assert any('줄 생략' in line for line in pruned)
+
+
+def test_prune_log_lines_token_budget():
+    """토큰 예산을 넘으면 요약·문맥 줄부터 잘라내는지 검증하는 테스트"""
+    lines = ['2023-08-27 10:00:00,INFO,Boot.'] * 50 + [
+        '2023-08-27 11:00:00,ERROR,Valve stuck open.',
+        '2023-08-27 11:01:00,INFO,Pressure nominal.',
+    ]
+    pruned = main2.LogProcessor().prune_log_lines(lines, context_lines=1, token_budget=15)
+
+    assert pruned == ['2023-08-27 11:00:00,ERROR,Valve stuck open.']
+
+
+def test_pruned_prompt_is_smaller_and_faster():
+    """필터링한 프롬프트가 더 작고 스텁 백엔드에서 더 빨리 처리되는지 측정하는 테스트"""
+    lines = (HERE / 'mission_computer_main.log').read_text(encoding='utf-8').splitlines()[1:]
+    processor = main2.LogProcessor()
+    full_logs = processor.parse_logs(lines)
+    pruned_logs = processor.parse_logs(processor.prune_log_lines(lines, context_lines=1))
+
+    model = SizeProportionalStubModel()
+    reporter = main2.LLMReportGenerator(model=model)
+    timings = {}
+    for name, logs in (('full', full_logs), ('pruned', pruned_logs)):
+        prompt = reporter._create_prompt(logs)
+        start = time.perf_counter()
+        reporter._generate(prompt)
+        timings[name] = (main2.estimate_tokens(prompt), time.perf_counter() - start)
+
+    full_tokens = timings['full'][0]
+    pruned_tokens = timings['pruned'][0]
+    print(f"prompt tokens {full_tokens} -> {pruned_tokens}, "
+          f"latency {timings['full'][1]:.3f}s -> {timings['pruned'][1]:.3f}s")
+    assert pruned_tokens < full_tokens
+    assert timings['pruned'][1] < timings['full'][1]
+
+
+class FakeStreamingModel:
+    """응답을 조각 단위로 흘려보내는 로컬 가짜 스트리밍 백엔드"""
+    def __init__(self, pieces, delay: float = 0.01, fail_after: int = None):
+        self.pieces = pieces
+        self.delay = delay
+        self.fail_after = fail_after
+
+    def generate_content(self, prompt, stream=False):
+        assert stream
+        return self._iter()
+
+    def _iter(self):
+        for i, piece in enumerate(self.pieces):
+            if self.fail_after is not None and i == self.fail_after:
+                raise ConnectionError("stream reset")
+            time.sleep(self.delay)
+            yield SimpleNamespace(text=piece)
+
+
+def test_streaming_report_writes_incrementally(tmp_path, capsys):
+    """스트리밍 모드가 조각을 파일·터미널에 쓰고 TTFT와 전체 지연을 기록하는지 검증하는 테스트"""
+    pieces = ['# 🚀 사고 원인 분석 보고서\n', '## 개요\n', '산소 탱크 폭발.\n']
+    reporter = main2.LLMReportGenerator(model=FakeStreamingModel(pieces))
+    output = tmp_path / 'log_analysis.md'
+
+    assert reporter.generate_analysis_report(_read_logs(), output, stream=True)
+    assert output.read_text(encoding='utf-8') == ''.join(pieces)
+    assert '산소 탱크 폭발.' in capsys.readouterr().out
+
+    stats = reporter.last_stream_stats
+    assert stats['completed']
+    assert 0 < stats['ttft'] < stats['total']
+
+
+def test_streaming_report_keeps_partial_output(tmp_path):
+    """스트림이 끊겨도 받은 내용까지는 파일에 남는지 검증하는 테스트"""
+    model = FakeStreamingModel(['first part\n', 'second part\n', 'never sent\n'], fail_after=2)
+    reporter = main2.LLMReportGenerator(model=model)
+    output = tmp_path / 'log_analysis.md'
+
+    assert not reporter.generate_analysis_report(_read_logs(), output, stream=True)
+    text = output.read_text(encoding='utf-8')
+    assert text.startswith('first part\nsecond part\n')
+    assert 'never sent' not in text
+    assert not reporter.last_stream_stats['completed']
+
+
+def _make_log_dir(path: Path, count: int) -> Path:
+    path.mkdir()
+    source = (HERE / 'mission_computer_main.log').read_text(encoding='utf-8')
+    for i in range(count):
+        (path / f'mission_{i:03d}.log').write_text(source, encoding='utf-8')
+    (path / 'empty.log').write_text('', encoding='utf-8')
+    return path
+
+
+def test_batch_reports_against_mock_llm_server(tmp_path):
+    """모의 LLM 서버를 대상으로 배치 보고서·인덱스 생성과 처리량을 측정하는 테스트"""
+    import batch_report
+    from mock_llm_server import MockLLMServer
+
+    log_dir = _make_log_dir(tmp_path / 'logs', 8)
+    output_dir = tmp_path / 'reports'
+    server = MockLLMServer(delay=0.05, fail_first=2).start()
+    try:
+        reporter = main2.LLMReportGenerator(model=batch_report.HttpLLMModel(server.url))
+        summary = batch_report.run_batch(log_dir, output_dir, reporter, concurrency=4,
+                                         rate=200, burst=4, retries=2, backoff=0.01)
+    finally:
+        server.stop()
+
+    print(f"batch throughput: {summary['files_per_second']:.1f} files/s")
+    assert summary['files'] == 9
+    assert summary['ok'] == 8 # 빈 로그는 실패로 기록
+    assert server.requests == 8 + 2 # 503 두 번은 재시도로 복구
+    assert len(list(output_dir.glob('mission_*_analysis.md'))) == 8
+    index = (output_dir / 'index.md').read_text(encoding='utf-8')
+    assert 'empty.log | failed' in index
+    assert summary['files_per_second'] > 0
+
+
+def test_batch_per_file_timeout(tmp_path):
+    """요청이 타임아웃을 넘기면 재시도 후 실패로 기록되는지 검증하는 테스트"""
+    import batch_report
+    from mock_llm_server import MockLLMServer
+
+    log_dir = _make_log_dir(tmp_path / 'logs', 1)
+    server = MockLLMServer(delay=0.5).start()
+    try:
+        reporter = main2.LLMReportGenerator(model=batch_report.HttpLLMModel(server.url))
+        summary = batch_report.run_batch(log_dir, tmp_path / 'reports', reporter, pattern='mission_*.log',
+                                         rate=100, timeout=0.1, retries=1, backoff=0.01)
+    finally:
+        server.stop()
+
+    assert summary['ok'] == 0
+    assert 'timeout' in (tmp_path / 'reports' / 'index.md').read_text(encoding='utf-8')
+
+
+def test_batch_timeout_covers_retries(tmp_path):
+    """타임아웃이 시도마다가 아니라 재시도·백오프를 포함한 파일 하나의 마감 시간인지 검증하는 테스트"""
+    import batch_report
+    from mock_llm_server import MockLLMServer
+
+    log_dir = _make_log_dir(tmp_path / 'logs', 1)
+    server = MockLLMServer(delay=0.15, fail_first=100).start()
+    try:
+        reporter = main2.LLMReportGenerator(model=batch_report.HttpLLMModel(server.url))
+        summary = batch_report.run_batch(log_dir, tmp_path / 'reports', reporter, pattern='mission_*.log',
+                                         rate=100, timeout=0.4, retries=5, backoff=0.01)
+    finally:
+        server.stop()
+
+    # 시도마다 0.15초씩 실패하므로 0.4초 마감 안에서는 최대 세 번만 요청합니다.
+    assert summary['ok'] == 0
+    assert server.requests <= 3
+    assert '| mission_000.log | failed |' in (tmp_path / 'reports' / 'index.md').read_text(encoding='utf-8')
+    assert 'timeout' in (tmp_path / 'reports' / 'index.md').read_text(encoding='utf-8')
+
+
+def test_batch_cli_passes_timeout_to_http_model(tmp_path, monkeypatch):
+    """--timeout이 HTTP 요청 자체의 소켓 타임아웃으로도 쓰여 느린 요청이 제때 끊기는지 검증하는 테스트"""
+    import batch_report
+    from mock_llm_server import MockLLMServer
+
+    timeouts = []
+
+    class RecordingModel(batch_report.HttpLLMModel):
+        def __init__(self, url, timeout=60.0):
+            super().__init__(url, timeout)
+            timeouts.append(timeout)
+
+    monkeypatch.setattr(batch_report, 'HttpLLMModel', RecordingModel)
+    server = MockLLMServer(delay=1.0).start()
+    try:
+        args = SimpleNamespace(llm_url=server.url, no_cache=True, cache_dir=tmp_path / 'cache',
+                               batch=_make_log_dir(tmp_path / 'logs', 1), output_dir=tmp_path / 'reports',
+                               workers=1, rate=100, timeout=0.1, retries=0, prune=False,
+                               context=2, token_budget=None)
+        assert batch_report.run_batch_cli(args) == 1
+
+        start = time.perf_counter()
+        try:
+            RecordingModel(server.url, timeout=0.1).generate_content('ping')
+        except OSError:
+            pass
+        assert time.perf_counter() - start < 0.5
+    finally:
+        server.stop()
+
+    assert timeouts[0] == 0.1
+
+
+def test_http_and_gemini_backends_use_separate_cache_keys(tmp_path):
+    """같은 프롬프트라도 HTTP 백엔드와 Gemini의 응답이 캐시에서 섞이지 않는지 검증하는 테스트"""
+    import batch_report
+    from mock_llm_server import MockLLMServer
+
+    log_dir = _make_log_dir(tmp_path / 'logs', 1)
+    server = MockLLMServer(delay=0.0).start()
+    try:
+        args = SimpleNamespace(llm_url=server.url, no_cache=False, cache_dir=tmp_path / 'cache',
+                               batch=log_dir, output_dir=tmp_path / 'reports', workers=1, rate=100,
+                               timeout=5.0, retries=0, prune=False, context=2, token_budget=None)
+        batch_report.run_batch_cli(args)
+        assert server.requests == 1
+        batch_report.run_batch_cli(args)
+        assert server.requests == 1 # 같은 URL로 다시 실행하면 캐시 적중
+    finally:
+        server.stop()
+
+    http_model = batch_report.HttpLLMModel(server.url)
+    assert http_model.model_name == f"http:{server.url}"
+    assert (main2.ResponseCache.make_key(http_model.model_name, 'prompt')
+            != main2.ResponseCache.make_key('gemini-1.5-flash', 'prompt'))
+
+    # 기본(Gemini) 이름의 생성기는 HTTP 백엔드가 남긴 항목을 쓰지 않고 모델을 호출합니다.
+    _, logs, _ = batch_report.parse_log_file(log_dir / 'mission_000.log')
+    gemini = StubModel()
+    reporter = main2.LLMReportGenerator(model=gemini, cache=main2.ResponseCache(tmp_path / 'cache'))
+    assert reporter._generate(reporter._create_prompt(logs)).startswith('summary-')
+    assert len(gemini.prompts) == 1
+
+
+def test_streaming_report_with_http_model(tmp_path, capsys):
+    """스트리밍을 지원하지 않는 HTTP 백엔드로 -s를 써도 응답 전체가 한 조각으로 저장되는지 검증하는 테스트"""
+    import batch_report
+    from mock_llm_server import MockLLMServer
+
+    server = MockLLMServer(delay=0.0).start()
+    try:
+        model = batch_report.HttpLLMModel(server.url)
+        reporter = main2.LLMReportGenerator(model=model, model_name=model.model_name)
+        output = tmp_path / 'log_analysis.md'
+        assert reporter.generate_analysis_report(_read_logs(), output, stream=True)
+    finally:
+        server.stop()
+
+    assert output.read_text(encoding='utf-8').startswith('# 🚀 사고 원인 분석 보고서')
+    assert reporter.last_stream_stats['completed']
+    assert server.requests == 1
+
+
+def test_batch_rejects_map_reduce_and_stream(tmp_path):
+    """-b와 함께 쓸 수 없는 -m·-s 옵션을 조용히 무시하지 않고 거부하는지 검증하는 테스트"""
+    log_dir = _make_log_dir(tmp_path / 'logs', 1)
+    for option in ('-m', '-s'):
+        result = subprocess.run(
+            [sys.executable, str(HERE / 'main2.py'), '-b', str(log_dir), option],
+            cwd=tmp_path, capture_output=True, text=True
+        )
+        assert result.returncode == 2
+        assert '--batch' in result.stderr
+    assert not (tmp_path / 'reports').exists()
+
+
+def test_token_bucket_limits_rate():
+    """토큰 버킷이 초당 요청 수를 제한하는지 검증하는 테스트"""
+    import asyncio
+    import batch_report
+
+    async def take(n):
+        bucket = batch_report.TokenBucket(rate=50, capacity=1)
+        start = time.perf_counter()
+        for _ in range(n):
+            await bucket.acquire()
+        return time.perf_counter() - start
+
+    assert asyncio.run(take(11)) >= 10 / 50 * 0.9
+
+
+def test_sort_logs_desc_numpy_and_duplicate_keys():
+    """epoch 기반 정렬이 형식이 섞인 시간도 올바르게 정렬하고, 중복 시간을 보존하는지 검증하는 테스트"""
+    logs = [
+        ['2023-08-27 10:00:00', 'a'],
+        ['timestamp', 'header'],
+        ['2023-08-27T09:59:59', 'b'],
+        ['2023-08-27 10:00:00', 'c'],
+        ['2023-08-28', 'd'],
+    ]
+    processor = main2.LogProcessor()
+    sorted_logs = processor.sort_logs_desc_numpy(logs)
+
+    assert [msg for _, msg in sorted_logs] == ['d', 'a', 'c', 'b', 'header']
+    log_dict = processor.convert_to_dict(sorted_logs, keep_duplicates=True)
+    assert log_dict['2023-08-27 10:00:00'] == 'a'
+    assert log_dict['2023-08-27 10:00:00#2'] == 'c'
+    assert len(log_dict) == len(logs)
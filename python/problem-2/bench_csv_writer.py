@@ -0,0 +1,71 @@
+import sys
+import csv
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from main3 import save_structured_array_to_csv
+
+# --- 구조화 배열 CSV 저장 벤치마크 ---
+# 행마다 str()을 거쳐 csv.writer로 쓰는 기존 방식과 열 단위 벡터 포맷 방식을 비교한다.
+
+
+def make_averages_array(rows: int, parts: int = 1_000, seed: int = 0):
+    """main3.main이 저장하는 ('parts' 코드, 'avg_strength' f8) 배열과 어휘를 만든다."""
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"Part {i:05d}" for i in range(parts)])
+    data = np.empty(rows, dtype=[('parts', 'i4'), ('avg_strength', 'f8')])
+    data['parts'] = rng.integers(0, parts, rows)
+    data['avg_strength'] = np.round(rng.random(rows) * 100, 3)
+    return data, vocab
+
+
+def legacy_save(data: np.ndarray, filename: Path, vocab: np.ndarray) -> None:
+    """기존 save_structured_array_to_csv의 행 단위 csv.writer 루프"""
+    with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(list(data.dtype.names))
+        for r in data:
+            row = [str(field) for field in r]
+            row[0] = str(vocab[r[0]])
+            writer.writerow(row)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark structured array CSV writers')
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--precision', type=int, default=None,
+                        help='Also time the vectorized writer with this float precision')
+    parser.add_argument('--skip-legacy', action='store_true', help='Do not run the row-by-row writer')
+    args = parser.parse_args()
+
+    print(f"{args.rows:,}행 생성 중...")
+    data, vocab = make_averages_array(args.rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        new_path = Path(tmp) / 'vectorized.csv'
+        start = time.perf_counter()
+        save_structured_array_to_csv(data, new_path, vocab=vocab)
+        t_new = time.perf_counter() - start
+        print(f"열 단위 벡터 저장          {t_new:10.3f}s")
+
+        if args.precision is not None:
+            start = time.perf_counter()
+            save_structured_array_to_csv(data, Path(tmp) / 'fixed.csv', vocab=vocab,
+                                         float_precision=args.precision)
+            print(f"열 단위 벡터 저장 (%.{args.precision}f)   {time.perf_counter() - start:10.3f}s")
+
+        if not args.skip_legacy:
+            legacy_path = Path(tmp) / 'legacy.csv'
+            start = time.perf_counter()
+            legacy_save(data, legacy_path, vocab)
+            t_old = time.perf_counter() - start
+            print(f"행 단위 csv.writer(기존)   {t_old:10.3f}s  ({t_old / t_new:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
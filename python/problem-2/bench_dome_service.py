@@ -0,0 +1,196 @@
+import sys
+import json
+import time
+import socket
+import argparse
+import subprocess
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlparse, urlencode
+
+import numpy as np
+
+from design_dome import DEFAULT_MATERIALS
+
+# --- 돔 계산 HTTP 서비스 부하 벤치마크 ---
+# dome_service.py를 별도 프로세스로 띄우고(또는 --url의 서버에), keep-alive 연결로
+# 단건 GET 지연 시간(캐시 적중/미적중), 동시 GET 처리량, 배치 POST 크기별 처리량을 잰다.
+
+
+def make_specs(count: int, seed: int = 0) -> list:
+    """서로 다른 돔 사양 count개 (지름 1~50m, 두께 0.5~20cm를 소수 둘째 자리까지)"""
+    rng = np.random.default_rng(seed)
+    diameters = np.round(rng.uniform(1, 50, count), 2).tolist()
+    thicknesses = np.round(rng.uniform(0.5, 20, count), 2).tolist()
+    materials = np.array(DEFAULT_MATERIALS)[rng.integers(0, len(DEFAULT_MATERIALS), count)].tolist()
+    return [{'diameter': d, 'material': m, 'thickness': t}
+            for d, m, t in zip(diameters, materials, thicknesses)]
+
+
+class _Client:
+    """keep-alive 연결 하나로 요청을 보내는 작은 JSON 클라이언트"""
+    def __init__(self, url: str):
+        parsed = urlparse(url)
+        self.connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=60)
+
+    def get(self, path: str) -> dict:
+        self.connection.request('GET', path)
+        return self._read()
+
+    def post(self, path: str, payload) -> dict:
+        body = json.dumps(payload).encode('utf-8')
+        self.connection.request('POST', path, body=body, headers={'Content-Type': 'application/json'})
+        return self._read()
+
+    def _read(self) -> dict:
+        response = self.connection.getresponse()
+        payload = json.loads(response.read())
+        if response.status >= 500:
+            raise RuntimeError(f"서버 오류 {response.status}: {payload}")
+        return payload
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def _latency_summary(seconds: list) -> dict:
+    ms = np.array(seconds) * 1000
+    return {'requests': len(ms), 'p50_ms': round(float(np.percentile(ms, 50)), 3),
+            'p95_ms': round(float(np.percentile(ms, 95)), 3), 'p99_ms': round(float(np.percentile(ms, 99)), 3),
+            'requests_per_second': round(len(ms) / (ms.sum() / 1000), 1)}
+
+
+def bench_single(url: str, specs: list) -> dict:
+    """한 연결로 GET을 차례로 보내 지연 시간을 잰다. 처음은 캐시 미적중, 두 번째는 같은 사양으로 적중."""
+    client = _Client(url)
+    results = {}
+    for label in ('cold', 'hot'):
+        seconds = []
+        for spec in specs:
+            start = time.perf_counter()
+            client.get('/dome?' + urlencode(spec))
+            seconds.append(time.perf_counter() - start)
+        results[label] = _latency_summary(seconds)
+    client.close()
+    return results
+
+
+def bench_concurrent(url: str, specs: list, clients: int, requests_per_client: int) -> dict:
+    """clients개 스레드가 각자 연결 하나로 캐시된 사양을 GET해 전체 처리량과 지연 분포를 잰다."""
+    def worker(offset):
+        client = _Client(url)
+        seconds = []
+        for i in range(requests_per_client):
+            spec = specs[(offset + i) % len(specs)]
+            start = time.perf_counter()
+            client.get('/dome?' + urlencode(spec))
+            seconds.append(time.perf_counter() - start)
+        client.close()
+        return seconds
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        per_client = list(executor.map(worker, range(0, clients * 997, 997)))
+    elapsed = time.perf_counter() - start
+
+    summary = _latency_summary([s for seconds in per_client for s in seconds])
+    summary['clients'] = clients
+    summary['requests_per_second'] = round(summary['requests'] / elapsed, 1)
+    return summary
+
+
+def bench_batches(url: str, batch_sizes: list, repeats: int, seed: int) -> list:
+    """배치 크기별로 처음 보내는 사양(미적중)과 같은 배치 재전송(적중)의 POST 처리량을 잰다."""
+    client = _Client(url)
+    results = []
+    for size in batch_sizes:
+        # 지름을 100m 이상으로 옮겨 단건 GET 단계에서 캐시된 사양과 겹치지 않게 한다
+        batches = [[dict(spec, diameter=spec['diameter'] + 100 * (r + 1))
+                    for spec in make_specs(size, seed=seed + 1000 + size + r)] for r in range(repeats)]
+        for label in ('cold', 'hot'):
+            seconds = []
+            for batch in batches:
+                start = time.perf_counter()
+                response = client.post('/dome', {'specs': batch})
+                seconds.append(time.perf_counter() - start)
+                assert len(response['results']) == size
+            total = sum(seconds)
+            results.append({'batch': size, 'cache': label, 'p50_ms': round(float(np.median(seconds)) * 1000, 3),
+                            'specs_per_second': round(size * repeats / total, 1)})
+    client.close()
+    return results
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_service(cache_size: int) -> tuple:
+    """dome_service.py를 별도 프로세스로 띄우고 응답할 때까지 기다린다. (프로세스, URL)을 반환."""
+    port = _free_port()
+    process = subprocess.Popen([sys.executable, str(Path(__file__).with_name('dome_service.py')),
+                                '--port', str(port), '--cache-size', str(cache_size)],
+                               stdout=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(200):
+        try:
+            _Client(url).get('/stats')
+            return process, url
+        except OSError:
+            time.sleep(0.05)
+    process.terminate()
+    raise RuntimeError("돔 계산 서비스가 시작되지 않았습니다.")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Load benchmark for the dome calculation service')
+    parser.add_argument('--url', default=None, help='Benchmark a running service instead of starting one')
+    parser.add_argument('--requests', type=int, default=2000, help='Sequential GET requests per phase')
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 4, 16], help='Concurrent GET clients')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 100, 1000, 10000])
+    parser.add_argument('--repeats', type=int, default=5, help='POSTs per batch size and cache state')
+    parser.add_argument('--cache-size', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', type=Path, default=None, help='Write results as JSON')
+    args = parser.parse_args()
+
+    process = None
+    url = args.url
+    if url is None:
+        process, url = start_service(args.cache_size)
+    try:
+        specs = make_specs(args.requests, seed=args.seed)
+        report = {'url': url, 'single': bench_single(url, specs)}
+        for label, summary in report['single'].items():
+            print(f"단건 GET ({label:<4})   p50 {summary['p50_ms']:7.3f}ms  p95 {summary['p95_ms']:7.3f}ms  "
+                  f"p99 {summary['p99_ms']:7.3f}ms  {summary['requests_per_second']:9,.0f} req/s")
+
+        report['concurrent'] = []
+        for clients in args.clients:
+            summary = bench_concurrent(url, specs, clients, max(1, args.requests // clients))
+            report['concurrent'].append(summary)
+            print(f"동시 GET {clients:>3}개 연결  p50 {summary['p50_ms']:7.3f}ms  p95 {summary['p95_ms']:7.3f}ms  "
+                  f"p99 {summary['p99_ms']:7.3f}ms  {summary['requests_per_second']:9,.0f} req/s")
+
+        report['batch'] = bench_batches(url, args.batch_sizes, args.repeats, args.seed)
+        for row in report['batch']:
+            print(f"배치 POST {row['batch']:>6}개 ({row['cache']:<4})  p50 {row['p50_ms']:9.3f}ms  "
+                  f"{row['specs_per_second']:12,.0f} specs/s")
+
+        report['cache'] = _Client(url).get('/stats')
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+        print(f"\n결과 저장: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+import sys
+import time
+import argparse
+
+import numpy as np
+
+from main3 import groupby_stats
+
+# --- 부품별 집계 벤치마크 ---
+# 기존 부품별 불리언 마스크 방식(O(n·k))과 groupby_stats(O(n) 벡터 연산)를 비교한다.
+
+
+def make_parts_array(rows: int, parts: int, seed: int = 0) -> np.ndarray:
+    """범주형 로더 이전 main3가 쓰던 ('parts' U10, 'strength' i4) 구조화 배열을 만든다."""
+    rng = np.random.default_rng(seed)
+    names = np.array([f"P{i:07d}" for i in range(parts)], dtype='U10')
+    data = np.empty(rows, dtype=[('parts', 'U10'), ('strength', 'i4')])
+    data['parts'] = names[rng.integers(0, parts, rows)]
+    data['strength'] = rng.integers(0, 100, rows)
+    return data
+
+
+def legacy_averages(data: np.ndarray):
+    """기존 calculate_item_averages의 부품별 마스크 루프"""
+    part_names = data['parts']
+    strength_values = data['strength']
+    averages = []
+    for part in np.unique(part_names):
+        averages.append(np.mean(strength_values[part_names == part]))
+    return np.array(averages)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark per-part aggregation')
+    parser.add_argument('--rows', type=int, default=100_000_000)
+    parser.add_argument('--parts', type=int, default=100_000)
+    parser.add_argument('--legacy-budget', type=float, default=1e10,
+                        help='Skip the legacy loop when rows * parts exceeds this')
+    args = parser.parse_args()
+
+    print(f"{args.rows:,}행, 부품 {args.parts:,}종 생성 중...")
+    data = make_parts_array(args.rows, args.parts)
+
+    start = time.perf_counter()
+    keys, stats = groupby_stats(data['parts'], data['strength'])
+    t_new = time.perf_counter() - start
+    print(f"groupby_stats              {t_new:10.3f}s")
+
+    if args.rows * args.parts <= args.legacy_budget:
+        start = time.perf_counter()
+        legacy = legacy_averages(data)
+        t_old = time.perf_counter() - start
+        print(f"부품별 마스크 루프(기존)   {t_old:10.3f}s  ({t_old / t_new:.1f}x)")
+        assert np.allclose(legacy, stats['mean'])
+    else:
+        print("부품별 마스크 루프(기존)   생략 (rows * parts가 --legacy-budget 초과)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+from synth_data import make_inventory_csv
+from main import (iter_mars_inventory, load_inventory_columns,
+                  sort_by_flammability, filter_dangerous_items,
+                  build_flammability_index, query_flammability_index)
+
+# --- 인벤토리 파이프라인 벤치마크 ---
+# 합성 인벤토리 CSV로 기존 dict 리스트 경로와 열 단위 NumPy 경로의 읽기·정렬·필터 시간을 비교한다.
+
+def _timed(label: str, func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    print(f"{label:<28} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+def _bench_index(csv_path: Path) -> None:
+    """인덱스 생성 시간과 여러 범위 질의의 응답 시간을 측정한다."""
+    print("\n[인화성 인덱스]")
+    _timed('build_flammability_index', build_flammability_index, csv_path)
+    for low, high in ((0.99, 1.0), (0.995, 0.996), (0.5, 0.5001), (0.9, 1.0)):
+        start = time.perf_counter()
+        records = query_flammability_index(csv_path, low, high)
+        elapsed = time.perf_counter() - start
+        print(f"query [{low}, {high})  {len(records):>10,}행 {elapsed * 1000:10.1f}ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark inventory read/sort/filter paths')
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--index', action='store_true',
+                        help='Benchmark the persistent flammability index instead')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / 'inventory.csv'
+        print(f"{args.rows:,}행 합성 인벤토리 생성 중...")
+        make_inventory_csv(csv_path, args.rows)
+
+        if args.index:
+            _bench_index(csv_path)
+            return 0
+
+        print("\n[dict 리스트 경로]")
+        records = _timed('read', lambda: list(iter_mars_inventory(csv_path, echo=False)))
+        ordered = _timed('sort_by_flammability', sort_by_flammability, records)
+        _timed('filter_dangerous_items', filter_dangerous_items, ordered, verbose=False)
+        del records, ordered
+
+        print("\n[열 단위 NumPy 경로]")
+        columns = _timed('load_inventory_columns', load_inventory_columns, csv_path)
+        ordered = _timed('sort_by_flammability', sort_by_flammability, columns)
+        _timed('filter_dangerous_items', filter_dangerous_items, ordered, verbose=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
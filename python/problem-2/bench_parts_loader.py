@@ -0,0 +1,46 @@
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from synth_data import make_parts_csv
+from main3 import parse_parts_csv_categorical, load_parts_csv_categorical
+
+# 예전 read_csv_to_numpy가 쓰던 고정 길이 문자열 구조화 배열 (부품명 10자 초과는 잘림)
+LEGACY_PARTS_DTYPE = np.dtype([('parts', 'U10'), ('strength', 'i4')])
+
+# --- parts CSV 로더 벤치마크 ---
+# np.genfromtxt(기존), 블록 범주형 파싱, .npy 캐시 memory-map 로드 시간을 행 수별로 비교한다.
+
+def _timed(label: str, func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    print(f"  {label:<40} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark parts CSV loaders')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 10_000_000, 100_000_000])
+    parser.add_argument('--genfromtxt-max', type=int, default=10_000_000,
+                        help='Skip np.genfromtxt above this many rows')
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = make_parts_csv(Path(tmp) / 'parts.csv', rows)
+            print(f"{rows:,}행")
+            if rows <= args.genfromtxt_max:
+                _timed('np.genfromtxt (기존)', np.genfromtxt, csv_path, delimiter=',', skip_header=1,
+                       dtype=LEGACY_PARTS_DTYPE, encoding='utf-8')
+            _timed('parse_parts_csv_categorical', parse_parts_csv_categorical, csv_path)
+            _timed('load_parts_csv_categorical (캐시 생성)', load_parts_csv_categorical, csv_path)
+            _timed('load_parts_csv_categorical (mmap)', load_parts_csv_categorical, csv_path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
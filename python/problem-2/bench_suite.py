@@ -0,0 +1,220 @@
+import io
+import sys
+import json
+import time
+import platform
+import argparse
+import subprocess
+import tempfile
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+
+from synth_data import make_inventory_csv, make_parts_csv, make_dome_csv
+from main import (iter_mars_inventory, load_inventory_columns, sort_by_flammability,
+                  filter_dangerous_items, save_dangerous_items_csv)
+from main3 import (parse_parts_csv_categorical, calculate_item_averages, stream_item_averages,
+                   filter_low_average_items, save_structured_array_to_csv)
+from design_dome import run_dome_batch
+
+# --- problem-2 CSV 파이프라인 벤치마크 모음 ---
+# 합성 CSV로 파이프라인별 읽기·정렬/집계·필터·쓰기 시간과 최대 RSS를 규모별로 재고, 커밋 간 비교용 JSON으로 남긴다.
+# 각 측정은 새 프로세스에서 실행하므로 최대 RSS가 서로 섞이지 않는다.
+
+
+class _Stages:
+    """단계별 경과 시간을 모으는 작은 타이머"""
+    def __init__(self):
+        self.seconds = {}
+
+    def run(self, name: str, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.seconds[name] = round(time.perf_counter() - start, 4)
+        return result
+
+
+def _bench_inventory(stages: _Stages, csv_path: Path, out_dir: Path) -> None:
+    columns = stages.run('read', load_inventory_columns, csv_path)
+    ordered = stages.run('sort', sort_by_flammability, columns)
+    dangerous = stages.run('filter', filter_dangerous_items, ordered, verbose=False)
+    stages.run('write', save_dangerous_items_csv, dangerous, out_dir / 'danger.csv')
+
+
+def _bench_inventory_records(stages: _Stages, csv_path: Path, out_dir: Path) -> None:
+    records = stages.run('read', lambda: list(iter_mars_inventory(csv_path, echo=False)))
+    ordered = stages.run('sort', sort_by_flammability, records)
+    dangerous = stages.run('filter', filter_dangerous_items, ordered, verbose=False)
+    stages.run('write', save_dangerous_items_csv, dangerous, out_dir / 'danger.csv')
+
+
+def _save_low_parts(stages: _Stages, part_codes, mean_strengths, vocab, out_dir: Path) -> None:
+    filtered_parts, filtered_strengths = stages.run('filter', filter_low_average_items,
+                                                    part_codes, mean_strengths)
+    save_array = np.empty(len(filtered_parts), dtype=[('parts', 'i4'), ('avg_strength', 'f8')])
+    save_array['parts'] = filtered_parts
+    save_array['avg_strength'] = filtered_strengths
+    stages.run('write', save_structured_array_to_csv, save_array, out_dir / 'parts_to_work_on.csv',
+               vocab=vocab)
+
+
+def _bench_parts(stages: _Stages, csv_path: Path, out_dir: Path) -> None:
+    data, vocab = stages.run('read', parse_parts_csv_categorical, csv_path)
+    part_codes, mean_strengths = stages.run('groupby', calculate_item_averages, data,
+                                            verbose=False, vocab=vocab)
+    _save_low_parts(stages, part_codes, mean_strengths, vocab, out_dir)
+
+
+def _bench_parts_stream(stages: _Stages, csv_path: Path, out_dir: Path) -> None:
+    part_codes, mean_strengths, vocab = stages.run('read+groupby', stream_item_averages, [csv_path],
+                                                   verbose=False)
+    _save_low_parts(stages, part_codes, mean_strengths, vocab, out_dir)
+
+
+def _bench_dome_batch(stages: _Stages, csv_path: Path, out_dir: Path) -> None:
+    with open(csv_path, 'r', encoding='utf-8') as source, \
+            open(out_dir / 'domes.csv', 'w', encoding='utf-8') as output, \
+            open(out_dir / 'rejects.csv', 'w', encoding='utf-8', newline='') as reject_file:
+        stages.run('batch', run_dome_batch, source, output, reject_file)
+
+
+# 파이프라인 이름 → (CSV 스키마, 측정 함수)
+PIPELINES = {
+    'inventory': ('inventory', _bench_inventory),
+    'inventory-records': ('inventory', _bench_inventory_records),
+    'parts': ('parts', _bench_parts),
+    'parts-stream': ('parts', _bench_parts_stream),
+    'dome-batch': ('dome', _bench_dome_batch),
+}
+
+
+def _peak_rss_mb() -> float:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return round(peak / (1 << 20 if sys.platform == 'darwin' else 1 << 10), 1)
+
+
+def run_case(pipeline: str, csv_path: Path) -> dict:
+    """작업 프로세스에서 파이프라인 하나를 실행하고 단계별 시간과 최대 RSS를 돌려준다."""
+    stages = _Stages()
+    with tempfile.TemporaryDirectory() as out_dir, redirect_stdout(io.StringIO()):
+        PIPELINES[pipeline][1](stages, Path(csv_path), Path(out_dir))
+    return {'stages': stages.seconds, 'total': round(sum(stages.seconds.values()), 4),
+            'peak_rss_mb': _peak_rss_mb()}
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True, cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(pipelines, rows_list, cardinality: int = None, non_numeric_rate: float = 0.05,
+              bom: bool = None, seed: int = 0) -> dict:
+    """규모(rows_list)마다 합성 CSV를 한 번 만들고, 같은 스키마의 파이프라인들을 각각 새 프로세스에서 측정한다."""
+    results = []
+    for rows in rows_list:
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_paths = {}
+            for pipeline in pipelines:
+                schema = PIPELINES[pipeline][0]
+                if schema not in csv_paths:
+                    options = {'seed': seed}
+                    if bom is not None:
+                        options['bom'] = bom
+                    if schema == 'inventory':
+                        if cardinality is not None:
+                            options['substances'] = cardinality
+                        csv_paths[schema] = make_inventory_csv(Path(tmp) / 'inventory.csv', rows,
+                                                               non_numeric_rate=non_numeric_rate, **options)
+                    elif schema == 'parts':
+                        if cardinality is not None:
+                            options['parts'] = cardinality
+                        csv_paths[schema] = make_parts_csv(Path(tmp) / 'parts.csv', rows, **options)
+                    else:
+                        csv_paths[schema] = make_dome_csv(Path(tmp) / 'domes.csv', rows, seed=seed)
+
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    case = executor.submit(run_case, pipeline, csv_paths[schema]).result()
+                case = {'pipeline': pipeline, 'rows': rows,
+                        'csv_mb': round(csv_paths[schema].stat().st_size / (1 << 20), 1), **case}
+                stages = ' '.join(f"{name}={seconds:.3f}s" for name, seconds in case['stages'].items())
+                print(f"{pipeline:<18} {rows:>12,}행  {stages}  peak {case['peak_rss_mb']} MB", flush=True)
+                results.append(case)
+
+    return {
+        'meta': {
+            'commit': _git_commit(),
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cardinality': cardinality,
+            'non_numeric_rate': non_numeric_rate,
+            'bom': bom,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def compare_results(baseline: dict, current: dict) -> None:
+    """같은 (파이프라인, 행 수) 측정끼리 단계별 시간과 최대 RSS의 비율(현재/기준)을 출력한다."""
+    previous = {(case['pipeline'], case['rows']): case for case in baseline['results']}
+    print(f"\n기준 커밋 {baseline['meta'].get('commit')} 대비 (현재/기준, 1보다 크면 느려짐)")
+    for case in current['results']:
+        old = previous.get((case['pipeline'], case['rows']))
+        if old is None:
+            continue
+        ratios = [f"{name}={seconds / old['stages'][name]:.2f}x"
+                  for name, seconds in case['stages'].items() if old['stages'].get(name)]
+        if case['peak_rss_mb'] and old['peak_rss_mb']:
+            ratios.append(f"rss={case['peak_rss_mb'] / old['peak_rss_mb']:.2f}x")
+        print(f"{case['pipeline']:<18} {case['rows']:>12,}행  {' '.join(ratios)}")
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Benchmark the problem-2 CSV pipelines')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000, 10_000_000],
+                        help='Row counts to benchmark')
+    parser.add_argument('--pipelines', nargs='+', choices=list(PIPELINES),
+                        default=['inventory', 'parts', 'parts-stream'])
+    parser.add_argument('--cardinality', type=int, default=None,
+                        help='Distinct substances/parts (default: generator defaults)')
+    parser.add_argument('--non-numeric-rate', type=float, default=0.05,
+                        help="Fraction of 'Various' weight/gravity values in the inventory CSV")
+    parser.add_argument('--bom', action=argparse.BooleanOptionalAction, default=None,
+                        help='Force a UTF-8 BOM on or off (default: generator defaults)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', type=Path, default=None, help='Write results as JSON')
+    parser.add_argument('--compare', type=Path, default=None, help='Baseline JSON to compare against')
+    return parser
+
+
+def main() -> int:
+    args = create_parser().parse_args()
+    report = run_suite(args.pipelines, args.rows, cardinality=args.cardinality,
+                       non_numeric_rate=args.non_numeric_rate, bom=args.bom, seed=args.seed)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+        print(f"\n결과 저장: {args.output}")
+    if args.compare:
+        compare_results(json.loads(args.compare.read_text(encoding='utf-8')), report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,14 @@
-import math
 import sys
-from typing import Tuple
+import csv
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from itertools import chain, repeat
+from typing import Tuple, Sequence, List, TextIO
+import numpy as np
 from scipy.constants import g
 
-# 전역 변수들
-material_name = ""
-diameter_value = 0
-thickness_value = 0
-area_value = 0
-weight_value = 0
-
 # 재질별 밀도 (g/cm³)
 MATERIAL_DENSITY = {
     '유리': 2.4,
@@ -22,39 +21,329 @@ MATERIAL_DENSITY = {
 
 MARS_GRAVITY = 0.38
 
-def sphere_area(diameter, material, thickness=1):
+# 재질 코드: MATERIALS의 위치 번호. DENSITY_TABLE[code]로 밀도를 한 번에 조회한다.
+MATERIALS = tuple(MATERIAL_DENSITY)
+DENSITY_TABLE = np.array([MATERIAL_DENSITY[name] for name in MATERIALS])
 
-    global material_name, diameter_value, thickness_value, area_value, weight_value
-            
+# 이름 → 코드 변환용 정렬 사전 (np.searchsorted로 배열 전체를 한 번에 찾는다)
+_SORTED_MATERIALS = np.array(sorted(MATERIALS))
+_SORTED_CODES = np.array([MATERIALS.index(name) for name in _SORTED_MATERIALS.tolist()])
 
-    # 반구체 표면적 계산 (m²) - 1/2 * 4πr² = π/2 * d²
-    surface_area = 1/2 * math.pi * diameter**2
-    
-    # 부피 계산 (m³) - (2/3)π(R³ - r³)
-    thickness_m = thickness / 100  # cm를 m로 변환
-    volume = 2/3 * math.pi * ((diameter/2)**3 - (diameter/2 - thickness_m)**3)
+def material_codes(materials) -> np.ndarray:
+    """재질 이름(하나 또는 여러 개)을 재질 코드 배열로 바꾼다. 모르는 재질이면 ValueError."""
+    names = np.asarray(materials, dtype=str)
+    position = np.searchsorted(_SORTED_MATERIALS, names).clip(max=len(MATERIALS) - 1)
+    unknown = _SORTED_MATERIALS[position] != names
+    if unknown.any():
+        raise ValueError(f"지원하지 않는 재질입니다: {sorted(set(names[unknown].tolist()))}")
+    return _SORTED_CODES[position]
 
-    # 부피를 cm³로 변환
-    volume_cm3 = volume * (100 ** 3)
-    
-    # 질량 계산 (g)
-    weight_g = volume_cm3 * MATERIAL_DENSITY[material]
-    
-    # g을 kg으로 변환
-    weight_kg = weight_g / 1000
-    
-    # 지구에서의 무게 계산
-    earth_weight_kg = weight_kg * g
+def dome_properties(diameter, thickness, material_code) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """반구 돔의 (표면적 m², 질량 kg, 화성 무게 N)을 배열 단위로 계산한다.
 
-    # 화성 중력 적용
-    mars_weight_kg = earth_weight_kg * MARS_GRAVITY
-    
-    # 전역 변수에 저장
-    material_name = material
-    diameter_value = diameter
-    thickness_value = thickness
-    area_value = surface_area
-    weight_value = mars_weight_kg
+    diameter(m), thickness(cm), material_code(MATERIALS 위치)는 NumPy 브로드캐스팅 규칙으로
+    맞춰지므로, 예를 들어 지름 열 벡터와 두께 행 벡터를 넘기면 전체 설계 격자를 한 번에 평가한다.
+    전역 상태를 쓰지 않는 순수 함수라 여러 스레드에서 동시에 불러도 된다.
+    지름·두께가 0 이하이거나 두께가 반지름보다 두꺼운 조합과 유한하지 않은 입력은 NaN(또는 inf)이 된다.
+    재질 코드가 MATERIALS 범위를 벗어나면 ValueError.
+    """
+    codes = np.asarray(material_code)
+    if np.any((codes < 0) | (codes >= len(MATERIALS))):
+        raise ValueError(f"재질 코드는 0 이상 {len(MATERIALS)} 미만이어야 합니다")
+    diameter, thickness, density = np.broadcast_arrays(np.asarray(diameter, dtype=np.float64),
+                                                       np.asarray(thickness, dtype=np.float64),
+                                                       DENSITY_TABLE[codes])
+
+    # inf·nan 입력은 inf - inf 등으로 경고 없이 NaN이 되도록 한다 (배치 모드의 inf 행 등)
+    with np.errstate(invalid='ignore', over='ignore'):
+        # 반구체 표면적 계산 (m²) - 1/2 * 4πr² = π/2 * d²
+        surface_area = 1/2 * np.pi * diameter**2
+
+        # 부피 계산 (m³) - (2/3)π(R³ - r³), 두께는 cm를 m로 변환
+        thickness_m = thickness / 100
+        radius = diameter / 2
+        volume = 2/3 * np.pi * (radius**3 - (radius - thickness_m)**3)
+
+        # 질량 (cm³ × g/cm³ = g → kg)
+        mass_kg = volume * (100 ** 3) * density / 1000
+
+        # 지구 무게에 화성 중력 비율 적용
+        mars_weight = mass_kg * g * MARS_GRAVITY
+
+    invalid = (diameter <= 0) | (thickness <= 0) | (thickness_m > radius)
+    if np.any(invalid):
+        surface_area = np.where(invalid, np.nan, surface_area)
+        mass_kg = np.where(invalid, np.nan, mass_kg)
+        mars_weight = np.where(invalid, np.nan, mars_weight)
+    return surface_area, mass_kg, mars_weight
+
+def sphere_area(diameter, material, thickness=1) -> Tuple[float, float]:
+    """돔 하나의 (표면적 m², 화성 무게 N)을 계산한다. dome_properties의 단일 값 버전."""
+    surface_area, _, mars_weight = dome_properties(diameter, thickness, material_codes(material))
+    return float(surface_area), float(mars_weight)
+
+# 최적화 기본 재질 (같은 재질의 한글 이름은 제외)
+DEFAULT_MATERIALS = ('glass', 'aluminum', 'carbon_steel')
+
+# 최적화 결과 한 행: 설계 변수와 계산 결과
+DOME_DESIGN_DTYPE = np.dtype([('diameter', 'f8'), ('thickness', 'f8'), ('material', 'i4'),
+                              ('area', 'f8'), ('mass', 'f8'), ('weight', 'f8')])
+
+def pareto_front(area: np.ndarray, weight: np.ndarray) -> np.ndarray:
+    """면적은 클수록, 무게는 작을수록 좋을 때 다른 점에 지배되지 않는 점의 인덱스 (무게 오름차순)
+
+    무게 오름차순(같으면 면적 내림차순)으로 정렬한 뒤, 앞선 점들의 최대 면적보다 넓은 점만 남긴다. O(n log n).
+    """
+    order = np.lexsort((-area, weight))
+    sorted_area = area[order]
+    best_before = np.maximum.accumulate(np.concatenate([[-np.inf], sorted_area[:-1]]))
+    return order[sorted_area > best_before]
+
+def _chunk_front(diameters: np.ndarray, thicknesses: np.ndarray, codes: np.ndarray,
+                 max_weight: float) -> np.ndarray:
+    """지름 일부 × 전체 두께 × 재질 격자를 한 번에 계산하고, 무게 제한 안의 파레토 전선만 돌려준다."""
+    grid = np.meshgrid(diameters, thicknesses, codes, indexing='ij', sparse=True)
+    area, mass, weight = (values.ravel() for values in dome_properties(*grid))
+
+    feasible = np.flatnonzero(weight <= max_weight) # NaN(비물리적 조합)도 여기서 빠진다
+    keep = feasible[pareto_front(area[feasible], weight[feasible])]
+    i_d, i_t, i_m = np.unravel_index(keep, (len(diameters), len(thicknesses), len(codes)))
+
+    front = np.empty(len(keep), dtype=DOME_DESIGN_DTYPE)
+    front['diameter'] = diameters[i_d]
+    front['thickness'] = thicknesses[i_t]
+    front['material'] = codes[i_m]
+    front['area'] = area[keep]
+    front['mass'] = mass[keep]
+    front['weight'] = weight[keep]
+    return front
+
+def optimize_dome(diameters, thicknesses, materials: Sequence[str] = DEFAULT_MATERIALS,
+                  max_weight: float = np.inf, chunk_points: int = 1_000_000, workers: int = None,
+                  parallel_threshold: int = 20_000_000) -> np.ndarray:
+    """지름(m) × 두께(cm) × 재질 격자 전체에서 화성 무게 max_weight(N) 이하인 면적-무게 파레토 전선을 찾는다.
+
+    격자는 지름 방향으로 약 chunk_points개씩 나눠 청크마다 벡터 연산으로 평가하고 청크별 전선만 남긴다.
+    (청크 전선들의 합집합에서 다시 구한 전선이 전체 전선과 같다.) 격자가 parallel_threshold점보다 크면
+    청크를 프로세스 풀(workers개, 1이면 풀 없이)로 나눠 계산한다.
+    DOME_DESIGN_DTYPE 구조화 배열을 무게 오름차순으로 반환한다. material은 MATERIALS 코드.
+    """
+    diameters = np.asarray(diameters, dtype=np.float64).ravel()
+    thicknesses = np.asarray(thicknesses, dtype=np.float64).ravel()
+    codes = np.unique(material_codes(list(materials)))
+
+    per_diameter = len(thicknesses) * len(codes)
+    rows = max(1, chunk_points // max(1, per_diameter))
+    chunks = [diameters[start:start + rows] for start in range(0, len(diameters), rows)]
+    if not chunks or per_diameter == 0:
+        return np.empty(0, dtype=DOME_DESIGN_DTYPE)
+
+    jobs = (chunks, repeat(thicknesses), repeat(codes), repeat(max_weight))
+    if len(diameters) * per_diameter > parallel_threshold and workers != 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            fronts = list(executor.map(_chunk_front, *jobs))
+    else:
+        fronts = list(map(_chunk_front, *jobs))
+
+    candidates = np.concatenate(fronts)
+    return candidates[pareto_front(candidates['area'], candidates['weight'])]
+
+def print_design_front(front: np.ndarray) -> None:
+    print(f"\n=== 파레토 전선 ({len(front)}개 설계, 무게 오름차순) ===")
+    print(f"{'재질':<14}{'지름(m)':>10}{'두께(cm)':>10}{'면적(m²)':>14}{'무게(N)':>16}")
+    for design in front:
+        print(f"{MATERIALS[design['material']]:<14}{design['diameter']:>10.3f}{design['thickness']:>10.3f}"
+              f"{design['area']:>14.3f}{design['weight']:>16.3f}")
+
+# 배치 모드: diameter,material,thickness CSV → diameter,material,thickness,area,weight CSV
+BATCH_OUTPUT_HEADER = 'diameter,material,thickness,area,weight'
+BATCH_REJECT_HEADER = 'line,reason,row'
+_MATERIAL_CODE = {name: code for code, name in enumerate(MATERIALS)}
+
+def _line_comma_counts(text: str, n_lines: int) -> np.ndarray:
+    """'\n'으로 이어 붙인 블록에서 행마다 쉼표 개수를 센다 (바이트 배열 위치 연산, 행 단위 루프 없음)."""
+    raw = np.frombuffer(text.encode('utf-8'), dtype=np.uint8)
+    line_of_comma = np.searchsorted(np.flatnonzero(raw == ord('\n')), np.flatnonzero(raw == ord(',')))
+    return np.bincount(line_of_comma, minlength=n_lines)
+
+def _parse_block_fast(text: str, n_lines: int):
+    """모든 행의 쉼표가 2개인 블록을 한 번의 C 파싱으로 (n, 3) 배열(지름, 재질 코드, 두께)로 바꾼다.
+
+    ',재질,' 패턴은 행의 가운데 필드에서만 나올 수 있으므로, 재질별 개수의 합이 행 수와 같으면
+    모든 행의 재질이 올바르다. 재질을 코드로 치환한 뒤 블록 전체를 np.fromstring으로 파싱한다.
+    숫자가 아닌 값이 있거나 재질이 맞지 않으면 None을 돌려준다. NaN이나 -1처럼 float()와 다르게
+    읽었을 수 있는 값이 있을 때도 None을 돌려준다.
+    """
+    counts = {name: text.count(f',{name},') for name in MATERIALS}
+    if sum(counts.values()) != n_lines:
+        return None
+    for name, code in _MATERIAL_CODE.items():
+        if counts[name]:
+            text = text.replace(f',{name},', f',{code},')
+    try:
+        values = np.fromstring(text.replace('\n', ','), sep=',')
+    except ValueError:
+        return None
+    if len(values) != 3 * n_lines:
+        return None
+    values = values.reshape(-1, 3)
+    if _needs_float_check(values[:, 0::2]).any():
+        return None # 열 단위 경로에서 float()로 다시 판단
+    return values
+
+def _to_float_or_none(value: str):
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+def _needs_float_check(parsed: np.ndarray) -> np.ndarray:
+    """np.fromstring이 float()와 다르게 읽었을 수 있는 칸 ('nan(1)'은 NaN, 공백뿐인 칸은 -1이 된다)"""
+    return np.isnan(parsed) | (parsed == -1)
+
+def _parse_number_column(values: List[str]):
+    """숫자 열 하나를 파싱한다. (float 배열, 숫자가 아닌 칸 마스크 또는 None)
+
+    숫자가 아닌 칸은 float()로 판단하므로, np.fromstring이 받아들여도 float()가 거부하는 칸은 숫자가 아니다.
+    """
+    try:
+        parsed = np.fromstring(','.join(values), sep=',')
+        if len(parsed) != len(values):
+            parsed = None
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        # 숫자가 아닌 칸이 있을 때만 칸마다 변환 (None은 NaN이 되므로 NaN 칸만 다시 확인)
+        parsed = np.array(list(map(_to_float_or_none, values)), dtype=np.float64)
+        suspects = np.isnan(parsed)
+    else:
+        suspects = _needs_float_check(parsed)
+    if not suspects.any():
+        return parsed, None
+    bad = np.zeros(len(values), dtype=bool)
+    for i in np.flatnonzero(suspects).tolist():
+        bad[i] = _to_float_or_none(values[i]) is None
+    return parsed, bad
+
+def _parse_block(lines: List[str], first_line: int, rejects: list):
+    """블록을 파싱해 (출력용 행 문자열, 줄 번호, (n, 3) 배열)을 반환하고 잘못된 행은 rejects에 쌓는다.
+
+    먼저 블록 전체를 한 번에 파싱해 보고, 실패하면 열 단위로 나눠 잘못된 칸만 골라낸다.
+    재질은 앞뒤 공백과 대소문자를 무시하고, 출력에는 원래 행을 그대로 쓴다.
+    """
+    text = '\n'.join(lines)
+    commas = _line_comma_counts(text, len(lines))
+    bad = commas != 2
+    if not bad.any():
+        values = _parse_block_fast(text, len(lines))
+        if values is not None:
+            return lines, range(first_line, first_line + len(lines)), values
+
+    numbers = np.arange(first_line, first_line + len(lines))
+    if bad.any():
+        for i in np.flatnonzero(bad).tolist():
+            if lines[i].strip(): # 빈 줄은 조용히 건너뛴다
+                rejects.append((int(numbers[i]),
+                                f'필드가 {commas[i] + 1}개입니다 (diameter,material,thickness 3개 필요)', lines[i]))
+        keep = np.flatnonzero(~bad)
+        lines, numbers = [lines[i] for i in keep.tolist()], numbers[keep]
+        text = '\n'.join(lines)
+    if not lines:
+        return [], [], np.empty((0, 3))
+
+    fields = text.replace('\n', ',').split(',')
+    materials = fields[1::3]
+    codes = np.fromiter(map(_MATERIAL_CODE.get, materials, repeat(-1)), dtype=np.int64, count=len(lines))
+    for i in np.flatnonzero(codes < 0).tolist():
+        codes[i] = _MATERIAL_CODE.get(materials[i].strip().lower(), -1)
+    diameters, bad_diameter = _parse_number_column(fields[0::3])
+    thicknesses, bad_thickness = _parse_number_column(fields[2::3])
+
+    bad = codes < 0
+    for mask in (bad_diameter, bad_thickness):
+        if mask is not None:
+            bad |= mask
+    if bad.any():
+        for i in np.flatnonzero(bad).tolist():
+            reason = (f'지원하지 않는 재질입니다: {materials[i].strip()}' if codes[i] < 0 else
+                      '지름과 두께는 숫자여야 합니다')
+            rejects.append((int(numbers[i]), reason, lines[i]))
+        keep = np.flatnonzero(~bad)
+        lines, numbers = [lines[i] for i in keep.tolist()], numbers[keep]
+        diameters, codes, thicknesses = diameters[keep], codes[keep], thicknesses[keep]
+    return lines, numbers.tolist(), np.column_stack([diameters, codes, thicknesses])
+
+def _dome_batch_block(lines: List[str], first_line: int, rejects: list) -> Tuple[str, int]:
+    """입력 행 블록 하나를 계산해 (출력 CSV 텍스트, 출력 행 수)를 반환한다."""
+    lines, numbers, values = _parse_block(lines, first_line, rejects)
+    if len(values) == 0:
+        return '', 0
+
+    area, _, weight = dome_properties(values[:, 0], values[:, 2], values[:, 1].astype(np.intp))
+    invalid = ~np.isfinite(weight)
+    if invalid.any():
+        for i in np.flatnonzero(invalid).tolist():
+            rejects.append((numbers[i], '지름·두께는 0보다 크고 두께는 반지름 이하인 유한한 값이어야 합니다', lines[i]))
+        keep = np.flatnonzero(~invalid)
+        lines = [lines[i] for i in keep.tolist()]
+        area, weight = area[keep], weight[keep]
+
+    rows = tuple(chain.from_iterable(zip(lines, area.tolist(), weight.tolist())))
+    return ('%s,%.3f,%.3f\n' * len(lines)) % rows, len(lines)
+
+def _write_rejects(rejects: list, reject_file: TextIO) -> None:
+    writer = csv.writer(reject_file, lineterminator='\n')
+    writer.writerows(sorted(rejects, key=lambda reject: reject[0]))
+    rejects.clear()
+
+def run_dome_batch(source: TextIO, output: TextIO, reject_file: TextIO, block_bytes: int = 1 << 22) -> dict:
+    """source의 diameter,material,thickness CSV를 block_bytes씩 읽어 벡터로 계산하고 output에 바로 쓴다.
+
+    잘못된 행(필드 수, 숫자 아님, 모르는 재질, 비물리적 치수)은 멈추지 않고 reject_file에
+    (줄 번호, 이유, 원래 행)으로 남긴다. 첫 행이 diameter로 시작하면 헤더로 보고 건너뛴다.
+    처리 요약(rows, written, rejected, seconds, rows_per_second)을 반환한다.
+    """
+    start = time.perf_counter()
+    output.write(BATCH_OUTPUT_HEADER + '\n')
+    reject_file.write(BATCH_REJECT_HEADER + '\n')
+    rejects = []
+    rows = written = rejected = 0
+    next_line = 1
+    remainder = ''
+    first_block = True
+
+    while True:
+        chunk = source.read(block_bytes)
+        text = remainder + chunk
+        if chunk:
+            # 마지막 줄은 다음 블록과 이어질 수 있으므로 남겨둔다
+            cut = text.rfind('\n')
+            if cut < 0:
+                remainder = text
+                continue
+            text, remainder = text[:cut], text[cut + 1:]
+        elif not text:
+            break
+        lines = text.split('\n')
+
+        if first_block:
+            first_block = False
+            if lines[0].lstrip('\ufeff').lower().startswith('diameter'):
+                lines = lines[1:]
+                next_line += 1
+        out, count = _dome_batch_block(lines, next_line, rejects)
+        output.write(out)
+        written += count
+        rows += len(lines)
+        rejected += len(rejects)
+        next_line += len(lines)
+        _write_rejects(rejects, reject_file)
+        if not chunk:
+            break
+
+    seconds = time.perf_counter() - start
+    return {'rows': rows, 'written': written, 'rejected': rejected, 'seconds': seconds,
+            'rows_per_second': rows / seconds if seconds else 0.0}
 
 
 def get_user_input()-> Tuple[float, str]:
@@ -70,13 +359,12 @@ def get_user_input()-> Tuple[float, str]:
             material_input = input("재질을 입력하세요 (유리/glass, 알루미늄/aluminum, 탄소강/carbon_steel): ").strip()
 
             material_lower = material_input.lower()
-            valid_materials = ['유리', 'glass', '알루미늄', 'aluminum', '탄소강', 'carbon_steel']
-            
-            if material_input.lower() not in valid_materials:
+
+            if material_lower not in MATERIAL_DENSITY:
                 print("올바른 재질을 입력하세요. (유리, 알루미늄, 탄소강)\n입력된 지름이 초기화 됐습니다.")
                 continue
             
-            return diameter, material_input
+            return diameter, material_lower
             
         except ValueError:
             print("올바른 숫자를 입력하세요.")
@@ -84,23 +372,84 @@ def get_user_input()-> Tuple[float, str]:
             print("\n프로그램을 종료합니다.")
             return None, None
 
-def print_result():
-    print(f'재질 ⇒ {material_name}, 지름 ⇒ {diameter_value}, 두께 ⇒ {thickness_value}, 면적 ⇒ {area_value:.3f}, 무게 ⇒ {weight_value:.3f} N')
+def print_result(material, diameter, thickness, area, weight):
+    print(f'재질 ⇒ {material}, 지름 ⇒ {diameter}, 두께 ⇒ {thickness}, 면적 ⇒ {area:.3f}, 무게 ⇒ {weight:.3f} N')
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Mars dome design calculator')
+    parser.add_argument('--optimize', action='store_true',
+                        help='Search a diameter x thickness x material grid instead of prompting')
+    parser.add_argument('--diameter', type=float, nargs=3, metavar=('MIN', 'MAX', 'NUM'),
+                        default=[1.0, 50.0, 500], help='Diameter range in m (default: 1 50 500)')
+    parser.add_argument('--thickness', type=float, nargs=3, metavar=('MIN', 'MAX', 'NUM'),
+                        default=[0.5, 20.0, 200], help='Thickness range in cm (default: 0.5 20 200)')
+    parser.add_argument('--materials', nargs='+', default=list(DEFAULT_MATERIALS),
+                        help='Materials to consider (default: glass aluminum carbon_steel)')
+    parser.add_argument('--max-weight', type=float, default=np.inf,
+                        help='Maximum Mars weight in N (default: no limit)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Processes for very large grids (default: CPU count, 1 disables the pool)')
+    parser.add_argument('--batch', metavar='INPUT', default=None,
+                        help="Compute every diameter,material,thickness row of a CSV file ('-' for stdin)")
+    parser.add_argument('--output', default='-', help="Batch result CSV (default: '-' for stdout)")
+    parser.add_argument('--rejects', default='dome_rejects.csv',
+                        help='CSV that receives invalid batch rows (default: dome_rejects.csv)')
+    return parser
+
+def run_optimizer(args) -> int:
+    diameters = np.linspace(args.diameter[0], args.diameter[1], int(args.diameter[2]))
+    thicknesses = np.linspace(args.thickness[0], args.thickness[1], int(args.thickness[2]))
+    try:
+        front = optimize_dome(diameters, thicknesses, [m.lower() for m in args.materials],
+                              max_weight=args.max_weight, workers=args.workers)
+    except ValueError as e:
+        print(f"입력 오류: {e}")
+        return 1
+
+    if len(front) == 0:
+        print("무게 제한을 만족하는 설계가 없습니다.")
+        return 1
+    print_design_front(front)
+    return 0
+
+def run_batch(args) -> int:
+    try:
+        with ExitStack() as stack:
+            source = (sys.stdin if args.batch == '-' else
+                      stack.enter_context(open(args.batch, 'r', encoding='utf-8-sig')))
+            output = (sys.stdout if args.output == '-' else
+                      stack.enter_context(open(args.output, 'w', encoding='utf-8')))
+            reject_file = stack.enter_context(open(args.rejects, 'w', encoding='utf-8', newline=''))
+            summary = run_dome_batch(source, output, reject_file)
+    except OSError as e:
+        print(f"파일 오류: {e}", file=sys.stderr)
+        return 1
+
+    # 결과 CSV가 stdout으로 나갈 수 있으므로 요약은 stderr에 출력
+    print(f"돔 {summary['written']}개 계산, {summary['rejected']}행 제외 ({args.rejects}), "
+          f"{summary['seconds']:.2f}s ({summary['rows_per_second']:,.0f} rows/s)", file=sys.stderr)
+    return 0
 
 def main():
+    args = create_parser().parse_args()
+    if args.optimize:
+        return run_optimizer(args)
+    if args.batch:
+        return run_batch(args)
+
     print('''=== Mars 돔 구조물 설계 프로그램 ===
 지원 재질: 유리(glass), 알루미늄(aluminum), 탄소강(carbon_steel)
 종료하려면 Ctrl+C를 누르세요.''')
     
     while True:
         try:
-            dial = get_useameter, materir_input()
+            diameter, material = get_user_input()
             if diameter is None or material is None:
                 break
-            sphere_area(diameter, material, thickness=1)
+            area, weight = sphere_area(diameter, material, thickness=1)
             # 결과 출력
             print('\n=== 계산 결과 ===')
-            print_result()
+            print_result(material, diameter, 1, area, weight)
 
             continue_choice = input('다른 돔을 계산하시겠습니까? (y/n): ').strip().lower()
             if continue_choice not in ['y', 'yes', 'ㅇ', 'yup']:
@@ -115,6 +464,7 @@ def main():
             print(f"예상치 못한 오류가 발생했습니다: {e}")
     
     print("프로그램이 종료되었습니다.")
+    return 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,226 @@
+import sys
+import json
+import argparse
+import threading
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Tuple
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+
+from design_dome import MATERIALS, dome_properties
+
+# --- 돔 계산 로컬 HTTP 서비스 ---
+# GET /dome?diameter=10&material=glass&thickness=1 → 돔 하나, POST /dome {"specs": [...]} → 여러 개를 한 번에 계산.
+# 같은 (지름, 재질, 두께)는 LRU 캐시에서 바로 돌려주고, 캐시에 없는 사양만 모아 dome_properties로 한 번에 계산한다.
+
+# 같은 재질의 한글 이름은 영문 이름과 같은 캐시 키를 쓴다
+MATERIAL_ALIASES = {'유리': 'glass', '알루미늄': 'aluminum', '탄소강': 'carbon_steel'}
+_MATERIAL_CODE = {name: code for code, name in enumerate(MATERIALS)}
+
+# 캐시 키의 지름(m)·두께(cm) 반올림 자릿수 (부동소수점 표기 차이로 키가 갈리지 않도록)
+KEY_DECIMALS = 9
+
+SpecKey = Tuple[float, str, float]
+
+
+def normalize_spec(spec: Dict) -> SpecKey:
+    """요청의 사양 하나를 캐시 키 (지름, 영문 재질명, 두께)로 바꾼다. 잘못된 사양이면 ValueError.
+
+    재질은 앞뒤 공백·대소문자·한글 별칭을 무시하고, 두께를 생략하면 CLI와 같이 1cm로 본다.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError('사양은 diameter, material, thickness 항목을 가진 객체여야 합니다')
+    try:
+        diameter = float(spec['diameter'])
+        thickness = float(spec.get('thickness', 1))
+        material = str(spec['material']).strip().lower()
+    except KeyError as e:
+        raise ValueError(f"필수 항목이 없습니다: {e.args[0]}")
+    except (TypeError, ValueError, AttributeError, OverflowError):
+        raise ValueError("diameter와 thickness는 숫자여야 합니다")
+
+    material = MATERIAL_ALIASES.get(material, material)
+    if material not in _MATERIAL_CODE:
+        raise ValueError(f"지원하지 않는 재질입니다: {material}")
+    if not (np.isfinite(diameter) and np.isfinite(thickness)):
+        raise ValueError("diameter와 thickness는 유한한 값이어야 합니다")
+    return round(diameter, KEY_DECIMALS), material, round(thickness, KEY_DECIMALS)
+
+
+class DomeResultCache:
+    """(지름, 재질, 두께) → 계산 결과 dict를 최대 maxsize개까지 보관하는 스레드 안전 LRU 캐시"""
+    def __init__(self, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: List[SpecKey]) -> List[Dict]:
+        """키마다 캐시된 결과 또는 None을 돌려준다. 찾은 항목은 가장 최근 사용으로 옮긴다."""
+        found = []
+        with self._lock:
+            for key in keys:
+                result = self._entries.get(key)
+                if result is None:
+                    self.misses += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                found.append(result)
+        return found
+
+    def put_many(self, items: Dict[SpecKey, Dict]) -> None:
+        with self._lock:
+            self._entries.update(items)
+            for key in items:
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {'size': len(self._entries), 'maxsize': self.maxsize, 'hits': self.hits,
+                    'misses': self.misses, 'hit_rate': self.hits / lookups if lookups else 0.0}
+
+
+def compute_domes(keys: List[SpecKey]) -> List[Dict]:
+    """정규화된 사양들을 dome_properties 한 번으로 계산한다. 비물리적 치수는 error 항목이 된다."""
+    if not keys:
+        return []
+    diameters, materials, thicknesses = zip(*keys)
+    codes = [_MATERIAL_CODE[material] for material in materials]
+    area, mass, weight = dome_properties(np.array(diameters), np.array(thicknesses), np.array(codes))
+
+    results = []
+    for key, a, m, w in zip(keys, area.tolist(), mass.tolist(), weight.tolist()):
+        result = {'diameter': key[0], 'material': key[1], 'thickness': key[2]}
+        if np.isnan(w):
+            result['error'] = '지름·두께는 0보다 크고 두께는 반지름 이하여야 합니다'
+        else:
+            result.update(area=a, mass=m, weight=w)
+        results.append(result)
+    return results
+
+
+def calculate_specs(specs: List[Dict], cache: DomeResultCache) -> List[Dict]:
+    """요청 사양 목록을 순서대로 계산한다. 잘못된 사양은 그 자리에 {"error": ...}가 들어가고 나머지는 계속 계산한다."""
+    keys, results = [], [None] * len(specs)
+    for i, spec in enumerate(specs):
+        try:
+            keys.append(normalize_spec(spec))
+        except ValueError as e:
+            keys.append(None)
+            results[i] = {'error': str(e)}
+
+    valid = [i for i, key in enumerate(keys) if key is not None]
+    cached = cache.get_many([keys[i] for i in valid])
+    missing = list(dict.fromkeys(keys[i] for i, result in zip(valid, cached) if result is None))
+    computed = dict(zip(missing, compute_domes(missing)))
+    cache.put_many(computed)
+
+    for i, result in zip(valid, cached):
+        results[i] = result if result is not None else computed[keys[i]]
+    return results
+
+
+class DomeService:
+    """돔 계산 JSON HTTP 서버 (HTTP/1.1 keep-alive, 요청마다 스레드)"""
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, cache_size: int = 100_000,
+                 max_batch: int = 100_000):
+        self.cache = DomeResultCache(cache_size)
+        self.max_batch = max_batch
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _make_handler(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # 헤더와 본문을 따로 보내므로 Nagle 알고리즘을 끄지 않으면 keep-alive 요청마다 ~40ms씩 지연된다
+            disable_nagle_algorithm = True
+
+            def _send_json(self, status: int, payload) -> None:
+                body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == '/stats':
+                    self._send_json(200, service.cache.stats())
+                    return
+                if url.path != '/dome':
+                    self._send_json(404, {'error': f'알 수 없는 경로입니다: {url.path}'})
+                    return
+                spec = {name: values[0] for name, values in parse_qs(url.query).items()}
+                result = calculate_specs([spec], service.cache)[0]
+                self._send_json(400 if 'error' in result else 200, result)
+
+            def do_POST(self):
+                if urlparse(self.path).path != '/dome':
+                    self._send_json(404, {'error': f'알 수 없는 경로입니다: {self.path}'})
+                    return
+                try:
+                    length = int(self.headers.get('Content-Length', 0))
+                    payload = json.loads(self.rfile.read(length).decode('utf-8'))
+                except (ValueError, UnicodeDecodeError):
+                    self._send_json(400, {'error': '요청 본문이 올바른 JSON이 아닙니다'})
+                    return
+
+                # {"specs": [...]} 또는 사양 목록 자체를 받는다
+                specs = payload.get('specs') if isinstance(payload, dict) else payload
+                if not isinstance(specs, list):
+                    self._send_json(400, {'error': '"specs"는 사양 목록이어야 합니다'})
+                    return
+                if len(specs) > service.max_batch:
+                    self._send_json(413, {'error': f'한 번에 최대 {service.max_batch}개까지 계산할 수 있습니다'})
+                    return
+                self._send_json(200, {'results': calculate_specs(specs, service.cache)})
+
+            def log_message(self, format, *args):
+                pass # 요청마다 찍히는 접근 로그는 생략
+
+        return Handler
+
+    def start(self) -> 'DomeService':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Local JSON HTTP service for dome calculations')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8801)
+    parser.add_argument('--cache-size', type=int, default=100_000, help='LRU cache entries')
+    parser.add_argument('--max-batch', type=int, default=100_000, help='Largest accepted POST batch')
+    args = parser.parse_args()
+
+    service = DomeService(args.host, args.port, cache_size=args.cache_size, max_batch=args.max_batch)
+    print(f"돔 계산 서비스 실행 중: {service.url}/dome (종료: Ctrl+C)", flush=True)
+    try:
+        service.httpd.serve_forever()
+    except KeyboardInterrupt:
+        service.httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,29 +1,59 @@
+import os
+import io
 import csv
+import gzip
+import heapq
+import hashlib
+import bisect
+import argparse
+import warnings
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Iterator, Sequence
 import sys
 
-def read_mars_inventory(csv_path: Path)->List:
+import numpy as np
+
+# 숫자로 다뤄야 하는 열과 범주형(코드)으로 다룰 열
+NUMERIC_COLUMNS = ('Weight (g/cm³)', 'Specific Gravity', 'Flammability')
+CATEGORICAL_COLUMNS = ('Substance', 'Strength')
+
+def _echo_lines(lines):
+    """파일의 각 줄을 화면에 출력하면서 그대로 다음 단계로 넘겨준다."""
+    for line in lines:
+        print(line.strip())
+        yield line
+
+def iter_mars_inventory(csv_path: Path, echo: bool = True) -> Iterator[Dict]:
+    """Mars_Base_Inventory_List.csv를 한 번만 읽으면서 출력과 파싱을 함께 수행하는 제너레이터
+
+    Flammability는 float로 변환해서 한 행씩 돌려준다. 전체를 리스트로 만들지 않으므로
+    파일 크기와 관계없이 메모리 사용량이 일정하다. echo=False이면 화면 출력을 생략한다.
+    """
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        lines = _echo_lines(f) if echo else f
+        for row in csv.DictReader(lines):
+            try:
+                row['Flammability'] = float(row['Flammability'])
+            except (TypeError, ValueError):
+                print(f"인화성 지수를 읽을 수 없는 항목을 건너뜁니다: {row.get('Substance')}")
+                continue
+            yield row
+
+def read_mars_inventory(csv_path: Path, echo: bool = True)->List:
     """Mars_Base_Inventory_List.csv를 읽어서 리스트로 변환"""
     inventory_list = []
     
     try:
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            # CSV 내용 출력
+        if echo:
+            # CSV 내용 출력 (파싱과 같은 루프에서 한 줄씩 출력된다)
             print(f"{'='*50}\n Mars_Base_Inventory_List.csv 내용\n{'='*50}\n")
 
-            for line in f:
-                print(line.strip())
-            
-            # Mars_Base_Inventory_List.csv의 내용을 읽어서 화면에 출력한다.
-            f.seek(0)
-
-            csv_reader = csv.DictReader(f)
-            for row in csv_reader:
-                row['Flammability'] = float(row['Flammability'])
-                inventory_list.append(row)
+        inventory_list = list(iter_mars_inventory(csv_path, echo=echo))
 
-            print(f"list 객체 저장 완료: 총 {len(inventory_list)}개 항목")
+        print(f"list 객체 저장 완료: 총 {len(inventory_list)}개 항목")
 
     except FileNotFoundError:
         print("Mars_Base_Inventory_List.csv 파일을 찾을 수 없습니다.")
@@ -34,36 +64,416 @@ def read_mars_inventory(csv_path: Path)->List:
     
     return inventory_list
 
+@dataclass
+class InventoryColumns:
+    """인벤토리를 열 단위 NumPy 배열로 담는 클래스
+
+    모든 열은 정수 코드(codes)와 고유 문자열 목록(categories)으로 저장되어 원래 문자열을
+    그대로 복원할 수 있다. 숫자 열은 float64 배열(numeric)도 함께 가지며, 'Various'처럼
+    숫자가 아닌 값은 NaN이고 valid 마스크가 False이다.
+    """
+    fieldnames: List[str]
+    codes: Dict[str, np.ndarray] = field(default_factory=dict)
+    categories: Dict[str, np.ndarray] = field(default_factory=dict)
+    numeric: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self):
+        return len(self.codes[self.fieldnames[0]]) if self.fieldnames else 0
+
+    def valid(self, column: str) -> np.ndarray:
+        return ~np.isnan(self.numeric[column])
+
+    def strings(self, column: str) -> np.ndarray:
+        return self.categories[column][self.codes[column]]
+
+    def take(self, indices: np.ndarray) -> 'InventoryColumns':
+        """indices(정수 배열 또는 불리언 마스크)에 해당하는 행만 담은 새 객체를 반환한다."""
+        return InventoryColumns(
+            fieldnames=self.fieldnames,
+            codes={name: arr[indices] for name, arr in self.codes.items()},
+            categories=self.categories,
+            numeric={name: arr[indices] for name, arr in self.numeric.items()},
+        )
+
+    def to_records(self) -> List[Dict]:
+        """read_mars_inventory와 같은 형태(Flammability는 float)의 dict 리스트로 변환한다."""
+        columns = [self.strings(name).tolist() for name in self.fieldnames]
+        records = [dict(zip(self.fieldnames, values)) for values in zip(*columns)]
+        for record, flammability in zip(records, self.numeric['Flammability'].tolist()):
+            record['Flammability'] = flammability
+        return records
+
+def _to_float(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return np.nan
+
+def load_inventory_columns(csv_path: Path, chunk_rows: int = 1_000_000) -> InventoryColumns:
+    """인벤토리 CSV를 열 단위 타입 배열(InventoryColumns)로 읽는다.
+
+    np.loadtxt로 chunk_rows 행씩 파싱하고, 각 열은 고유 문자열 사전으로 코드화한다.
+    숫자 열은 고유 값마다 한 번만 float 변환한 뒤 코드로 조회해서 만든다.
+    """
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        fieldnames = next(csv.reader([f.readline()]))
+        lookups = []
+        for _ in fieldnames:
+            # 처음 보는 문자열에는 다음 코드 번호를 부여하는 사전 (조회가 전부 C 수준에서 실행됨)
+            lookup = defaultdict()
+            lookup.default_factory = lookup.__len__
+            lookups.append(lookup)
+        code_chunks = [[] for _ in fieldnames]
+
+        while True:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', UserWarning) # 마지막 빈 청크 경고 무시
+                block = np.loadtxt(f, dtype=str, delimiter=',', quotechar='"',
+                                   max_rows=chunk_rows, ndmin=2)
+            if len(block) == 0:
+                break
+            for i, lookup in enumerate(lookups):
+                code_chunks[i].append(np.fromiter(
+                    map(lookup.__getitem__, block[:, i].tolist()),
+                    dtype=np.int32, count=len(block)))
+
+    inventory = InventoryColumns(fieldnames=fieldnames)
+    for name, lookup, chunks in zip(fieldnames, lookups, code_chunks):
+        categories = np.array(list(lookup), dtype=object)
+        codes = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int32)
+        inventory.codes[name] = codes
+        inventory.categories[name] = categories
+        if name in NUMERIC_COLUMNS:
+            table = np.array([_to_float(v) for v in categories], dtype=np.float64)
+            inventory.numeric[name] = table[codes]
+
+    print(f"열 단위 배열 저장 완료: 총 {len(inventory)}개 항목")
+    return inventory
+
 def sort_by_flammability(inventory_list):
+    if isinstance(inventory_list, InventoryColumns):
+        # 안정 argsort로 내림차순 정렬 (NaN은 맨 뒤)
+        order = np.argsort(-inventory_list.numeric['Flammability'], kind='stable')
+        return inventory_list.take(order)
     return sorted(inventory_list, key=lambda x: x['Flammability'], reverse=True)
 
-def filter_dangerous_items(inventory_list):
-    dangerous_items = [item for item in inventory_list if item['Flammability'] >= 0.7]
+# 인화성 인덱스: 인화성 오름차순으로 정렬된 (값, 행 바이트 오프셋) 배열
+FLAMMABILITY_INDEX_DTYPE = np.dtype([('flammability', '<f8'), ('offset', '<i8')])
+FLAMMABILITY_INDEX_VERSION = 1
+
+def csv_fingerprint(csv_path: Path) -> str:
+    """인덱스 형식 버전, 파일 크기, 수정 시각, 앞뒤 64KB 내용으로 만든 CSV 지문"""
+    stat = csv_path.stat()
+    digest = hashlib.sha1(f"{FLAMMABILITY_INDEX_VERSION}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    with open(csv_path, 'rb') as f:
+        digest.update(f.read(65536))
+        if stat.st_size > 65536:
+            f.seek(max(65536, stat.st_size - 65536))
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+def flammability_index_path(csv_path: Path) -> Path:
+    """지문이 파일 이름에 들어간 인덱스 경로 (CSV가 바뀌면 경로도 바뀐다)"""
+    return csv_path.with_name(f"{csv_path.stem}.{csv_fingerprint(csv_path)}.flamidx.npy")
+
+def build_flammability_index(csv_path: Path) -> Path:
+    """CSV를 한 번 훑어 인화성 값과 행 오프셋을 정렬해 .npy로 저장한다.
+
+    인화성 값이 숫자가 아닌 행은 인덱스에 넣지 않는다. 같은 CSV의 예전 지문 인덱스는 지운다.
+    """
+    index_path = flammability_index_path(csv_path)
+    values = []
+    offsets = []
+
+    with open(csv_path, 'rb') as f:
+        header = next(csv.reader([f.readline().decode('utf-8')]))
+        column = header.index('Flammability')
+        offset = f.tell()
+        for line in f:
+            if b'"' in line:
+                fields = next(csv.reader([line.decode('utf-8')]), [])
+            else:
+                fields = line.rstrip(b'\r\n').split(b',')
+            try:
+                values.append(float(fields[column]))
+                offsets.append(offset)
+            except (IndexError, ValueError):
+                pass
+            offset += len(line)
+
+    index = np.empty(len(values), dtype=FLAMMABILITY_INDEX_DTYPE)
+    index['flammability'] = values
+    index['offset'] = offsets
+    # 인화성 오름차순, 동률은 오프셋 내림차순: 뒤집어 읽으면 동률이 파일 순서가 된다.
+    index = index[np.lexsort((-index['offset'], index['flammability']))]
+
+    for stale in csv_path.parent.glob(f"{csv_path.stem}.*.flamidx.npy"):
+        stale.unlink()
+    tmp_path = index_path.with_suffix('.tmp')
+    with open(tmp_path, 'wb') as f:
+        np.save(f, index)
+    tmp_path.replace(index_path)
+    print(f"인화성 인덱스 생성 완료: {index_path} ({len(index)}개 항목)")
+    return index_path
+
+def query_flammability_index(csv_path: Path, low: float = 0.7, high: float = np.inf) -> List[Dict]:
+    """low <= 인화성 < high인 행만 CSV에서 읽어 인화성 내림차순 dict 리스트로 반환한다.
+
+    인덱스를 memory-map으로 열고 이진 탐색(searchsorted)으로 범위를 찾으므로,
+    전체 파일을 다시 읽거나 정렬하지 않는다. 인덱스가 없거나 CSV가 바뀌었으면 새로 만든다.
+    """
+    index_path = flammability_index_path(csv_path)
+    if not index_path.exists():
+        build_flammability_index(csv_path)
+
+    index = np.load(index_path, mmap_mode='r')
+    flammability = index['flammability']
+    start = np.searchsorted(flammability, low, side='left')
+    stop = np.searchsorted(flammability, high, side='left')
+    matches = index[start:stop][::-1] # 내림차순
+
+    offsets = np.asarray(matches['offset'])
+    visit = np.argsort(offsets, kind='stable') # 디스크를 순서대로 읽도록 오프셋 순으로 방문
+    lines = [None] * len(offsets)
+    with open(csv_path, 'rb') as f:
+        fieldnames = next(csv.reader([f.readline().decode('utf-8')]))
+        for position, offset in zip(visit.tolist(), offsets[visit].tolist()):
+            f.seek(offset)
+            lines[position] = f.readline().decode('utf-8')
+
+    records = [dict(zip(fieldnames, row)) for row in csv.reader(lines)]
+    for record in records:
+        record['Flammability'] = float(record['Flammability'])
+    return records
+
+def _print_dangerous_items(dangerous_items, title: str) -> None:
+    if isinstance(dangerous_items, InventoryColumns):
+        items = zip(dangerous_items.strings('Substance').tolist(),
+                    dangerous_items.numeric['Flammability'].tolist())
+    else:
+        items = ((item['Substance'], item['Flammability']) for item in dangerous_items)
+
+    print(f"\n=== {title} ===")
+    for substance, flammability in items:
+        print(f"물질: {substance}, 인화성 지수: {flammability}")
+
+def filter_dangerous_items(inventory_list, threshold: float = 0.7, verbose: bool = True):
+    if isinstance(inventory_list, InventoryColumns):
+        # 불리언 마스크로 한 번에 선택 (NaN은 비교 결과가 False라서 자동 제외)
+        dangerous_items = inventory_list.take(inventory_list.numeric['Flammability'] >= threshold)
+    else:
+        dangerous_items = [item for item in inventory_list if item['Flammability'] >= threshold]
     
-    print("\n=== 인화성 지수 0.7 이상인 위험 항목들 ===")
-    for item in dangerous_items:
-        print(f"물질: {item['Substance']}, 인화성 지수: {item['Flammability']}")
+    if verbose:
+        _print_dangerous_items(dangerous_items, f"인화성 지수 {threshold} 이상인 위험 항목들")
     
     return dangerous_items
 
-def save_dangerous_items_csv(dangerous_items):
-    if not dangerous_items:
+def _top_k_indices(values: np.ndarray, k: int) -> np.ndarray:
+    """values에서 큰 값 k개의 위치를 내림차순(동률은 원래 순서)으로 반환한다. O(n + k log k)"""
+    if k <= 0:
+        return np.empty(0, dtype=np.intp) # heapq.nlargest와 같이 빈 결과
+    if k < len(values):
+        kth = np.partition(values, len(values) - k)[len(values) - k] # k번째로 큰 값
+        greater = np.flatnonzero(values > kth)
+        equal = np.flatnonzero(values == kth)[:k - len(greater)]
+        candidates = np.sort(np.concatenate([greater, equal]))
+    else:
+        candidates = np.arange(len(values))
+    return candidates[np.argsort(-values[candidates], kind='stable')]
+
+def select_dangerous_items(inventory_list, threshold: float = 0.7, top: int = None,
+                           verbose: bool = True):
+    """위험 항목을 먼저 거른 뒤 살아남은 항목만 인화성 내림차순으로 정렬한다.
+
+    top을 주면 그중 상위 top개만 고른다 (heapq.nlargest / np.partition 사용).
+    전체를 정렬하는 O(n log n) 대신 O(n + k log k)로 동작한다.
+    """
+    survivors = filter_dangerous_items(inventory_list, threshold, verbose=False)
+
+    if isinstance(survivors, InventoryColumns):
+        flammability = survivors.numeric['Flammability']
+        k = len(flammability) if top is None else top
+        dangerous_items = survivors.take(_top_k_indices(flammability, k))
+    elif top is not None:
+        dangerous_items = heapq.nlargest(top, survivors, key=lambda x: x['Flammability'])
+    else:
+        dangerous_items = sort_by_flammability(survivors)
+
+    if verbose:
+        label = f"상위 {top}개 " if top is not None else ""
+        _print_dangerous_items(dangerous_items, f"인화성 지수 {threshold} 이상인 {label}위험 항목들")
+
+    return dangerous_items
+
+def split_danger_bands(inventory_list, thresholds: Sequence[float]) -> Dict[float, object]:
+    """한 번의 순회로 각 항목을 자신이 넘는 가장 높은 임계값 구간에 배정한다.
+
+    thresholds=[0.9, 0.8, 0.7]이면 {0.9: 0.9 이상, 0.8: 0.8~0.9, 0.7: 0.7~0.8} 구간을 반환하며,
+    각 구간은 인화성 내림차순으로 정렬되어 있다.
+    """
+    ascending = sorted(thresholds)
+
+    if isinstance(inventory_list, InventoryColumns):
+        flammability = inventory_list.numeric['Flammability']
+        band = np.searchsorted(ascending, flammability, side='right') - 1
+        band[np.isnan(flammability)] = -1 # NaN은 어느 구간에도 속하지 않음
+        return {ascending[i]: sort_by_flammability(inventory_list.take(band == i))
+                for i in reversed(range(len(ascending)))}
+
+    bands = {threshold: [] for threshold in ascending}
+    for item in inventory_list:
+        i = bisect.bisect_right(ascending, item['Flammability']) - 1
+        if i >= 0:
+            bands[ascending[i]].append(item)
+    return {threshold: sort_by_flammability(bands[threshold]) for threshold in reversed(ascending)}
+
+def band_output_path(output_path: Path, threshold: float) -> Path:
+    """Mars_Base_Inventory_danger.csv → Mars_Base_Inventory_danger_0.9.csv (.csv.gz도 유지)"""
+    suffixes = ''.join(output_path.suffixes[-2:]) if output_path.suffix == '.gz' else output_path.suffix
+    base = output_path.name[:len(output_path.name) - len(suffixes)]
+    return output_path.with_name(f"{base}_{threshold:g}{suffixes}")
+
+@contextmanager
+def _atomic_csv_writer(output_path: Path, buffer_size: int = 1 << 20):
+    """임시 파일에 쓰고 성공했을 때만 output_path로 이름을 바꾸는 텍스트 파일 핸들
+
+    경로가 .gz로 끝나면 gzip으로 압축한다. 도중에 실패하면 임시 파일을 지우므로
+    쓰다 만 결과 파일이 보이지 않는다.
+    """
+    output_path = Path(output_path)
+    tmp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+    raw = None
+    try:
+        if output_path.suffix == '.gz':
+            raw = open(tmp_path, 'wb', buffering=buffer_size)
+            file = io.TextIOWrapper(gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6),
+                                    encoding='utf-8', newline='')
+        else:
+            file = open(tmp_path, 'w', newline='', encoding='utf-8', buffering=buffer_size)
+        with file:
+            yield file
+        if raw is not None:
+            raw.close()
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if raw is not None:
+            raw.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+def stream_dangerous_items_csv(csv_path: Path, output_path: Path = Path('Mars_Base_Inventory_danger.csv'),
+                               threshold: float = 0.7, buffer_size: int = 1 << 20) -> int:
+    """읽기·필터·쓰기를 한 파이프라인으로 처리해 위험 항목을 CSV로 저장한다.
+
+    리스트를 만들지 않고 한 행씩 흘려보내므로 입력 크기와 관계없이 메모리 사용량이 일정하다.
+    결과는 정렬하지 않고 원본 순서·원본 문자열 그대로 쓴다. 저장한 행 수를 반환한다.
+    """
+    count = 0
+    with open(csv_path, 'r', encoding='utf-8', newline='', buffering=buffer_size) as src, \
+            _atomic_csv_writer(output_path, buffer_size) as dst:
+        reader = csv.reader(src)
+        writer = csv.writer(dst)
+        header = next(reader)
+        column = header.index('Flammability')
+        writer.writerow(header)
+        for row in reader:
+            try:
+                if not float(row[column]) >= threshold: # NaN도 제외 (filter_dangerous_items와 같게)
+                    continue
+            except (IndexError, ValueError):
+                continue
+            writer.writerow(row)
+            count += 1
+
+    print(f"\n위험 항목 {count}개가 {output_path}에 저장되었습니다. (스트리밍)")
+    return count
+
+def save_dangerous_items_csv(dangerous_items, output_path: Path = Path('Mars_Base_Inventory_danger.csv')):
+    if len(dangerous_items) == 0:
         print("저장할 위험 항목이 없습니다.")
         return
+
+    if isinstance(dangerous_items, InventoryColumns):
+        dangerous_items = dangerous_items.to_records()
     
     try:
-        with open('Mars_Base_Inventory_danger.csv', 'w', newline='', encoding='utf-8') as file:
+        with _atomic_csv_writer(output_path) as file:
             fieldnames = dangerous_items[0].keys()
             writer = csv.DictWriter(file, fieldnames=fieldnames)
             writer.writeheader()
             writer.writerows(dangerous_items)
             
-        print(f"\n위험 항목 {len(dangerous_items)}개가 Mars_Base_Inventory_danger.csv에 저장되었습니다.")
+        print(f"\n위험 항목 {len(dangerous_items)}개가 {output_path}에 저장되었습니다.")
         
     except Exception as e:
         print(f"CSV 파일 저장 중 오류 발생: {e}")
 
+def _positive_int(value: str) -> int:
+    """argparse 타입: 1 이상의 정수만 받는다."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"1 이상의 정수여야 합니다: {value}")
+    return number
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--no-echo',
+        action='store_true',
+        help='Do not print the raw CSV contents while reading'
+    )
+    parser.add_argument(
+        '--numpy',
+        action='store_true',
+        help='Load typed NumPy columns and sort/filter with vectorized operations'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Read, filter and write in one constant-memory pass (output keeps input order)'
+    )
+    parser.add_argument(
+        '--output',
+        type=Path,
+        default=Path('Mars_Base_Inventory_danger.csv'),
+        help='Output CSV path; a .gz suffix writes gzip (default: Mars_Base_Inventory_danger.csv)'
+    )
+    parser.add_argument(
+        '--index',
+        action='store_true',
+        help='Answer the threshold query from a persistent sorted flammability index'
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.7,
+        help='Minimum flammability of a dangerous item (default: 0.7)'
+    )
+    parser.add_argument(
+        '--max-flammability',
+        type=float,
+        default=np.inf,
+        help='Exclusive upper bound for --index range queries'
+    )
+    parser.add_argument(
+        '--top',
+        type=_positive_int,
+        default=None,
+        help='Keep only the K most flammable dangerous items'
+    )
+    parser.add_argument(
+        '--bands',
+        type=float,
+        nargs='+',
+        default=None,
+        help='Split items into danger bands by these thresholds, one CSV per band (e.g. 0.9 0.8 0.7)'
+    )
+    return parser
+
 def main():
+    args = create_parser().parse_args()
+
     # 1. CSV 파일 읽기 및 리스트로 변환
     csv_path = Path('./mars_base/Mars_Base_Inventory_List.csv')
 
@@ -71,22 +481,48 @@ def main():
         print(f"파일 경로가 잘못되었습니다: {csv_path}")
         return 1
 
-    inventory_list = read_mars_inventory(csv_path)
+    output_path = args.output
+
+    if args.stream:
+        # 리스트를 만들지 않고 읽기·필터·쓰기를 한 번에 수행
+        stream_dangerous_items_csv(csv_path, output_path, threshold=args.threshold)
+        return 0
+
+    if args.index:
+        # 인덱스에서 범위에 해당하는 행만 읽어 바로 저장 (전체 읽기·정렬 없음)
+        dangerous_items = query_flammability_index(csv_path, args.threshold, args.max_flammability)
+        if args.top is not None:
+            dangerous_items = dangerous_items[:args.top]
+        _print_dangerous_items(dangerous_items, f"인화성 지수 {args.threshold} 이상인 위험 항목들 (인덱스)")
+        save_dangerous_items_csv(dangerous_items, output_path)
+        return 0
+
+    if args.numpy:
+        inventory_list = load_inventory_columns(csv_path)
+    else:
+        inventory_list = read_mars_inventory(csv_path, echo=not args.no_echo)
     
-    if not inventory_list:
+    if len(inventory_list) == 0:
         return 1
     
     print(f"\n총 {len(inventory_list)}개의 항목을 읽었습니다.")
     
-    # 2. 인화성 지수 기준으로 내림차순 정렬
-    sorted_list = sort_by_flammability(inventory_list)
+    if args.bands:
+        # 2-3. 한 번의 순회로 위험 구간별로 나누고, 구간마다 정렬
+        bands = split_danger_bands(inventory_list, args.bands)
+        print(f'{"="*60}\n위험 구간별 분류 및 정렬 완료\n{"="*60}')
+
+        # 4. 구간별로 CSV 저장
+        for threshold, band_items in bands.items():
+            save_dangerous_items_csv(band_items, band_output_path(output_path, threshold))
+        return 0
+
+    # 2-3. 인화성 지수 0.7(--threshold) 이상인 항목을 먼저 거르고, 남은 항목만 내림차순 정렬
+    dangerous_items = select_dangerous_items(inventory_list, threshold=args.threshold, top=args.top)
     print(f'{"="*60}\n인화성 지수 기준 내림차순 정렬 완료\n{"="*60}')
     
-    # 3. 인화성 지수 0.7 이상인 항목 필터링
-    dangerous_items = filter_dangerous_items(sorted_list)
-    
     # 4. 위험 항목들을 CSV로 저장
-    save_dangerous_items_csv(dangerous_items)
+    save_dangerous_items_csv(dangerous_items, output_path)
 
     return 0
 
@@ -1,110 +1,467 @@
 import numpy as np
-import csv
+import argparse
+import weakref
 from pathlib import Path
 import sys
-from typing import Tuple
+import warnings
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory, resource_tracker
+from typing import Tuple, Sequence
 
-def read_csv_to_numpy(filename:Path) -> np.ndarray:
-    """CSV 파일을 읽어서 구조화된 NumPy 배열로 변환"""
+# 범주형 표현: 부품명 대신 어휘(vocab) 배열의 정수 코드를 저장 (행당 8바이트, 이름 길이 제한 없음)
+CODED_PARTS_DTYPE = np.dtype([('code', 'i4'), ('strength', 'i4')])
+
+def parts_cache_path(filename: Path, kind: str) -> Path:
+    """CSV의 크기·수정 시각을 이름에 담은 .npy 캐시 경로 (CSV가 바뀌면 경로도 바뀐다)"""
+    stat = Path(filename).stat()
+    return Path(filename).with_name(f"{Path(filename).stem}.{stat.st_size}-{stat.st_mtime_ns}.{kind}.npy")
+
+def _remove_stale_caches(filename: Path, kind: str) -> None:
+    for stale in Path(filename).parent.glob(f"{Path(filename).stem}.*.{kind}.npy"):
+        try:
+            stale.unlink()
+        except OSError:
+            pass # 지우지 못한 예전 캐시는 이름이 달라 다시 읽히지 않는다
+
+def _save_npy(path: Path, data: np.ndarray) -> bool:
+    """캐시를 임시 파일에 쓴 뒤 바꿔 넣는다. 쓸 수 없으면(읽기 전용 디렉터리 등) 경고만 출력하고 False"""
+    tmp_path = path.with_suffix('.tmp')
     try:
-        # 구조화된 배열로 읽기 (첫 번째 열은 문자열, 나머지는 숫자)
-        data = np.genfromtxt(filename, delimiter = ',', skip_header = 1 , 
-                           dtype = [('parts', 'U10'), ('strength', 'i4')] , encoding = 'utf-8')
-        
-        print(f"{filename} 읽기 완료: {len(data)}행")
-        
+        with open(tmp_path, 'wb') as f:
+            np.save(f, data)
+        tmp_path.replace(path)
+        return True
+    except OSError as e:
+        print(f"캐시를 저장하지 못해 캐시 없이 진행합니다: {path} ({e})", file=sys.stderr)
+        try:
+            tmp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        return False
+
+def iter_parts_csv_blocks(filename: Path, block_rows: int = 1_000_000):
+    """parts CSV를 block_rows행씩 (부품명, 강도) 문자열 2열 배열로 차례로 내준다. 메모리는 블록 하나 분량만 쓴다."""
+    with open(filename, 'r', encoding='utf-8-sig') as f:
+        f.readline() # 헤더
+        while True:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', UserWarning)
+                block = np.loadtxt(f, dtype=str, delimiter=',', max_rows=block_rows, ndmin=2)
+            if len(block) == 0:
+                break
+            yield block
+
+def _new_code_lookup() -> defaultdict:
+    lookup = defaultdict()
+    lookup.default_factory = lookup.__len__ # 처음 보는 이름에 다음 코드 번호 부여
+    return lookup
+
+def _encode_names(lookup: defaultdict, names: np.ndarray) -> np.ndarray:
+    return np.fromiter(map(lookup.__getitem__, names.tolist()), dtype=np.int32, count=len(names))
+
+def parse_parts_csv_categorical(filename: Path, block_rows: int = 1_000_000) -> Tuple[np.ndarray, np.ndarray]:
+    """parts CSV를 (code/strength 구조화 배열, 부품명 어휘 배열)로 파싱
+
+    부품명은 길이 제한 없이 어휘에 한 번만 저장되고, 각 행에는 정수 코드만 남는다.
+    """
+    lookup = _new_code_lookup()
+    blocks = []
+    for block in iter_parts_csv_blocks(filename, block_rows):
+        coded = np.empty(len(block), dtype=CODED_PARTS_DTYPE)
+        coded['code'] = _encode_names(lookup, block[:, 0])
+        coded['strength'] = block[:, 1].astype(np.int32)
+        blocks.append(coded)
+
+    data = np.concatenate(blocks) if blocks else np.empty(0, dtype=CODED_PARTS_DTYPE)
+    return data, np.array(list(lookup), dtype=str)
+
+def load_parts_csv_categorical(filename: Path, block_rows: int = 1_000_000,
+                               use_cache: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """parts CSV를 읽되, 같은 크기·수정 시각의 .npy 캐시가 있으면 바로 연다.
+
+    코드 배열은 memory-map으로, 어휘는 작은 .npy로 캐시한다. 캐시가 없으면 파싱한 뒤 CSV 옆에
+    저장하고(예전 캐시는 삭제) 그 캐시를 연다. 캐시를 저장할 수 없으면 파싱한 배열을 그대로 돌려준다.
+    """
+    if not use_cache:
+        return parse_parts_csv_categorical(filename, block_rows)
+
+    codes_path = parts_cache_path(filename, 'codes')
+    vocab_path = parts_cache_path(filename, 'vocab')
+    if not (codes_path.exists() and vocab_path.exists()):
+        data, vocab = parse_parts_csv_categorical(filename, block_rows)
+        for kind in ('codes', 'vocab'):
+            _remove_stale_caches(filename, kind)
+        if not (_save_npy(vocab_path, vocab) and _save_npy(codes_path, data)):
+            return data, vocab
+    return np.load(codes_path, mmap_mode='r'), np.load(vocab_path)
+
+def read_csv_to_categorical(filename: Path, use_cache: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """CSV 파일을 (code/strength 구조화 배열, 부품명 어휘)로 읽기. 실패하면 None"""
+    try:
+        data, vocab = load_parts_csv_categorical(filename, use_cache=use_cache)
+
+        print(f"{filename} 읽기 완료: {len(data)}행 (부품 {len(vocab)}종)")
+
         # 샘플 데이터 출력
         if len(data) > 0:
+            sample = data[:3]
             print(f"열 이름: {data.dtype.names}")
-            print(f"샘플 데이터: {data[:3] if len(data) >= 3 else data}")
-        
-        return data
+            print(f"샘플 데이터: {list(zip(vocab[sample['code']].tolist(), sample['strength'].tolist()))}")
+
+        return data, vocab
     except FileNotFoundError:
         print(f"파일을 찾을 수 없습니다: {filename}")
         return None
     except Exception as e:
         print(f"{filename} 읽기 중 오류 발생: {e}")
+        return None
 
+def merge_categorical_arrays(coded_arrays: Sequence[Tuple[np.ndarray, np.ndarray]]):
+    """여러 (코드 배열, 어휘)를 하나의 정렬된 공통 어휘로 합친다.
 
-def merge_structured_arrays(arr1, arr2, arr3):
-
-    if arr1 is None or arr2 is None or arr3 is None:
+    파일마다 다른 어휘의 코드를 작은 매핑 배열로 한 번에 변환하며, 결과 배열은 미리 할당해 채운다.
+    (병합된 코드 배열, 정렬된 공통 어휘)를 반환한다.
+    """
+    if any(item is None for item in coded_arrays):
         print("일부 배열이 None입니다. 병합할 수 없습니다.")
         return None
-    
+
+    vocab = np.unique(np.concatenate([v for _, v in coded_arrays])) if coded_arrays else np.array([], dtype=str)
+    merged = np.empty(sum(len(data) for data, _ in coded_arrays), dtype=CODED_PARTS_DTYPE)
+    start = 0
+    for data, file_vocab in coded_arrays:
+        mapping = np.searchsorted(vocab, file_vocab).astype(np.int32)
+        stop = start + len(data)
+        merged['code'][start:stop] = mapping[data['code']]
+        merged['strength'][start:stop] = data['strength']
+        start = stop
+
+    print(f"배열 병합 완료: {len(merged)}행 (부품 {len(vocab)}종)")
+    return merged, vocab
+
+def _scan_parts_file(filename: Path, use_cache: bool = True) -> Tuple[int, np.ndarray, np.ndarray]:
+    """1단계 작업 함수: 파일을 파싱(캐시 생성)하고 (행 수, 어휘, 배열)을 돌려준다.
+
+    캐시가 생겼으면 배열 자리는 None이다. 캐시가 없으면(use_cache=False이거나 저장 실패)
+    2단계에서 다시 파싱하지 않도록 파싱한 배열을 함께 돌려준다.
+    """
+    data, vocab = load_parts_csv_categorical(filename, use_cache=use_cache)
+    return len(data), vocab, None if isinstance(data, np.memmap) else data
+
+def _write_parts_slice(buffer, total: int, start: int, data: np.ndarray, mapping: np.ndarray) -> None:
+    """공유 메모리 버퍼 위의 병합 배열에서 start부터 data 행을 공통 코드로 채운다."""
+    merged = np.ndarray(total, dtype=CODED_PARTS_DTYPE, buffer=buffer)
+    stop = start + len(data)
+    merged['code'][start:stop] = mapping[data['code']]
+    merged['strength'][start:stop] = data['strength']
+
+def _fill_parts_slice(filename: Path, shm_name: str, total: int, start: int, mapping: np.ndarray) -> None:
+    """2단계 작업 함수: 캐시를 memory-map으로 열어 공유 메모리의 자기 구간에 공통 코드로 채운다."""
+    data, _ = load_parts_csv_categorical(filename)
+    shm = shared_memory.SharedMemory(name=shm_name)
     try:
-        merged = np.concatenate((arr1, arr2, arr3), axis=0)
-        print(f"배열 병합 완료: {len(merged)}행")
-        return merged
-    
+        # 버퍼 위의 배열은 함수 안에서만 살아 있으므로 close 전에 참조가 풀린다.
+        _write_parts_slice(shm.buf, total, start, data, mapping)
+    finally:
+        shm.close()
+
+def _release_shared_memory(shm: shared_memory.SharedMemory) -> None:
+    shm.close()
+    shm.unlink()
+
+def ingest_parts_files(filenames: Sequence[Path], workers: int = None, use_cache: bool = True):
+    """여러 parts CSV를 프로세스 풀에서 병렬로 읽어 하나의 범주형 배열로 합친다.
+
+    1단계에서 각 파일의 행 수와 어휘를 먼저 받아 전체 크기의 공유 메모리 배열을 한 번만 할당하고,
+    2단계에서 각 작업 프로세스가 자기 구간을 직접 채운다 (파일별 배열을 모아 concatenate하지 않음).
+    캐시를 쓰지 않거나 저장하지 못한 파일은 1단계에서 받은 배열을 부모 프로세스가 바로 채운다.
+    반환되는 배열은 공유 메모리를 그대로 사용하며, 배열이 사라지면 공유 메모리도 해제된다.
+    (병합된 코드 배열, 정렬된 공통 어휘)를 반환하고, 실패하면 None.
+    """
+    filenames = [Path(name) for name in filenames]
+    if not filenames:
+        print("읽을 parts 파일이 없습니다.")
+        return None
+
+    try:
+        # 작업 프로세스가 부모와 같은 resource tracker를 쓰도록 먼저 띄운다.
+        # (각자 tracker를 띄우면 작업 프로세스 종료 시 공유 메모리를 지우려 한다.)
+        resource_tracker.ensure_running()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            sizes, vocabs, parsed = zip(*executor.map(_scan_parts_file, filenames,
+                                                      [use_cache] * len(filenames)))
+
+            total = sum(sizes)
+            vocab = np.unique(np.concatenate(vocabs))
+            starts = np.concatenate([[0], np.cumsum(sizes)[:-1]]).tolist()
+            mappings = [np.searchsorted(vocab, file_vocab).astype(np.int32) for file_vocab in vocabs]
+
+            shm = shared_memory.SharedMemory(create=True, size=max(1, total * CODED_PARTS_DTYPE.itemsize))
+            try:
+                pending = [i for i, data in enumerate(parsed) if data is None]
+                for i, data in enumerate(parsed):
+                    if data is not None:
+                        _write_parts_slice(shm.buf, total, starts[i], data, mappings[i])
+                list(executor.map(_fill_parts_slice, [filenames[i] for i in pending],
+                                  [shm.name] * len(pending), [total] * len(pending),
+                                  [starts[i] for i in pending], [mappings[i] for i in pending]))
+            except BaseException:
+                _release_shared_memory(shm)
+                raise
+
+        merged = np.ndarray(total, dtype=CODED_PARTS_DTYPE, buffer=shm.buf)
+        weakref.finalize(merged, _release_shared_memory, shm)
+        print(f"{len(filenames)}개 파일 병렬 병합 완료: {total}행 (부품 {len(vocab)}종)")
+        return merged, vocab
+
     except Exception as e:
-        print(f"배열 병합 중 오류 발생: {e}")
+        print(f"parts 파일 병렬 읽기 중 오류 발생: {e}")
         return None
 
-def calculate_item_averages(integrated_csv:np.ndarray)->Tuple:
-    """각 부품 항목별 평균 강도값 계산"""
+def _grouped_stats(inverse: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    """그룹 번호(inverse)별 count/sum/mean/min/max/std를 몇 번의 벡터 연산으로 계산"""
+    values = values.astype(np.float64, copy=False)
+    count = np.bincount(inverse, minlength=n_groups)
+    total = np.bincount(inverse, weights=values, minlength=n_groups)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / count
+        # 평균을 뺀 뒤 제곱합을 구하는 두 번째 패스 (E[x²]-E[x]² 방식보다 수치적으로 안정)
+        deviation = values - mean[inverse]
+        std = np.sqrt(np.bincount(inverse, weights=deviation * deviation, minlength=n_groups) / count)
+
+    minimum = np.full(n_groups, np.inf)
+    maximum = np.full(n_groups, -np.inf)
+    np.minimum.at(minimum, inverse, values)
+    np.maximum.at(maximum, inverse, values)
+
+    stats = np.empty(n_groups, dtype=[('count', 'i8'), ('sum', 'f8'), ('mean', 'f8'),
+                                      ('min', 'f8'), ('max', 'f8'), ('std', 'f8')])
+    stats['count'] = count
+    stats['sum'] = total
+    stats['mean'] = mean
+    stats['min'] = minimum
+    stats['max'] = maximum
+    stats['std'] = std
+    return stats
+
+def groupby_stats(keys: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """keys가 같은 값끼리 묶어 values의 통계를 계산
+
+    np.unique(return_inverse=True)로 그룹 번호를 한 번만 구한 뒤 np.bincount 등으로 집계하므로
+    부품 종류 수(k)와 무관하게 O(n)번의 벡터 연산으로 끝난다 (기존 부품별 마스크 방식은 O(n·k)).
+    (정렬된 고유 키 배열, count/sum/mean/min/max/std 필드를 가진 구조화 배열)을 반환한다.
+    """
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    return unique_keys, _grouped_stats(inverse.ravel(), values, len(unique_keys))
+
+def groupby_codes(codes: np.ndarray, values: np.ndarray, vocab: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """범주형 코드로 바로 집계 (np.unique 정렬이 필요 없음)
+
+    값이 있는 그룹만 부품명 순서로 (코드 배열, 통계 구조화 배열)을 반환한다.
+    """
+    stats = _grouped_stats(codes, values, len(vocab))
+    present = np.flatnonzero(stats['count'] > 0)
+    present = present[np.argsort(vocab[present], kind='stable')]
+    return present, stats[present]
+
+class RunningPartStats:
+    """블록 단위로 들어오는 (부품명, 강도)를 부품별 누적 통계로 모으는 스트리밍 집계기
+
+    부품명은 처음 본 순서대로 코드를 받고(어휘가 자라면 누적 배열도 늘린다), 부품별로
+    count/sum/min/max와 편차 제곱합 M2만 유지하므로 메모리는 행 수가 아니라 부품 종류 수에 비례한다.
+    블록 통계는 _grouped_stats로 구한 뒤 Chan(병렬 Welford) 방식으로 누적 M2에 합친다.
+    합계는 정수 강도의 float64 합이라 정확하고, 평균은 sum / count로 일괄 집계와 똑같이 나온다.
+    """
+    def __init__(self, capacity: int = 1024):
+        self._lookup = _new_code_lookup()
+        self.count = np.zeros(capacity, dtype=np.int64)
+        self.sum = np.zeros(capacity)
+        self.m2 = np.zeros(capacity)
+        self.min = np.full(capacity, np.inf)
+        self.max = np.full(capacity, -np.inf)
+        self.rows = 0
+
+    def _grow(self, n_groups: int) -> None:
+        capacity = len(self.count)
+        if n_groups <= capacity:
+            return
+        extra = max(n_groups, capacity * 2) - capacity
+        self.count = np.concatenate([self.count, np.zeros(extra, dtype=np.int64)])
+        self.sum = np.concatenate([self.sum, np.zeros(extra)])
+        self.m2 = np.concatenate([self.m2, np.zeros(extra)])
+        self.min = np.concatenate([self.min, np.full(extra, np.inf)])
+        self.max = np.concatenate([self.max, np.full(extra, -np.inf)])
+
+    def update(self, names: np.ndarray, strengths: np.ndarray) -> None:
+        """블록 하나를 누적한다."""
+        codes = _encode_names(self._lookup, names)
+        n_groups = len(self._lookup)
+        self._grow(n_groups)
+        block = _grouped_stats(codes, strengths, n_groups)
+
+        count_a = self.count[:n_groups]
+        count_b = block['count']
+        total = count_a + count_b
+        seen = count_b > 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = block['mean'] - self.sum[:n_groups] / count_a
+            m2_b = block['std'] ** 2 * count_b
+            merged_m2 = np.where(count_a > 0, self.m2[:n_groups] + m2_b + delta * delta * count_a * count_b / total, m2_b)
+        self.m2[:n_groups] = np.where(seen, merged_m2, self.m2[:n_groups])
+        self.count[:n_groups] = total
+        self.sum[:n_groups] += block['sum']
+        np.minimum(self.min[:n_groups], block['min'], out=self.min[:n_groups])
+        np.maximum(self.max[:n_groups], block['max'], out=self.max[:n_groups])
+        self.rows += len(codes)
+
+    def add_file(self, filename: Path, block_rows: int = 1_000_000) -> None:
+        for block in iter_parts_csv_blocks(filename, block_rows):
+            self.update(block[:, 0], block[:, 1].astype(np.int32))
+
+    def result(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(부품명 순 코드 배열, _grouped_stats와 같은 필드의 통계 배열, 어휘)를 반환"""
+        vocab = np.array(list(self._lookup), dtype=str)
+        n_groups = len(vocab)
+        stats = np.empty(n_groups, dtype=[('count', 'i8'), ('sum', 'f8'), ('mean', 'f8'),
+                                          ('min', 'f8'), ('max', 'f8'), ('std', 'f8')])
+        count = self.count[:n_groups]
+        stats['count'] = count
+        stats['sum'] = self.sum[:n_groups]
+        stats['min'] = self.min[:n_groups]
+        stats['max'] = self.max[:n_groups]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            stats['mean'] = self.sum[:n_groups] / count
+            stats['std'] = np.sqrt(self.m2[:n_groups] / count)
+        order = np.argsort(vocab, kind='stable')
+        return order, stats[order], vocab
+
+def stream_item_averages(filenames: Sequence[Path], block_rows: int = 1_000_000, verbose: bool = True):
+    """parts CSV들을 병합하지 않고 block_rows행씩 읽으며 부품별 평균을 구한다 (메모리 사용량 일정).
+
+    calculate_item_averages(병합 배열, vocab=...)과 같은 (부품 코드, 평균)에 어휘를 더해 반환하고, 실패하면 None.
+    """
+    try:
+        running = RunningPartStats()
+        for filename in filenames:
+            running.add_file(filename, block_rows)
+            print(f"{filename} 집계 완료: 누적 {running.rows}행")
+
+        part_names_avg, stats, vocab = running.result()
+        if verbose:
+            _print_item_averages(vocab[part_names_avg], stats)
+        return part_names_avg, stats['mean'], vocab
+
+    except FileNotFoundError as e:
+        print(f"파일을 찾을 수 없습니다: {e.filename}")
+        return None
+    except Exception as e:
+        print(f"스트리밍 집계 중 오류 발생: {e}")
+        return None
+
+def _print_item_averages(labels: np.ndarray, stats: np.ndarray) -> None:
+    print(f"\n=== 항목별 평균값 계산 ===")
+    for part, avg_strength, count in zip(labels, stats['mean'], stats['count']):
+        print(f"{part}: {avg_strength:.2f} (샘플 수: {count})")
+
+def calculate_item_averages(integrated_csv:np.ndarray, verbose: bool = True, vocab: np.ndarray = None)->Tuple:
+    """각 부품 항목별 평균 강도값 계산
+
+    vocab을 주면 integrated_csv를 code/strength 범주형 배열로 보고 (부품 코드, 평균)을 반환한다.
+    """
     if integrated_csv is None:
         return None
     
     try:
-        # 부품명과 강도값 추출
-        part_names = integrated_csv['parts']
-        strength_values = integrated_csv['strength']
+        # 부품별 통계를 한 번에 계산
+        if vocab is not None:
+            part_names_avg, stats = groupby_codes(integrated_csv['code'], integrated_csv['strength'], vocab)
+            labels = vocab[part_names_avg]
+        else:
+            part_names_avg, stats = groupby_stats(integrated_csv['parts'], integrated_csv['strength'])
+            labels = part_names_avg
+        mean_strengths = stats['mean']
 
-        unique_part_names = np.unique(part_names)
-
-        item_averages = []
-        
-        print(f"\n=== 항목별 평균값 계산 ===")
-        for part in unique_part_names:
-
-            mask = part_names == part
-            part_strengths = strength_values[mask]
-            avg_strength = np.mean(part_strengths)
-            
-            item_averages.append((part, avg_strength))
-            print(f"{part}: {avg_strength:.2f} (샘플 수: {len(part_strengths)})")
+        if verbose:
+            _print_item_averages(labels, stats)
         
         # 부품명과 평균값을 각각 배열로 반환
-        part_names_avg = np.array([x[0] for x in item_averages])
-        mean_strengths = np.array([x[1] for x in item_averages])
         return part_names_avg, mean_strengths
         
     except Exception as e:
         print(f"항목별 평균값 계산 중 오류 발생: {e}")
         return None
 
-def filter_low_average_items(part_names_avg,mean_strengths):
-
+def filter_low_average_items(part_names_avg,mean_strengths, threshold: float = 50):
+    """평균 강도가 threshold보다 작은 항목만 남긴다."""
     if part_names_avg is None or mean_strengths is None:
         return None
     
-    mask = mean_strengths < 50
+    mask = mean_strengths < threshold
 
     filtered_parts = part_names_avg[mask]
 
     filtered_strengths = mean_strengths[mask]
 
-    print(f"\n=== 평균 강도 50보다 작은 항목 필터링 결과 ===")
+    print(f"\n=== 평균 강도 {threshold}보다 작은 항목 필터링 결과 ===")
     print(f"필터링된 항목 수: {len(filtered_parts)}")
 
     return filtered_parts, np.round(filtered_strengths,3)
     
-def save_structured_array_to_csv(data, filename):
+CSV_SPECIAL_CHARS = (',', '"', '\r', '\n')
+
+def _quote_csv_strings(values: np.ndarray) -> np.ndarray:
+    """csv.writer(QUOTE_MINIMAL)처럼 구분자·따옴표·줄바꿈이 든 값만 따옴표로 감싼다."""
+    values = np.asarray(values, dtype=str)
+    special = np.zeros(values.shape, dtype=bool)
+    for ch in CSV_SPECIAL_CHARS:
+        special |= np.char.find(values, ch) >= 0
+    if special.any():
+        values = values.astype(object)
+        quoted = np.char.replace(values[special].astype(str), '"', '""')
+        values[special] = np.char.add(np.char.add('"', quoted), '"')
+        values = values.astype(str)
+    return values
+
+def _format_csv_column(column: np.ndarray, float_precision: int = None) -> np.ndarray:
+    """열 하나를 통째로 CSV 문자열 배열로 바꾼다. 실수는 float_precision이 없으면 str()과 같은 최단 표현."""
+    if column.dtype.kind == 'f' and float_precision is not None:
+        return np.char.mod(f'%.{float_precision}f', column)
+    if column.dtype.kind in 'US':
+        return _quote_csv_strings(column)
+    return column.astype(str)
+
+def save_structured_array_to_csv(data, filename, vocab: np.ndarray = None, float_precision: int = None,
+                                 chunk_rows: int = 1_000_000):
+    """구조화 배열을 CSV로 저장. vocab을 주면 첫 번째 열의 코드를 부품명으로 바꿔 쓴다.
+
+    열 단위로 한꺼번에 문자열로 바꾸고 chunk_rows행씩 모아 쓴다. 출력은 csv.writer와 같다(utf-8-sig, CRLF).
+    float_precision을 주면 실수 열을 소수점 아래 그 자릿수로 고정해 쓴다.
+    """
 
     if data is None or len(data) == 0:
         print("저장할 데이터가 없습니다.")
         return False
     
     try:
+        names = data.dtype.names
+        # 어휘는 한 번만 포맷하고, 코드로 골라 쓴다
+        labels = _quote_csv_strings(vocab) if vocab is not None else None
+
         with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
-            writer = csv.writer(f)
-            headers = list(data.dtype.names)
-            writer.writerow(headers)
+            f.write(','.join(_quote_csv_strings(np.array(names)).tolist()) + '\r\n')
 
-            for r in data:
-                row = [str(field) for field in r]
-                writer.writerow(row)
+            for start in range(0, len(data), chunk_rows):
+                chunk = data[start:start + chunk_rows]
+                lines = None
+                for i, name in enumerate(names):
+                    if i == 0 and labels is not None:
+                        column = labels[chunk[name]]
+                    else:
+                        column = _format_csv_column(chunk[name], float_precision)
+                    lines = column if lines is None else np.char.add(np.char.add(lines, ','), column)
+                f.write('\r\n'.join(lines.tolist()) + '\r\n')
         
         print(f"\n데이터가 {filename}에 저장되었습니다. ({len(data)}행)")
         return True
@@ -113,26 +470,68 @@ def save_structured_array_to_csv(data, filename):
         print(f"CSV 파일 저장 중 오류 발생: {e}")
         return False
 
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--pattern',
+        default='./mars_base/mars_base_main_parts-*.csv',
+        help='Glob of parts CSV files to merge (default: ./mars_base/mars_base_main_parts-*.csv)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Processes used to parse the parts files (default: CPU count)'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Aggregate the parts files chunk by chunk without merging them (bounded memory)'
+    )
+    parser.add_argument(
+        '--block-rows',
+        type=int,
+        default=1_000_000,
+        help='Rows per chunk in --stream mode (default: 1,000,000)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Do not read or write the .npy caches next to the parts CSV files'
+    )
+    return parser
+
 def main():
+    args = create_parser().parse_args()
     print("=== Mars 부품 데이터 통합 분석 ===")
     
-    # 1. 세 개의 CSV 파일을 구조화된 NumPy 배열로 읽기
+    # 1-2. 모든 parts CSV를 병렬로 범주형 배열로 읽고, 미리 할당한 하나의 배열로 병합
     print("\n1단계: CSV 파일들을 구조화된 NumPy 배열로 읽기")
-    arr1 = read_csv_to_numpy(Path('./mars_base/mars_base_main_parts-001.csv'))
-    arr2 = read_csv_to_numpy(Path('./mars_base/mars_base_main_parts-002.csv'))
-    arr3 = read_csv_to_numpy(Path('./mars_base/mars_base_main_parts-003.csv'))
-    
-    # 2. 세 배열을 병합하여 parts 배열 생성
-    print("\n2단계: 배열들을 병합하여 parts 배열 생성")
-    parts = merge_structured_arrays(arr1, arr2, arr3)
-    
-    if parts is None:
-        print("배열 병합에 실패했습니다. 프로그램을 종료합니다.")
-        return 1
+    pattern = Path(args.pattern)
+    filenames = sorted(pattern.parent.glob(pattern.name))
+    for filename in filenames:
+        print(f"- {filename}")
+
+    if args.stream:
+        # 2-3. 병합하지 않고 파일을 블록 단위로 읽으며 부품별 누적 통계로 평균 계산
+        print("\n2-3단계: 블록 단위 스트리밍 집계로 강도값 통계 계산")
+        averages = stream_item_averages(filenames, block_rows=args.block_rows)
+        if averages is None:
+            print("스트리밍 집계에 실패했습니다. 프로그램을 종료합니다.")
+            return 1
+        part_names_avg, mean_strengths, vocab = averages
+    else:
+        print("\n2단계: 배열들을 병합하여 parts 배열 생성")
+        merged = ingest_parts_files(filenames, workers=args.workers, use_cache=not args.no_cache)
+
+        if merged is None:
+            print("배열 병합에 실패했습니다. 프로그램을 종료합니다.")
+            return 1
+        parts, vocab = merged
 
-    # 3. 강도값(두 번째 열)의 통계 계산
-    print("\n3단계: 강도값 통계 계산")
-    part_names_avg, mean_strengths = calculate_item_averages(parts)
+        # 3. 강도값(두 번째 열)의 통계 계산 (부품 코드 기준)
+        print("\n3단계: 강도값 통계 계산")
+        part_names_avg, mean_strengths = calculate_item_averages(parts, vocab=vocab)
 
     # 4. 평균값이 50보다 작은 항목만 필터링
     print("\n4단계: 강도 50보다 작은 항목 필터링")
@@ -149,8 +548,10 @@ def main():
     # 5. 필터링된 데이터를 CSV로 저장 (예외 처리 포함)
     print("\n5단계: parts_to_work_on.csv로 저장")
 
-    save_array = np.array(list(zip(filtered_parts, filtered_strengths)), dtype=[('parts', 'U50'), ('avg_strength', 'f8')])
-    success = save_structured_array_to_csv(save_array, 'parts_to_work_on.csv')
+    save_array = np.empty(len(filtered_parts), dtype=[('parts', 'i4'), ('avg_strength', 'f8')])
+    save_array['parts'] = filtered_parts # 부품 코드 (저장할 때 어휘로 이름 변환)
+    save_array['avg_strength'] = filtered_strengths
+    success = save_structured_array_to_csv(save_array, 'parts_to_work_on.csv', vocab=vocab)
 
     if success:
         print("Mars 부품 데이터 분석이 완료되었습니다!")
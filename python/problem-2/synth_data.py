@@ -0,0 +1,144 @@
+import sys
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# --- problem-2 합성 CSV 생성기 ---
+# main.py(인벤토리), main3.py(부품 강도), design_dome.py --batch(돔 사양)가 읽는 CSV 스키마를 행 수·종류 수·비숫자 비율·BOM 여부를 바꿔가며 만든다.
+
+INVENTORY_HEADER = ['Substance', 'Weight (g/cm³)', 'Specific Gravity', 'Strength', 'Flammability']
+PARTS_HEADER = ['parts', 'strength']
+DOME_HEADER = ['diameter', 'material', 'thickness']
+
+STRENGTHS = ['Very weak', 'Weak', 'Moderate', 'Strong', 'Very strong', 'Various']
+PART_NAMES = ['Concrete', 'Steel', 'Brick', 'Glass', 'Wood', 'Aluminum', 'Copper', 'Plastic']
+
+
+def part_names(cardinality: int) -> np.ndarray:
+    """부품명 어휘: 8종까지는 실제 부품명, 그보다 많으면 'Part 00001' 형식의 이름"""
+    if cardinality <= len(PART_NAMES):
+        return np.array(PART_NAMES[:cardinality])
+    return np.array([f"Part {i:05d}" for i in range(cardinality)])
+
+
+def _with_non_numeric(values: np.ndarray, rate: float, rng: np.random.Generator,
+                      token: str = 'Various') -> np.ndarray:
+    """값의 약 rate 비율을 숫자가 아닌 token으로 바꾼다."""
+    if rate > 0:
+        values = values.astype(object)
+        values[rng.random(len(values)) < rate] = token
+        values = values.astype(str)
+    return values
+
+
+def _write_csv_blocks(path: Path, header, rows: int, make_block, bom: bool, block_rows: int) -> Path:
+    """make_block(n)이 돌려준 열 문자열 배열들을 쉼표로 이어 block_rows행씩 쓴다."""
+    with open(path, 'w', encoding='utf-8-sig' if bom else 'utf-8', newline='') as f:
+        f.write(','.join(header) + '\n')
+        for start in range(0, rows, block_rows):
+            columns = make_block(min(block_rows, rows - start))
+            lines = columns[0]
+            for column in columns[1:]:
+                lines = np.char.add(np.char.add(lines, ','), column)
+            f.write('\n'.join(lines.tolist()) + '\n')
+    return path
+
+
+def make_inventory_csv(path: Path, rows: int, substances: int = 5000, non_numeric_rate: float = 0.05,
+                       bom: bool = False, seed: int = 0, block_rows: int = 1_000_000) -> Path:
+    """Mars_Base_Inventory_List.csv와 같은 스키마의 합성 CSV를 만든다.
+
+    Weight와 Specific Gravity의 약 non_numeric_rate 비율은 원본 파일처럼 'Various'로 채운다.
+    """
+    rng = np.random.default_rng(seed)
+    names = np.array([f"Substance {i}" for i in range(substances)])
+    strengths = np.array(STRENGTHS)
+
+    def make_block(n):
+        return [names[rng.integers(0, substances, n)],
+                _with_non_numeric(np.char.mod('%.3f', rng.uniform(0.5, 9, n)), non_numeric_rate, rng),
+                _with_non_numeric(np.char.mod('%.2f', rng.uniform(0.5, 9, n)), non_numeric_rate, rng),
+                strengths[rng.integers(0, len(strengths), n)],
+                np.char.mod('%.2f', rng.random(n))]
+
+    return _write_csv_blocks(Path(path), INVENTORY_HEADER, rows, make_block, bom, block_rows)
+
+
+def make_parts_csv(path: Path, rows: int, parts: int = len(PART_NAMES), bom: bool = True, seed: int = 0,
+                   block_rows: int = 1_000_000) -> Path:
+    """mars_base_main_parts-00*.csv와 같은 (기본값은 BOM 포함) parts,strength CSV를 만든다.
+
+    main3의 parts 로더는 숫자가 아닌 강도를 행 단위로 거르지 않으므로 강도는 항상 정수로 채운다.
+    """
+    rng = np.random.default_rng(seed)
+    names = part_names(parts)
+
+    def make_block(n):
+        return [names[rng.integers(0, len(names), n)], rng.integers(0, 100, n).astype(str)]
+
+    return _write_csv_blocks(Path(path), PARTS_HEADER, rows, make_block, bom, block_rows)
+
+
+def make_dome_csv(path: Path, rows: int, non_numeric_rate: float = 0.0, bom: bool = False, seed: int = 0,
+                  block_rows: int = 1_000_000) -> Path:
+    """design_dome.py --batch 입력과 같은 diameter,material,thickness CSV를 만든다.
+
+    non_numeric_rate를 주면 지름의 일부를 'N/A'로 채워 거부 경로를 함께 측정할 수 있다.
+    배치 모드는 헤더 앞의 BOM을 건너뛰므로 bom=True로 BOM이 있는 입력도 만들 수 있다.
+    """
+    from design_dome import DEFAULT_MATERIALS
+    rng = np.random.default_rng(seed)
+    materials = np.array(DEFAULT_MATERIALS)
+
+    def make_block(n):
+        return [_with_non_numeric(np.char.mod('%.2f', rng.uniform(1, 50, n)), non_numeric_rate, rng, 'N/A'),
+                materials[rng.integers(0, len(materials), n)],
+                np.char.mod('%.2f', rng.uniform(0.5, 20, n))]
+
+    return _write_csv_blocks(Path(path), DOME_HEADER, rows, make_block, bom, block_rows)
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Generate synthetic problem-2 CSV files')
+    parser.add_argument('schema', choices=['inventory', 'parts', 'dome'], help='CSV schema to generate')
+    parser.add_argument('output', type=Path, help='Output CSV path')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Number of data rows')
+    parser.add_argument('--cardinality', type=int, default=None,
+                        help='Distinct substances/parts (default: 5000 for inventory, 8 for parts)')
+    parser.add_argument('--non-numeric-rate', type=float, default=None,
+                        help='Fraction of non-numeric values, inventory and dome only (default: 0.05 for inventory, 0 for dome)')
+    parser.add_argument('--bom', action=argparse.BooleanOptionalAction, default=None,
+                        help='Write a UTF-8 BOM (default: off for inventory and dome, on for parts)')
+    parser.add_argument('--seed', type=int, default=0)
+    return parser
+
+
+def main() -> int:
+    parser = create_parser()
+    args = parser.parse_args()
+    if args.schema == 'parts' and args.non_numeric_rate is not None:
+        parser.error('--non-numeric-rate is not supported for the parts schema')
+    options = {'seed': args.seed}
+    if args.non_numeric_rate is not None:
+        options['non_numeric_rate'] = args.non_numeric_rate
+    if args.bom is not None:
+        options['bom'] = args.bom
+
+    if args.schema == 'inventory':
+        if args.cardinality is not None:
+            options['substances'] = args.cardinality
+        make_inventory_csv(args.output, args.rows, **options)
+    elif args.schema == 'parts':
+        if args.cardinality is not None:
+            options['parts'] = args.cardinality
+        make_parts_csv(args.output, args.rows, **options)
+    else:
+        make_dome_csv(args.output, args.rows, **options)
+
+    print(f"{args.output}에 {args.rows:,}행 생성 완료")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
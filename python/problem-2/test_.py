@@ -0,0 +1,628 @@
+import gc
+import io
+import csv
+import json
+import math
+import warnings
+import subprocess
+import sys
+import http.client
+from pathlib import Path
+from urllib.parse import urlparse
+
+import numpy as np
+import pytest
+
+import design_dome
+import dome_service
+import main
+import main3
+from synth_data import make_parts_csv, make_dome_csv
+
+HERE = Path(__file__).parent
+
+
+@pytest.fixture
+def service():
+    running = dome_service.DomeService(port=0, cache_size=100).start()
+    yield running
+    running.stop()
+
+
+def _post(url: str, payload) -> tuple:
+    parsed = urlparse(url)
+    connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=10)
+    connection.request('POST', '/dome', body=json.dumps(payload).encode('utf-8'),
+                       headers={'Content-Type': 'application/json'})
+    response = connection.getresponse()
+    result = response.status, json.loads(response.read())
+    connection.close()
+    return result
+
+
+def test_dome_service_mixed_batch_reports_errors_per_item(service):
+    """잘못된 사양이 섞인 배치에서도 나머지 사양은 계산하고 잘못된 항목만 error로 돌려주는지 검증하는 테스트"""
+    specs = [
+        {'diameter': 10, 'material': 'glass', 'thickness': 1},
+        {'diameter': 10 ** 400, 'material': 'glass', 'thickness': 1},  # float 변환 시 OverflowError
+        {'diameter': 'ten', 'material': 'glass'},
+        {'diameter': 10, 'material': 'wood'},
+        {'material': 'glass'},
+        'not a spec',
+        {'diameter': 1, 'material': 'glass', 'thickness': 100},  # 두께가 반지름보다 큼
+        {'diameter': 10, 'material': ' 알루미늄 ', 'thickness': 2},
+    ]
+    status, payload = _post(service.url, {'specs': specs})
+    results = payload['results']
+
+    assert status == 200
+    assert len(results) == len(specs)
+    assert [('error' in result) for result in results] == [False, True, True, True, True, True, True, False]
+    assert results[0]['material'] == 'glass' and results[0]['weight'] > 0
+    assert results[1]['error'] == 'diameter와 thickness는 숫자여야 합니다'
+    assert results[7]['material'] == 'aluminum'
+
+    # 같은 배치를 다시 보내면 서버가 계속 응답하고 유효한 사양은 캐시에서 나온다
+    status, again = _post(service.url, specs)
+    assert status == 200
+    assert again['results'] == results
+    assert service.cache.stats()['hits'] >= 2
+
+
+def _deny_cache_writes(monkeypatch):
+    """캐시 임시 파일을 제자리로 옮기는 단계에서 권한 오류가 나도록 한다 (root로 실행해도 재현되도록)"""
+    def replace(self, target):
+        raise PermissionError(13, 'Permission denied', str(target))
+    monkeypatch.setattr(Path, 'replace', replace)
+
+
+def test_parts_loaders_fall_back_when_cache_is_unwritable(tmp_path, monkeypatch, capsys):
+    """.npy 캐시를 쓸 수 없어도 파싱한 배열을 돌려주고 캐시 파일을 남기지 않는지 검증하는 테스트"""
+    csv_path = make_parts_csv(tmp_path / 'parts.csv', 1000, seed=1)
+    expected_codes, expected_vocab = main3.parse_parts_csv_categorical(csv_path)
+    _deny_cache_writes(monkeypatch)
+
+    coded = main3.read_csv_to_categorical(csv_path)
+    assert coded is not None
+    assert np.array_equal(coded[0], expected_codes)
+    assert np.array_equal(coded[1], expected_vocab)
+
+    assert list(tmp_path.glob('*.npy')) == []
+    assert list(tmp_path.glob('*.tmp')) == []
+    assert '캐시를 저장하지 못해' in capsys.readouterr().err
+
+
+def test_parts_loader_keeps_long_part_names(tmp_path):
+    """10자가 넘는 부품명도 잘리지 않고 서로 다른 부품으로 읽히는지 검증하는 테스트 (예전 U10 로더는 앞 10자만 남겼다)"""
+    csv_path = tmp_path / 'parts.csv'
+    csv_path.write_text('\ufeffparts,strength\nReinforced panel A,40\nReinforced panel B,60\n'
+                        'Reinforced panel A,50\n', encoding='utf-8')
+    data, vocab = main3.read_csv_to_categorical(csv_path, use_cache=False)
+    assert vocab.tolist() == ['Reinforced panel A', 'Reinforced panel B']
+    assert vocab[data['code']].tolist() == ['Reinforced panel A', 'Reinforced panel B', 'Reinforced panel A']
+
+
+def _parts_files(tmp_path, count: int = 3, rows: int = 2000) -> list:
+    # 파일마다 부품 종류 수를 달리해 어휘가 서로 다른 파일을 병합하도록 한다
+    return [make_parts_csv(tmp_path / f'parts-{i:03d}.csv', rows + 37 * i, parts=4 + 3 * i, seed=i)
+            for i in range(count)]
+
+
+def test_ingest_parts_files_without_cache(tmp_path):
+    """--no-cache 경로가 캐시 파일 없이 한 번씩만 파싱해 순차 병합과 같은 결과를 내는지 검증하는 테스트"""
+    filenames = _parts_files(tmp_path)
+    expected, expected_vocab = main3.merge_categorical_arrays(
+        [main3.parse_parts_csv_categorical(name) for name in filenames])
+
+    merged, vocab = main3.ingest_parts_files(filenames, workers=2, use_cache=False)
+
+    assert np.array_equal(merged, expected)
+    assert np.array_equal(vocab, expected_vocab)
+    assert list(tmp_path.glob('*.npy')) == []
+
+
+def test_ingest_parts_files_shared_memory_is_released(tmp_path, monkeypatch):
+    """병렬 병합 결과가 순차 병합과 같고, 결과 배열이 사라지면 공유 메모리 세그먼트가 해제되는지 검증하는 테스트"""
+    filenames = _parts_files(tmp_path, count=5)
+    expected, expected_vocab = main3.merge_categorical_arrays(
+        [main3.parse_parts_csv_categorical(name) for name in filenames])
+
+    created = []
+
+    class RecordingSharedMemory(main3.shared_memory.SharedMemory):
+        def __init__(self, *args, create=False, **kwargs):
+            super().__init__(*args, create=create, **kwargs)
+            if create:
+                created.append(self.name)
+
+    monkeypatch.setattr(main3.shared_memory, 'SharedMemory', RecordingSharedMemory)
+
+    # 첫 실행은 캐시를 만들고, 두 번째 실행은 memory-map 캐시에서 작업 프로세스가 구간을 채운다
+    for _ in range(2):
+        merged, vocab = main3.ingest_parts_files(filenames, workers=2)
+        assert np.array_equal(merged, expected)
+        assert np.array_equal(vocab, expected_vocab)
+        del merged
+        gc.collect()
+    assert len(list(tmp_path.glob('*.codes.npy'))) == len(filenames)
+
+    assert len(created) == 2
+    for name in created:
+        with pytest.raises(FileNotFoundError):
+            main3.shared_memory.SharedMemory(name=name)
+
+
+def test_top_k_indices_non_positive_k_and_cli_rejects_it():
+    """top이 0 이하이면 NumPy 경로도 dict 경로처럼 빈 결과를 내고, CLI는 --top 0을 거부하는지 검증하는 테스트"""
+    values = np.array([0.3, 0.9, 0.5, 0.9, 0.1])
+    for k in (0, -3):
+        assert main._top_k_indices(values, k).tolist() == []
+    assert main._top_k_indices(values, 2).tolist() == [1, 3]
+    assert main._top_k_indices(values, 10).tolist() == [1, 3, 2, 0, 4]
+
+    parser = main.create_parser()
+    assert parser.parse_args(['--top', '3']).top == 3
+    for value in ('0', '-1'):
+        with pytest.raises(SystemExit):
+            parser.parse_args(['--top', value])
+
+
+# 인화성 경계값 동률·숫자가 아닌 값·NaN·쉼표가 든 따옴표 필드를 섞은 작은 인벤토리
+INVENTORY_EDGE_CASES = """Substance,Weight (g/cm³),Specific Gravity,Strength,Flammability
+Alcohol,0.789,0.79,Very weak,0.85
+Petroleum Products,Various,Various,Various,0.92
+Propane,1.88,1.88,Very low,0.7
+"Acid, Sulfuric",1.83,1.83,Strong,0.9
+Water,1.0,1.0,Very strong,0.0
+Unknown Sample,Various,Various,Various,Various
+Methane,0.656,0.66,Very low,0.7
+Mystery Gel,1.1,1.1,Weak,nan
+Ethanol,0.789,0.79,Very weak,0.85
+Butane,2.48,2.48,Very low,0.9
+"""
+
+
+def _inventory_csv(tmp_path, text: str = INVENTORY_EDGE_CASES) -> Path:
+    path = tmp_path / 'Mars_Base_Inventory_List.csv'
+    path.write_text(text, encoding='utf-8')
+    return path
+
+
+def _scan_inventory(csv_path: Path, low: float, high: float) -> list:
+    """csv 모듈과 float()로 전체를 훑어 low <= 인화성 < high인 행을 인화성 내림차순(동률은 파일 순서)으로 고른다."""
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        rows = []
+        for row in csv.DictReader(f):
+            try:
+                row['Flammability'] = float(row['Flammability'])
+            except ValueError:
+                continue
+            if low <= row['Flammability'] < high:
+                rows.append(row)
+    return sorted(rows, key=lambda row: -row['Flammability'])
+
+
+def _nan_to_none(records: list) -> list:
+    """NaN은 자기 자신과 같지 않으므로 비교 전에 None으로 바꾼다."""
+    return [{key: None if isinstance(value, float) and math.isnan(value) else value
+             for key, value in record.items()} for record in records]
+
+
+def test_iter_mars_inventory_echoes_in_the_same_pass(tmp_path, capsys):
+    """echo가 파싱과 같은 한 번의 읽기에서 줄 단위로 일어나고, 인화성이 숫자가 아닌 행은 건너뛰는지 검증하는 테스트"""
+    csv_path = _inventory_csv(tmp_path)
+    rows = main.iter_mars_inventory(csv_path)
+
+    first = next(rows)
+    out = capsys.readouterr().out
+    # 첫 행을 받은 시점에는 그 줄까지만 출력됐다 (전체를 먼저 읽어 출력하지 않음)
+    assert out.splitlines()[:2] == INVENTORY_EDGE_CASES.splitlines()[:2]
+    assert 'Butane' not in out
+    assert first['Substance'] == 'Alcohol' and first['Flammability'] == 0.85
+
+    rest = list(rows)
+    out = capsys.readouterr().out
+    assert 'Butane,2.48,2.48,Very low,0.9' in out
+    assert '건너뜁니다: Unknown Sample' in out
+    names = [row['Substance'] for row in [first] + rest]
+    assert 'Unknown Sample' not in names
+    assert len(names) == 9 and names[-1] == 'Butane'
+    assert all(isinstance(row['Flammability'], float) for row in rest)
+
+
+def test_iter_mars_inventory_without_echo_is_silent(capsys):
+    """echo=False이면 아무것도 출력하지 않고 같은 행을 돌려주는지 검증하는 테스트"""
+    csv_path = HERE / 'mars_base' / 'Mars_Base_Inventory_List.csv'
+    quiet = list(main.iter_mars_inventory(csv_path, echo=False))
+    assert capsys.readouterr().out == ''
+
+    echoed = list(main.iter_mars_inventory(csv_path))
+    assert len(capsys.readouterr().out.splitlines()) == len(quiet) + 1 # 헤더 + 행
+    assert quiet == echoed
+
+
+def test_load_inventory_columns_chunking_various_and_quotes(tmp_path):
+    """청크 크기와 관계없이 같은 열 배열이 되고, 'Various'는 NaN·valid 제외, 쉼표가 든 따옴표 필드는 한 칸으로 읽히는지 검증하는 테스트"""
+    csv_path = _inventory_csv(tmp_path)
+    columns = main.load_inventory_columns(csv_path)
+    one_by_one = main.load_inventory_columns(csv_path, chunk_rows=1)
+
+    assert len(columns) == len(one_by_one) == 10
+    assert columns.fieldnames == one_by_one.fieldnames
+    for name in columns.fieldnames:
+        assert columns.strings(name).tolist() == one_by_one.strings(name).tolist()
+    for name in main.NUMERIC_COLUMNS:
+        assert np.array_equal(columns.numeric[name], one_by_one.numeric[name], equal_nan=True)
+
+    substances = columns.strings('Substance').tolist()
+    assert substances[3] == 'Acid, Sulfuric'
+    assert columns.strings('Flammability')[3] == '0.9'
+
+    various = columns.strings('Weight (g/cm³)') == 'Various'
+    assert various.sum() == 2
+    assert np.isnan(columns.numeric['Weight (g/cm³)'][various]).all()
+    assert not columns.valid('Weight (g/cm³)')[various].any()
+    assert columns.valid('Weight (g/cm³)')[~various].all()
+    assert columns.valid('Flammability').tolist() == [True] * 5 + [False, True, False, True, True]
+
+
+def test_inventory_columns_to_records_matches_reader(tmp_path):
+    """to_records()가 read_mars_inventory와 같은 dict를 만드는지 검증하는 테스트 (reader가 건너뛰는 숫자 아닌 인화성 행 제외)"""
+    for csv_path in (_inventory_csv(tmp_path), HERE / 'mars_base' / 'Mars_Base_Inventory_List.csv'):
+        columns = main.load_inventory_columns(csv_path)
+        numeric_rows = columns.take(columns.strings('Flammability') != 'Various')
+        assert _nan_to_none(numeric_rows.to_records()) == \
+            _nan_to_none(main.read_mars_inventory(csv_path, echo=False))
+
+
+def test_flammability_index_query_matches_csv_scan(tmp_path):
+    """인덱스 조회가 [low, high) 경계 동률·NaN·숫자가 아닌 행까지 전체 스캔과 같은 행을 같은 순서로 돌려주는지 검증하는 테스트"""
+    csv_path = _inventory_csv(tmp_path)
+    for low, high in ((0.7, 0.9), (0.7, np.inf), (0.0, 0.7), (0.85, 0.85), (0.9, 1.0), (-np.inf, np.inf)):
+        expected = _scan_inventory(csv_path, low, high)
+        assert main.query_flammability_index(csv_path, low, high) == expected
+
+    # 내림차순, 동률은 파일 순서
+    names = [row['Substance'] for row in main.query_flammability_index(csv_path, 0.7, np.inf)]
+    assert names == ['Petroleum Products', 'Acid, Sulfuric', 'Butane', 'Alcohol', 'Ethanol', 'Propane', 'Methane']
+    assert 'Mystery Gel' not in names and 'Unknown Sample' not in names
+
+
+def test_flammability_index_rebuilds_when_csv_changes(tmp_path):
+    """CSV를 고치면 지문이 바뀌어 인덱스를 새로 만들고, 예전 지문의 .flamidx.npy는 지워지는지 검증하는 테스트"""
+    csv_path = _inventory_csv(tmp_path)
+    old_fingerprint = main.csv_fingerprint(csv_path)
+    old_index = main.build_flammability_index(csv_path)
+    assert old_index.exists() and old_fingerprint in old_index.name
+    assert main.csv_fingerprint(csv_path) == old_fingerprint
+
+    with open(csv_path, 'a', encoding='utf-8') as f:
+        f.write('Hydrazine,1.02,1.02,Low,0.95\n')
+    assert main.csv_fingerprint(csv_path) != old_fingerprint
+
+    results = main.query_flammability_index(csv_path, 0.9)
+    assert results[0]['Substance'] == 'Hydrazine'
+    assert results == _scan_inventory(csv_path, 0.9, np.inf)
+    assert not old_index.exists()
+    assert list(tmp_path.glob('*.flamidx.npy')) == [main.flammability_index_path(csv_path)]
+    assert list(tmp_path.glob('*.tmp')) == []
+
+
+def test_stream_dangerous_items_gzip_round_trip(tmp_path, monkeypatch):
+    """.gz 출력을 다시 읽으면 평문 출력과 같고, 결과 파일은 임시 파일의 원자적 이름 변경으로만 생기는지 검증하는 테스트"""
+    import gzip
+
+    csv_path = _inventory_csv(tmp_path)
+    plain_path = tmp_path / 'danger.csv'
+    gz_path = tmp_path / 'danger.csv.gz'
+
+    renames = []
+    real_replace = main.os.replace
+
+    def recording_replace(src, dst):
+        assert not Path(dst).exists() # 이름을 바꾸기 전에는 결과 파일이 보이지 않는다
+        renames.append((Path(src).name, Path(dst)))
+        real_replace(src, dst)
+
+    monkeypatch.setattr(main.os, 'replace', recording_replace)
+    assert main.stream_dangerous_items_csv(csv_path, plain_path, threshold=0.7) == 7
+    assert main.stream_dangerous_items_csv(csv_path, gz_path, threshold=0.7) == 7
+
+    assert [dst for _, dst in renames] == [plain_path, gz_path]
+    assert all(src.startswith('.') and src.endswith('.tmp') for src, _ in renames)
+    with gzip.open(gz_path, 'rt', encoding='utf-8', newline='') as f:
+        unpacked = f.read()
+    assert unpacked == plain_path.read_bytes().decode('utf-8')
+    rows = list(csv.reader(io.StringIO(unpacked)))
+    assert rows[0][-1] == 'Flammability'
+    assert ['Acid, Sulfuric', '1.83', '1.83', 'Strong', '0.9'] in rows
+    assert sorted(path.name for path in tmp_path.iterdir()) == \
+        ['Mars_Base_Inventory_List.csv', 'danger.csv', 'danger.csv.gz']
+
+
+@pytest.mark.parametrize('name', ['danger.csv', 'danger.csv.gz'])
+def test_atomic_csv_writer_leaves_nothing_on_failure(tmp_path, name):
+    """쓰는 도중 예외가 나면 임시 파일이 지워지고 기존 결과 파일은 그대로 남는지 검증하는 테스트"""
+    output_path = tmp_path / name
+    with main._atomic_csv_writer(output_path) as f:
+        f.write('previous\n')
+    before = output_path.read_bytes()
+
+    with pytest.raises(RuntimeError):
+        with main._atomic_csv_writer(output_path) as f:
+            f.write('partial,' * 100_000)
+            f.flush()
+            assert output_path.read_bytes() == before # 쓰는 동안에도 기존 파일은 그대로
+            assert len(list(tmp_path.glob('.*.tmp'))) == 1
+            raise RuntimeError('disk full')
+
+    assert output_path.read_bytes() == before
+    assert [path.name for path in tmp_path.iterdir()] == [name]
+
+    # 결과 파일이 없던 경우에도 아무것도 남기지 않는다
+    output_path.unlink()
+    with pytest.raises(RuntimeError):
+        with main._atomic_csv_writer(output_path) as f:
+            f.write('partial')
+            raise RuntimeError('disk full')
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_dome_properties_rejects_bad_codes_and_is_quiet_on_non_finite():
+    """범위 밖 재질 코드는 ValueError, 유한하지 않은 입력은 경고 없이 NaN이 되는지 검증하는 테스트"""
+    for code in (-1, len(design_dome.MATERIALS), [0, 7]):
+        with pytest.raises(ValueError):
+            design_dome.dome_properties(10.0, 1.0, code)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        area, mass, weight = design_dome.dome_properties([np.inf, np.nan, 1e200, 10.0], [1.0, 1.0, 1.0, np.inf], 0)
+    assert not np.isfinite(weight).any()
+    assert np.isfinite(design_dome.dome_properties(10.0, 1.0, len(design_dome.MATERIALS) - 1)[2])
+
+
+def _brute_force_front(area: np.ndarray, weight: np.ndarray) -> set:
+    """다른 점에 지배되지 않는 (면적, 무게) 쌍 집합. 모든 점 쌍을 직접 비교한다."""
+    front = set()
+    for a, w in zip(area.tolist(), weight.tolist()):
+        dominated = ((area >= a) & (weight <= w) & ((area > a) | (weight < w))).any()
+        if not dominated:
+            front.add((a, w))
+    return front
+
+
+def test_pareto_front_matches_brute_force_dominance():
+    """pareto_front가 전수 지배 비교와 같은 점을, 중복 없이 무게 오름차순으로 고르는지 검증하는 테스트"""
+    rng = np.random.default_rng(0)
+    for n in (1, 2, 50, 500):
+        # 정수 값이라 면적·무게가 같은 점과 완전히 같은 점이 자주 생긴다
+        area = rng.integers(0, 30, n).astype(np.float64)
+        weight = rng.integers(0, 30, n).astype(np.float64)
+        index = design_dome.pareto_front(area, weight)
+
+        chosen = list(zip(area[index].tolist(), weight[index].tolist()))
+        assert set(chosen) == _brute_force_front(area, weight)
+        assert len(chosen) == len(set(chosen))
+        assert np.all(np.diff(weight[index]) > 0) and np.all(np.diff(area[index]) > 0)
+    assert design_dome.pareto_front(np.empty(0), np.empty(0)).tolist() == []
+
+
+def test_optimize_dome_chunked_and_pooled_agree_and_respect_max_weight():
+    """청크 크기·프로세스 풀 사용 여부와 관계없이 같은 전선을 내고, max_weight를 넘는 설계는 빠지는지 검증하는 테스트"""
+    diameters = np.linspace(0.5, 20, 60)
+    thicknesses = np.linspace(0.1, 40, 25) # 반지름보다 두꺼운 비물리적 조합도 섞인다
+    max_weight = 1000.0
+
+    whole = design_dome.optimize_dome(diameters, thicknesses, max_weight=max_weight)
+    chunked = design_dome.optimize_dome(diameters, thicknesses, max_weight=max_weight,
+                                        chunk_points=100, workers=1)
+    pooled = design_dome.optimize_dome(diameters, thicknesses, max_weight=max_weight,
+                                       chunk_points=100, workers=2, parallel_threshold=0)
+    assert whole.dtype == design_dome.DOME_DESIGN_DTYPE
+    assert len(whole) > 1
+    assert np.array_equal(whole, chunked) and np.array_equal(whole, pooled)
+
+    # 전체 격자를 직접 계산해 무게 제한 안의 전선과 비교
+    d, t, m = np.meshgrid(diameters, thicknesses, np.arange(len(design_dome.MATERIALS)), indexing='ij')
+    area, _, weight = (values.ravel() for values in design_dome.dome_properties(d, t, m))
+    feasible = weight <= max_weight
+    assert set(zip(whole['area'].tolist(), whole['weight'].tolist())) == \
+        _brute_force_front(area[feasible], weight[feasible])
+    assert whole['weight'].max() <= max_weight
+    assert np.all(np.diff(whole['weight']) > 0)
+
+    unlimited = design_dome.optimize_dome(diameters, thicknesses)
+    assert unlimited['weight'].max() > max_weight
+    assert len(design_dome.optimize_dome(diameters, thicknesses, max_weight=0.0)) == 0
+
+
+# 배치 모드 경계 사례: 헤더·빈 줄·공백만 있는 줄·필드 수 오류·숫자 아님·모르는/대소문자 섞인 재질·비유한 값·비물리적 치수
+DOME_BATCH_EDGE_CASES = """\ufeffDiameter,Material,Thickness
+10,glass,1
+
+12.5,aluminum,2.25
+   
+8,Glass,1
+8, carbon_steel ,0.5
+7,ALUMINUM,3
+6,유리,1
+5,wood,1
+5,,1
+,glass,1
+abc,glass,1
+5,glass,x
+5,glass
+5,glass,1,extra
+nan,glass,1
+nan(1),glass,1
+5,glass,nan(1)
+  ,glass,1
+5,glass,	
+-1,glass,1
+inf,glass,1
+5,glass,-inf
+1e400,aluminum,1
+-3,glass,1
+0,glass,1
+1,glass,60
+4,carbon_steel,0
+ 3.5 ,glass, 1.5 
+1e-3,glass,1e-2
+9,aluminum,2"""
+
+
+def _reference_dome_batch(text: str) -> tuple:
+    """csv 모듈과 float()로 한 줄씩 처리하는 기준 구현. (출력 행 목록, [(줄 번호, 이유 종류, 원래 행)])"""
+    lines = text.split('\n')
+    if text.endswith('\n'):
+        lines = lines[:-1]
+    output, rejects = [], []
+    for number, line in enumerate(lines, 1):
+        if number == 1 and line.lstrip('\ufeff').lower().startswith('diameter'):
+            continue
+        fields = next(csv.reader([line]), [])
+        if len(fields) != 3:
+            if line.strip():
+                rejects.append((number, 'fields', line))
+            continue
+        material = fields[1] if fields[1] in design_dome.MATERIAL_DENSITY else fields[1].strip().lower()
+        if material not in design_dome.MATERIAL_DENSITY:
+            rejects.append((number, 'material', line))
+            continue
+        try:
+            diameter, thickness = float(fields[0]), float(fields[2])
+        except ValueError:
+            rejects.append((number, 'number', line))
+            continue
+        try:
+            radius, thickness_m = diameter / 2, thickness / 100
+            area = 1/2 * math.pi * diameter**2
+            volume = 2/3 * math.pi * (radius**3 - (radius - thickness_m)**3)
+            weight = volume * (100 ** 3) * design_dome.MATERIAL_DENSITY[material] / 1000 \
+                * design_dome.g * design_dome.MARS_GRAVITY
+        except OverflowError:
+            weight = math.inf
+        if not (diameter > 0 and thickness > 0 and thickness_m <= radius and math.isfinite(weight)):
+            rejects.append((number, 'dimension', line))
+            continue
+        output.append(f"{line},{area:.3f},{weight:.3f}")
+    return output, rejects
+
+
+# 배치 모드 거부 이유 → 기준 구현의 이유 종류
+_REJECT_KINDS = {'필드가': 'fields', '지원하지 않는 재질': 'material', '지름과 두께는 숫자': 'number',
+                 '지름·두께는 0보다': 'dimension'}
+
+
+def _run_dome_batch_text(text: str, block_bytes: int) -> tuple:
+    output, reject_file = io.StringIO(), io.StringIO()
+    summary = design_dome.run_dome_batch(io.StringIO(text), output, reject_file, block_bytes=block_bytes)
+    output_lines = output.getvalue().split('\n')
+    assert output_lines[0] == design_dome.BATCH_OUTPUT_HEADER and output_lines[-1] == ''
+    reject_rows = list(csv.reader(io.StringIO(reject_file.getvalue())))
+    assert ','.join(reject_rows[0]) == design_dome.BATCH_REJECT_HEADER
+    rejects = []
+    for line, reason, row in reject_rows[1:]:
+        kind = next(kind for prefix, kind in _REJECT_KINDS.items() if reason.startswith(prefix))
+        rejects.append((int(line), kind, row))
+    return output_lines[1:-1], rejects, summary
+
+
+@pytest.mark.parametrize('block_bytes', [1, 7, 1 << 22])
+def test_dome_batch_matches_reference(tmp_path, block_bytes):
+    """블록 크기와 상관없이 배치 결과·거부 행이 csv/float() 기준 구현과 같은지 검증하는 테스트"""
+    synthetic = make_dome_csv(tmp_path / 'domes.csv', 3000, non_numeric_rate=0.02, seed=3)
+    cases = [DOME_BATCH_EDGE_CASES, DOME_BATCH_EDGE_CASES + '\n',
+             DOME_BATCH_EDGE_CASES.replace('\ufeffDiameter,Material,Thickness\n', ''),
+             synthetic.read_text(encoding='utf-8')]
+    for text in cases:
+        expected_output, expected_rejects = _reference_dome_batch(text)
+        output, rejects, summary = _run_dome_batch_text(text, block_bytes)
+
+        assert output == expected_output
+        assert rejects == expected_rejects
+        assert summary['written'] == len(expected_output)
+        assert summary['rejected'] == len(expected_rejects)
+
+
+def test_synth_dome_csv_bom_option(tmp_path):
+    """synth_data dome --bom이 실제로 BOM을 쓰고, 배치 모드가 BOM 없는 입력과 같은 결과를 내는지 검증하는 테스트"""
+    outputs = {}
+    for flag in ('--bom', '--no-bom'):
+        path = tmp_path / f'domes{flag}.csv'
+        result = subprocess.run([sys.executable, str(HERE / 'synth_data.py'), 'dome', str(path), '--rows', '200', flag],
+                                capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        outputs[flag] = path.read_bytes()
+
+    assert outputs['--bom'] == b'\xef\xbb\xbf' + outputs['--no-bom']
+    assert not outputs['--no-bom'].startswith(b'\xef\xbb\xbf')
+    with_bom = _run_dome_batch_text(outputs['--bom'].decode('utf-8'), 1 << 22)
+    without_bom = _run_dome_batch_text(outputs['--no-bom'].decode('utf-8'), 1 << 22)
+    assert with_bom[:2] == without_bom[:2] and len(with_bom[0]) == 200
+
+
+def test_stream_item_averages_matches_batch_groupby(tmp_path):
+    """블록 단위 스트리밍 집계가 병합 후 groupby_codes와 같은 통계를 내고 평균은 비트 단위로 같은지 검증하는 테스트"""
+    filenames = _parts_files(tmp_path, rows=16_667)
+    merged, vocab = main3.merge_categorical_arrays([main3.parse_parts_csv_categorical(name) for name in filenames])
+    codes, stats = main3.groupby_codes(merged['code'], merged['strength'], vocab)
+
+    running = main3.RunningPartStats(capacity=2) # 누적 배열이 여러 번 늘어나도록
+    for filename in filenames:
+        running.add_file(filename, block_rows=777)
+    order, streamed, streamed_vocab = running.result()
+
+    assert running.rows == len(merged) >= 50_000
+    assert np.array_equal(streamed_vocab[order], vocab[codes])
+    for field in ('count', 'sum', 'mean', 'min', 'max'):
+        assert np.array_equal(streamed[field], stats[field]), field
+    np.testing.assert_allclose(streamed['std'], stats['std'], rtol=1e-12)
+
+
+def test_main3_stream_writes_same_csv(tmp_path):
+    """main3.py --stream이 기본(병합) 경로와 같은 parts_to_work_on.csv 바이트를 쓰는지 검증하는 테스트"""
+    (tmp_path / 'parts_in').mkdir()
+    _parts_files(tmp_path / 'parts_in', rows=16_667)
+    outputs = {}
+    for mode, extra in (('merged', []), ('stream', ['--stream', '--block-rows', '777'])):
+        workdir = tmp_path / mode
+        workdir.mkdir()
+        result = subprocess.run([sys.executable, str(HERE / 'main3.py'), '--pattern',
+                                 str(tmp_path / 'parts_in' / 'parts-*.csv'), '--no-cache', *extra],
+                                cwd=workdir, capture_output=True, text=True)
+        assert result.returncode == 0, result.stdout + result.stderr
+        outputs[mode] = (workdir / 'parts_to_work_on.csv').read_bytes()
+
+    assert outputs['stream'] == outputs['merged']
+    assert outputs['merged'].count(b'\n') > 1
+
+
+def _csv_writer_bytes(data: np.ndarray, vocab: np.ndarray, float_precision: int = None) -> bytes:
+    """같은 배열을 행 단위 csv.writer로 쓴 기준 출력 (utf-8-sig, CRLF)"""
+    out = io.StringIO(newline='')
+    writer = csv.writer(out)
+    writer.writerow(data.dtype.names)
+    for code, strength, note in data.tolist():
+        strength = str(np.float64(strength)) if float_precision is None else f'{strength:.{float_precision}f}'
+        writer.writerow([str(vocab[code]), strength, note])
+    return out.getvalue().encode('utf-8-sig')
+
+
+@pytest.mark.parametrize('float_precision', [None, 0, 3])
+@pytest.mark.parametrize('chunk_rows', [1, 7, 1_000_000])
+def test_save_structured_array_to_csv_matches_csv_writer(tmp_path, float_precision, chunk_rows):
+    """열 단위 저장이 쉼표·따옴표·줄바꿈이 든 이름, 고정 소수 자릿수, 여러 청크에서도 csv.writer와 같은 바이트인지 검증하는 테스트"""
+    vocab = np.array(['Bolt', 'Nut, hex', 'Pipe 3/4"', 'Line\nbreak', 'Carriage\rreturn',
+                      '"quoted"', ' spaced ', '화성 부품', ''])
+    rng = np.random.default_rng(0)
+    data = np.empty(50, dtype=[('parts', 'i4'), ('avg_strength', 'f8'), ('note', 'U12')])
+    data['parts'] = np.arange(50) % len(vocab)
+    data['avg_strength'] = rng.random(50) * 100
+    data['avg_strength'][:3] = [0.5, 2.5, 1e-7] # 반올림 경계와 지수 표기
+    data['note'] = rng.choice(['ok', 'a,b', 'say "hi"', 'x\ny', ''], 50)
+
+    path = tmp_path / 'out.csv'
+    assert main3.save_structured_array_to_csv(data, path, vocab=vocab, float_precision=float_precision,
+                                              chunk_rows=chunk_rows)
+    assert path.read_bytes() == _csv_writer_bytes(data, vocab, float_precision)
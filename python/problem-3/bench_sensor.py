@@ -0,0 +1,50 @@
+import sys
+import time
+import argparse
+
+from mars_mission_computer import DummySensor, SensorHistory, SENSOR_KEYS
+
+# --- DummySensor 생성 속도 벤치마크 ---
+# set_env 한 번씩 호출하는 방식과 generate_batch로 한 번에 만드는 방식의 초당 샘플 수를 비교하고,
+# 생성한 배치를 SensorHistory.extend까지 흘려보낸 처리량도 잰다.
+
+
+def bench_set_env(samples: int) -> float:
+    sensor = DummySensor()
+    start = time.perf_counter()
+    for _ in range(samples):
+        sensor.set_env()
+    return samples / (time.perf_counter() - start)
+
+
+def bench_generate_batch(samples: int, batch: int, drift: float, noise: float, history: SensorHistory = None) -> float:
+    sensor = DummySensor(seed=0)
+    start = time.perf_counter()
+    for _ in range(samples // batch):
+        timestamps, values = sensor.generate_batch(batch, drift=drift, noise=noise)
+        if history is not None:
+            history.extend(timestamps, values)
+    return (samples // batch) * batch / (time.perf_counter() - start)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark DummySensor sample generation')
+    parser.add_argument('--samples', type=int, default=5_000_000, help='Samples per batch measurement')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1_000, 100_000, 1_000_000])
+    parser.add_argument('--history', type=int, default=1_000_000, help='SensorHistory capacity for the extend run')
+    args = parser.parse_args()
+
+    set_env_samples = min(args.samples, 200_000)
+    print(f"set_env (1개씩)                        {bench_set_env(set_env_samples):>14,.0f} samples/s")
+    for batch in args.batch_sizes:
+        plain = bench_generate_batch(args.samples, batch, 0.0, 0.0)
+        modeled = bench_generate_batch(args.samples, batch, 1e-4, 0.01)
+        stored = bench_generate_batch(args.samples, batch, 1e-4, 0.01, SensorHistory(args.history))
+        print(f"generate_batch {batch:>9,}개  균등 {plain:>14,.0f}  드리프트+잡음 {modeled:>14,.0f}  "
+              f"+extend {stored:>14,.0f} samples/s")
+    print(f"(샘플 하나 = 센서 값 {len(SENSOR_KEYS)}개)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
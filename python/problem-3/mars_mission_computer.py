@@ -7,6 +7,20 @@ import threading
 import multiprocessing
 import sys
 from datetime import datetime
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+# 더미 센서가 만드는 환경 값의 이름과 (최솟값, 최댓값). 키 순서가 SensorHistory의 열 순서이기도 하다
+SENSOR_RANGES = {
+    'mars_base_internal_temperature': (18, 30),
+    'mars_base_external_temperature': (0, 21),
+    'mars_base_internal_humidity': (50, 60),
+    'mars_base_external_illuminance': (500, 715),
+    'mars_base_internal_co2': (0.02, 0.1),
+    'mars_base_internal_oxygen': (4, 7),
+}
+SENSOR_KEYS = tuple(SENSOR_RANGES)
 
 def wait_for_quit():
     global stop_flag
@@ -19,38 +33,153 @@ def wait_for_quit():
 
 
 class DummySensor:
-    def __init__(self):
-        self.env_values = {
-            'mars_base_internal_temperature': 0,
-            'mars_base_external_temperature': 0,
-            'mars_base_internal_humidity': 0,
-            'mars_base_external_illuminance': 0,
-            'mars_base_internal_co2': 0,
-            'mars_base_internal_oxygen': 0
-        }
+    def __init__(self, seed: int = None, interval: float = 5.0):
+        self.env_values = dict.fromkeys(SENSOR_KEYS, 0)
+        # generate_batch용 난수 생성기와 시계 (연속 호출 시 시각과 드리프트가 이어진다)
+        self.rng = np.random.default_rng(seed)
+        self.interval = interval
+        self.clock = 0.0
+        self._low = np.array([low for low, _ in SENSOR_RANGES.values()], dtype=np.float64)[:, None]
+        self._width = np.array([high - low for low, high in SENSOR_RANGES.values()], dtype=np.float64)[:, None]
     
     def set_env(self):
-        self.env_values['mars_base_internal_temperature'] = random.uniform(18, 30)
-        self.env_values['mars_base_external_temperature'] = random.uniform(0, 21)
-        self.env_values['mars_base_internal_humidity'] = random.uniform(50, 60)
-        self.env_values['mars_base_external_illuminance'] = random.uniform(500, 715)
-        self.env_values['mars_base_internal_co2'] = random.uniform(0.02, 0.1)
-        self.env_values['mars_base_internal_oxygen'] = random.uniform(4, 7)
+        for key, (low, high) in SENSOR_RANGES.items():
+            self.env_values[key] = random.uniform(low, high)
     
+    def _per_key(self, value) -> np.ndarray:
+        """스칼라 또는 {키: 값} dict를 (키 수, 1) 배열로 바꾼다. dict에 없는 키는 0."""
+        if isinstance(value, dict):
+            return np.array([value.get(key, 0.0) for key in SENSOR_KEYS], dtype=np.float64)[:, None]
+        return np.full((len(SENSOR_KEYS), 1), float(value))
+
+    def generate_batch(self, n: int, drift=0.0, noise=0.0) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """센서 값 n개를 한 번에 만든다. (시각 배열, {키: 값 배열})을 반환하며 SensorHistory.extend에 그대로 넘길 수 있다.
+
+        기본값은 set_env와 같은 키별 범위의 균등 분포이고, 시각은 interval초 간격으로 이전 호출에 이어진다.
+        drift는 초당 변화량(범위 폭 대비 비율), noise는 가우시안 잡음의 표준편차(범위 폭 대비 비율)이며
+        각각 스칼라 또는 {키: 값} dict로 준다. 드리프트·잡음이 더해진 값은 범위를 벗어날 수 있다.
+        """
+        timestamps = self.clock + self.interval * np.arange(n, dtype=np.float64)
+        self.clock += self.interval * n
+
+        values = self.rng.random((len(SENSOR_KEYS), n))
+        values *= self._width
+        values += self._low
+        if isinstance(drift, dict) or drift:
+            values += (self._per_key(drift) * self._width) * timestamps
+        if isinstance(noise, dict) or noise:
+            jitter = self.rng.standard_normal((len(SENSOR_KEYS), n))
+            jitter *= self._per_key(noise) * self._width
+            values += jitter
+        return timestamps, {key: values[i] for i, key in enumerate(SENSOR_KEYS)}
+
     def get_env(self):
         return self.env_values
 
+
+class SensorHistory:
+    """센서 값 이력을 고정 크기로 보관하는 링 버퍼 시계열 저장소
+
+    센서 키마다 float64 열 하나와 단조 증가 시각 열 하나를 미리 할당해 두고, 가득 차면 가장 오래된 값부터 덮어쓴다.
+    각 샘플을 i와 i + capacity 두 칸에 함께 써 두므로, 최근 capacity개 이내의 어떤 구간도 복사 없이 연속된 뷰로 꺼낼 수 있다.
+    메모리 사용량은 생성 시점에 (키 수 + 1) × 2 × capacity × 8바이트로 정해진다 (nbytes).
+    """
+    def __init__(self, capacity: int, keys: Sequence[str] = SENSOR_KEYS):
+        if capacity < 1:
+            raise ValueError("capacity는 1 이상이어야 합니다")
+        self.capacity = capacity
+        self.keys = tuple(keys)
+        self._index = {key: i for i, key in enumerate(self.keys)}
+        self._timestamps = np.zeros(2 * capacity)
+        self._values = np.zeros((len(self.keys), 2 * capacity))
+        self._head = 0 # 다음에 쓸 위치 (0 ≤ head < capacity)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        return self._timestamps.nbytes + self._values.nbytes
+
+    @property
+    def latest_timestamp(self) -> float:
+        if not self._count:
+            return None
+        return float(self._timestamps[self._head + self.capacity - 1])
+
+    def append(self, values: Dict[str, float], timestamp: float = None) -> None:
+        """샘플 하나를 O(1)로 추가한다. timestamp를 생략하면 time.monotonic()을 쓴다."""
+        if timestamp is None:
+            timestamp = time.monotonic()
+        if self._count and timestamp < self.latest_timestamp:
+            raise ValueError("timestamp는 이전 샘플보다 작을 수 없습니다")
+
+        head, mirror = self._head, self._head + self.capacity
+        self._timestamps[head] = self._timestamps[mirror] = timestamp
+        for i, key in enumerate(self.keys):
+            self._values[i, head] = self._values[i, mirror] = values[key]
+        self._head = (head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def extend(self, timestamps: np.ndarray, values: Dict[str, np.ndarray]) -> None:
+        """여러 샘플을 한 번에 추가한다. capacity보다 많으면 마지막 capacity개만 남는다."""
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if timestamps.size == 0:
+            return
+        if np.any(np.diff(timestamps) < 0) or (self._count and timestamps[0] < self.latest_timestamp):
+            raise ValueError("timestamp는 이전 샘플보다 작을 수 없습니다")
+
+        skip = max(0, len(timestamps) - self.capacity)
+        n = len(timestamps) - skip
+        positions = (self._head + np.arange(n)) % self.capacity
+        self._timestamps[positions] = self._timestamps[positions + self.capacity] = timestamps[skip:]
+        for i, key in enumerate(self.keys):
+            data = np.asarray(values[key], dtype=np.float64)[skip:]
+            self._values[i, positions] = self._values[i, positions + self.capacity] = data
+        self._head = (self._head + n) % self.capacity
+        self._count = min(self._count + n, self.capacity)
+
+    def window(self, seconds: float = None, last: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """최근 구간을 (시각, 값) 뷰로 돌려준다. 값은 (키 수, 샘플 수) 배열이고 행 순서는 keys와 같다.
+
+        seconds를 주면 가장 최근 샘플 시각에서 seconds초 이내, last를 주면 최근 last개, 둘 다 없으면 저장된 전체.
+        반환값은 내부 버퍼의 뷰이므로 이후 append로 덮어써질 수 있다. 오래 보관하려면 복사해서 쓴다.
+        """
+        end = self._head + self.capacity
+        start = end - self._count
+        if last is not None:
+            start = max(start, end - last)
+        if seconds is not None and self._count:
+            cutoff = self._timestamps[end - 1] - seconds
+            start += int(np.searchsorted(self._timestamps[start:end], cutoff, side='left'))
+        return self._timestamps[start:end], self._values[:, start:end]
+
+    def series(self, key: str, seconds: float = None, last: int = None) -> np.ndarray:
+        """센서 키 하나의 최근 구간 뷰"""
+        return self.window(seconds, last)[1][self._index[key]]
+
+    def summary(self, seconds: float = None, last: int = None) -> Dict[str, Dict[str, float]]:
+        """구간의 키별 평균·표준편차·최소·최대·최근 값과 추세(초당 변화량, 최소제곱 기울기)를 한 번에 계산한다."""
+        timestamps, values = self.window(seconds, last)
+        if timestamps.size == 0:
+            return {}
+
+        centered = timestamps - timestamps.mean()
+        denominator = centered @ centered
+        trend = values @ centered / denominator if denominator else np.zeros(len(self.keys))
+        stats = {'mean': values.mean(axis=1), 'std': values.std(axis=1), 'min': values.min(axis=1),
+                 'max': values.max(axis=1), 'last': values[:, -1], 'trend_per_s': trend}
+        return {key: {name: float(column[i]) for name, column in stats.items()}
+                for i, key in enumerate(self.keys)}
+
+
 class MissionComputer:
-    def __init__(self):
-        self.env_values = {
-            'mars_base_internal_temperature': 0,
-            'mars_base_external_temperature': 0,
-            'mars_base_internal_humidity': 0,
-            'mars_base_external_illuminance': 0,
-            'mars_base_internal_co2': 0,
-            'mars_base_internal_oxygen': 0
-        }
+    def __init__(self, history_capacity: int = 17280):
+        self.env_values = dict.fromkeys(SENSOR_KEYS, 0)
         self.ds = DummySensor()
+        # 5초 간격 기준 24시간 분량의 센서 이력
+        self.history = SensorHistory(history_capacity)
     
     def get_sensor_data(self, use_multiprocessing=False)->None:
 
@@ -60,6 +189,7 @@ class MissionComputer:
                     self.ds.set_env()
                     sensor_data = self.ds.get_env()
                     self.env_values.update(sensor_data)
+                    self.history.append(self.env_values)
                     print( '=' * 60)
                     print(json.dumps(self.env_values, indent=0, ensure_ascii=False))
                     print(f"업데이트 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n종료하려면 Ctrl+C를 입력하세요.")
@@ -73,6 +203,7 @@ class MissionComputer:
                 self.ds.set_env()
                 sensor_data = self.ds.get_env()
                 self.env_values.update(sensor_data)
+                self.history.append(self.env_values)
                 print( '=' * 60)
                 print(json.dumps(self.env_values, indent=0, ensure_ascii=False))
                 print(f"업데이트 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n종료하려면 'q'를 입력하세요.")
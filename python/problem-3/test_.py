@@ -0,0 +1,146 @@
+import numpy as np
+import pytest
+
+from mars_mission_computer import DummySensor, SensorHistory, SENSOR_KEYS, SENSOR_RANGES
+
+
+def _sample(value: float) -> dict:
+    return {key: value + i for i, key in enumerate(SENSOR_KEYS)}
+
+
+def test_sensor_history_wraparound_keeps_latest_in_order():
+    """capacity를 넘겨 추가하면 가장 오래된 값부터 덮어쓰고, 창은 시간순 연속 뷰로 나오는지 검증하는 테스트"""
+    history = SensorHistory(4)
+    for t in range(11):
+        history.append(_sample(10.0 * t), timestamp=float(t))
+
+    timestamps, values = history.window()
+    assert len(history) == 4
+    assert timestamps.tolist() == [7.0, 8.0, 9.0, 10.0]
+    assert values[0].tolist() == [70.0, 80.0, 90.0, 100.0]
+    assert values[-1].tolist() == [75.0, 85.0, 95.0, 105.0]
+    assert history.latest_timestamp == 10.0
+    # 복사 없이 내부 버퍼를 가리키는 뷰
+    assert np.shares_memory(values, history._values)
+    assert history.series(SENSOR_KEYS[0], last=2).tolist() == [90.0, 100.0]
+    assert history.nbytes == (len(SENSOR_KEYS) + 1) * 2 * 4 * 8
+
+
+def test_sensor_history_extend_over_capacity():
+    """capacity보다 많은 샘플을 한 번에 넣으면 마지막 capacity개만 남고 append와 같은 결과인지 검증하는 테스트"""
+    timestamps = np.arange(13, dtype=np.float64)
+    batch = {key: timestamps * (i + 1) for i, key in enumerate(SENSOR_KEYS)}
+
+    extended = SensorHistory(5)
+    extended.append(_sample(-1.0), timestamp=-1.0)
+    extended.extend(timestamps[:3], {key: column[:3] for key, column in batch.items()})
+    extended.extend(timestamps[3:], {key: column[3:] for key, column in batch.items()})
+
+    appended = SensorHistory(5)
+    for j, t in enumerate(timestamps.tolist()):
+        appended.append({key: column[j] for key, column in batch.items()}, timestamp=t)
+
+    for history in (extended, appended):
+        window_timestamps, values = history.window()
+        assert window_timestamps.tolist() == [8.0, 9.0, 10.0, 11.0, 12.0]
+        assert values[1].tolist() == [16.0, 18.0, 20.0, 22.0, 24.0]
+    assert np.array_equal(extended.window()[1], appended.window()[1])
+
+    extended.extend([], {key: [] for key in SENSOR_KEYS})
+    assert len(extended) == 5
+
+
+def test_sensor_history_window_seconds_boundaries():
+    """seconds 창이 가장 최근 시각 기준 [latest - seconds, latest] 구간을 포함 경계로 자르는지 검증하는 테스트"""
+    history = SensorHistory(10)
+    assert history.window(seconds=5)[0].size == 0
+    assert history.summary(seconds=5) == {}
+
+    for t in (0.0, 5.0, 10.0, 15.0, 20.0):
+        history.append(_sample(t), timestamp=t)
+
+    assert history.window(seconds=10)[0].tolist() == [10.0, 15.0, 20.0]   # 경계 시각 포함
+    assert history.window(seconds=9.999)[0].tolist() == [15.0, 20.0]
+    assert history.window(seconds=0)[0].tolist() == [20.0]
+    assert history.window(seconds=100)[0].tolist() == [0.0, 5.0, 10.0, 15.0, 20.0]
+    assert history.window(seconds=100, last=2)[0].tolist() == [15.0, 20.0]
+
+    summary = history.summary(seconds=10)[SENSOR_KEYS[0]]
+    assert summary['mean'] == 15.0
+    assert summary['min'] == 10.0 and summary['max'] == 20.0 and summary['last'] == 20.0
+    assert summary['trend_per_s'] == pytest.approx(1.0)
+
+
+def test_sensor_history_rejects_non_monotonic_timestamps():
+    """이전 샘플보다 이른 시각은 append·extend 모두 거부하고 버퍼를 바꾸지 않는지 검증하는 테스트"""
+    history = SensorHistory(4)
+    history.append(_sample(0.0), timestamp=5.0)
+    history.append(_sample(1.0), timestamp=5.0) # 같은 시각은 허용
+
+    with pytest.raises(ValueError):
+        history.append(_sample(2.0), timestamp=4.0)
+    with pytest.raises(ValueError):
+        history.extend([6.0, 5.5], {key: [1.0, 2.0] for key in SENSOR_KEYS})
+    with pytest.raises(ValueError):
+        history.extend([4.0, 6.0], {key: [1.0, 2.0] for key in SENSOR_KEYS})
+
+    assert history.window()[0].tolist() == [5.0, 5.0]
+    with pytest.raises(ValueError):
+        SensorHistory(0)
+
+
+def test_generate_batch_same_seed_is_reproducible():
+    """같은 seed면 드리프트·잡음을 넣어도 같은 배치가 나오고, seed가 다르면 달라지는지 검증하는 테스트"""
+    first = DummySensor(seed=7).generate_batch(500, drift=1e-3, noise=0.05)
+    second = DummySensor(seed=7).generate_batch(500, drift=1e-3, noise=0.05)
+    other = DummySensor(seed=8).generate_batch(500, drift=1e-3, noise=0.05)
+
+    assert np.array_equal(first[0], second[0])
+    for key in SENSOR_KEYS:
+        assert np.array_equal(first[1][key], second[1][key])
+        assert not np.array_equal(first[1][key], other[1][key])
+
+
+def test_generate_batch_without_drift_or_noise_stays_in_range():
+    """드리프트와 잡음이 0이면 모든 값이 set_env와 같은 SENSOR_RANGES 범위 안에 있는지 검증하는 테스트"""
+    _, values = DummySensor(seed=0).generate_batch(20_000)
+    for key, (low, high) in SENSOR_RANGES.items():
+        column = values[key]
+        assert column.dtype == np.float64 and column.shape == (20_000,)
+        assert low <= column.min() and column.max() <= high
+        assert column.max() - column.min() > 0.9 * (high - low) # 범위 전체에 고르게 퍼짐
+
+
+def test_generate_batch_continues_clock_and_drift_per_key():
+    """연속 호출의 시각이 interval 간격으로 이어지고, dict 드리프트는 지정한 키에만 시각에 비례해 더해지는지 검증하는 테스트"""
+    sensor = DummySensor(seed=1, interval=2.0)
+    assert sensor.generate_batch(3)[0].tolist() == [0.0, 2.0, 4.0]
+    assert sensor.generate_batch(2)[0].tolist() == [6.0, 8.0]
+    assert sensor.clock == 10.0
+    assert sensor.generate_batch(0)[0].size == 0
+
+    key = SENSOR_KEYS[1]
+    low, high = SENSOR_RANGES[key]
+    timestamps, plain = DummySensor(seed=3).generate_batch(50)
+    _, drifted = DummySensor(seed=3).generate_batch(50, drift={key: 0.01})
+    assert np.allclose(drifted[key] - plain[key], 0.01 * (high - low) * timestamps)
+    for other in SENSOR_KEYS:
+        if other != key:
+            assert np.array_equal(drifted[other], plain[other])
+
+
+def test_generate_batch_feeds_sensor_history_extend():
+    """generate_batch 결과를 그대로 SensorHistory.extend에 넘겨 여러 번 이어 붙일 수 있는지 검증하는 테스트"""
+    sensor = DummySensor(seed=2)
+    history = SensorHistory(100)
+    batches = [sensor.generate_batch(n, drift=1e-4, noise=0.01) for n in (60, 70)]
+    for timestamps, values in batches:
+        history.extend(timestamps, values)
+
+    window_timestamps, window = history.window()
+    expected_timestamps = np.concatenate([batch[0] for batch in batches])[-100:]
+    assert np.array_equal(window_timestamps, expected_timestamps)
+    for i, key in enumerate(SENSOR_KEYS):
+        expected = np.concatenate([batch[1][key] for batch in batches])[-100:]
+        assert np.array_equal(window[i], expected)
+    assert history.latest_timestamp == sensor.clock - sensor.interval